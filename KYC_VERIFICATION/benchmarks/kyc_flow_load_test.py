@@ -0,0 +1,315 @@
+"""
+End-to-end KYC flow load test.
+
+Drives profile -> PAN -> Aadhaar (initiate + verify) -> bank -> 4 document
+uploads -> admin review for synthetic users seeded by dummy_data.py, at a
+configurable concurrency, against a running server. Reports throughput and
+p50/p95/p99 per step and stores the result as a JSON baseline.
+
+    python -m benchmarks.kyc_flow_load_test --users 200 --concurrency 20
+    python -m benchmarks.kyc_flow_load_test --users 200 --compare benchmarks/baselines/<file>.json
+
+Reads synthetic users from the same DATABASE_URL the server uses (local Postgres).
+Use against dummy mode, or API mode backed by simulator/provider_simulator.py.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qs
+import requests
+from core.database import SessionLocal
+from models.module1_user import User
+from models.dummy_pan import DummyPAN
+from models.dummy_bank_account import DummyBankAccount
+from models.user_profile import UserProfile
+from models.attempt_tracker import AttemptTracker
+import models.kyc_pan_verification
+import models.kyc_aadhaar_verification
+import models.kyc_bank_verification
+import models.document_upload
+
+STEPS = [
+    "profile_create", "pan_verify", "aadhaar_initiate", "aadhaar_verify",
+    "bank_verify", "document_upload", "admin_review",
+]
+DOCUMENTS = [
+    ("PAN_CARD",      "pan.jpg",         "image/jpeg"),
+    ("AADHAAR_FRONT", "aadhaar_f.jpg",   "image/jpeg"),
+    ("AADHAAR_BACK",  "aadhaar_b.jpg",   "image/jpeg"),
+    ("SALARY_SLIP",   "salary_slip.pdf", "application/pdf"),
+]
+FAKE_JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 20 * 1024 + b"\xff\xd9"
+FAKE_PDF  = b"%PDF-1.4\n" + b"0" * 40 * 1024 + b"\n%%EOF"
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+LOADTEST_EMAIL_DOMAIN = "kyc-loadtest.dev"
+
+
+def load_synthetic_users(limit: int) -> list:
+    """Pair unused users rows with unused dummy PAN records and an active bank account under the same name."""
+    db = SessionLocal()
+    try:
+        users = (
+            db.query(User.id)
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .filter(UserProfile.user_id.is_(None))
+            .order_by(User.id)
+            .limit(limit)
+            .all()
+        )
+        used_pans = {p for (p,) in db.query(UserProfile.pan_number).all()}
+        pans = [p for p in db.query(DummyPAN).order_by(DummyPAN.pan_number).all() if p.pan_number not in used_pans]
+
+        accounts_by_name = defaultdict(list)
+        for account in db.query(DummyBankAccount).filter(DummyBankAccount.is_active.is_(True)).all():
+            accounts_by_name[account.account_holder_name].append(account)
+
+        synthetic = []
+        pan_iter = iter(pans)
+        for (user_id,) in users:
+            for pan in pan_iter:
+                accounts = accounts_by_name.get(pan.full_name)
+                if accounts:
+                    account = accounts.pop()
+                    synthetic.append({
+                        "user_id":        user_id,
+                        "email":          f"loadtest.{user_id}@{LOADTEST_EMAIL_DOMAIN}",
+                        "full_name":      pan.full_name,
+                        "dob":            pan.dob.isoformat(),
+                        "address":        f"{pan.address}, India - 500001",
+                        "aadhaar_number": pan.aadhaar_number,
+                        "pan_number":     pan.pan_number,
+                        "account_number": account.account_number,
+                        "ifsc":           account.ifsc,
+                        "bank_name":      account.bank_name,
+                    })
+                    break
+        return synthetic
+    finally:
+        db.close()
+
+
+def cleanup_loadtest_profiles() -> int:
+    db = SessionLocal()
+    try:
+        profiles = db.query(UserProfile).filter(UserProfile.email.like(f"%@{LOADTEST_EMAIL_DOMAIN}")).all()
+        emails = [p.email for p in profiles]
+        for profile in profiles:
+            db.delete(profile)
+        if emails:
+            db.query(AttemptTracker).filter(AttemptTracker.email.in_(emails)).delete(synchronize_session=False)
+        db.commit()
+        return len(profiles)
+    finally:
+        db.close()
+
+
+class FlowRunner:
+
+    def __init__(self, base_url: str, admin_key: str, timeout: float):
+        self.base_url  = base_url.rstrip("/")
+        self.admin_key = admin_key
+        self.timeout   = timeout
+        self.samples   = defaultdict(list)
+        self.errors    = defaultdict(lambda: defaultdict(int))
+        self._local    = threading.local()
+        self._lock     = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _call(self, step: str, method: str, path: str, expected=(200, 201), **kwargs):
+        started = time.perf_counter()
+        try:
+            resp = self._session().request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            with self._lock:
+                self.errors[step][type(e).__name__] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples[step].append(elapsed)
+            if resp.status_code not in expected:
+                self.errors[step][str(resp.status_code)] += 1
+        return resp if resp.status_code in expected else None
+
+    def run_flow(self, user: dict) -> bool:
+        uid = user["user_id"]
+        if not self._call("profile_create", "POST", "/api/v1/user/profile", json={
+            "user_id": uid, "email": user["email"], "full_name": user["full_name"], "dob": user["dob"],
+            "address": user["address"], "employment_type": "Salaried", "monthly_income": 50000,
+            "aadhaar_number": user["aadhaar_number"], "pan_number": user["pan_number"],
+        }):
+            return False
+        if not self._call("pan_verify", "POST", "/api/v1/kyc/pan-verify", json={"user_id": uid}):
+            return False
+
+        initiated = self._call("aadhaar_initiate", "POST", "/api/v1/kyc/aadhaar-initiate", json={"user_id": uid})
+        if not initiated:
+            return False
+        body = initiated.json()
+        auth_code = None
+        if body.get("auth_url"):
+            redirect = self._session().get(body["auth_url"], allow_redirects=False, timeout=self.timeout)
+            auth_code = parse_qs(urlparse(redirect.headers.get("location", "")).query).get("code", [None])[0]
+        if not self._call("aadhaar_verify", "POST", "/api/v1/kyc/aadhaar-verify", json={
+            "user_id": uid, "initiate_token": body["initiate_token"], "auth_code": auth_code,
+        }):
+            return False
+
+        if not self._call("bank_verify", "POST", "/api/v1/kyc/bank-verify", json={
+            "user_id": uid, "account_number": user["account_number"], "account_holder_name": user["full_name"],
+            "bank_name": user["bank_name"], "ifsc": user["ifsc"],
+        }):
+            return False
+
+        document_ids = []
+        for document_type, file_name, mime_type in DOCUMENTS:
+            content = FAKE_PDF if mime_type == "application/pdf" else FAKE_JPEG
+            uploaded = self._call(
+                "document_upload", "POST", "/api/v1/documents/upload",
+                data={"user_id": uid, "document_type": document_type},
+                files={"file": (file_name, content, mime_type)},
+            )
+            if not uploaded:
+                return False
+            document_ids.append(uploaded.json()["id"])
+
+        for document_id in document_ids:
+            if not self._call("admin_review", "POST", "/api/admin/documents/review",
+                              headers={"x-admin-key": self.admin_key},
+                              json={"document_id": document_id, "action": "APPROVE", "reviewed_by": "loadtest"}):
+                return False
+        return True
+
+
+def percentile(sorted_values: list, q: float):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def build_report(runner: FlowRunner, args, users: int, completed: int, wall_seconds: float) -> dict:
+    steps = {}
+    total_requests = 0
+    for step in STEPS:
+        values = sorted(runner.samples.get(step, []))
+        total_requests += len(values)
+        steps[step] = {
+            "count":   len(values),
+            "errors":  dict(runner.errors.get(step, {})),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else None,
+            "p50_ms":  round(percentile(values, 0.50) * 1000, 2) if values else None,
+            "p95_ms":  round(percentile(values, 0.95) * 1000, 2) if values else None,
+            "p99_ms":  round(percentile(values, 0.99) * 1000, 2) if values else None,
+        }
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit":            commit,
+        "timestamp":         datetime.now(timezone.utc).isoformat(),
+        "base_url":          args.base_url,
+        "concurrency":       args.concurrency,
+        "users":             users,
+        "completed_flows":   completed,
+        "wall_seconds":      round(wall_seconds, 3),
+        "flows_per_second":  round(completed / wall_seconds, 3) if wall_seconds else None,
+        "requests_per_second": round(total_requests / wall_seconds, 3) if wall_seconds else None,
+        "steps":             steps,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\ncommit {report['commit']}  users={report['users']}  concurrency={report['concurrency']}  "
+          f"completed={report['completed_flows']}  wall={report['wall_seconds']}s")
+    print(f"throughput: {report['flows_per_second']} flows/s, {report['requests_per_second']} req/s\n")
+    print(f"{'step':<18}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, stats in report["steps"].items():
+        errors = sum(stats["errors"].values())
+        print(f"{step:<18}{stats['count']:>7}{errors:>8}{stats['p50_ms'] or '-':>10}{stats['p95_ms'] or '-':>10}{stats['p99_ms'] or '-':>10}")
+
+
+def compare_reports(report: dict, baseline: dict, max_regression_pct: float) -> bool:
+    print(f"\ncompared with baseline {baseline['commit']} ({baseline['timestamp']}):")
+    regressed = False
+    for step, stats in report["steps"].items():
+        base = baseline["steps"].get(step, {})
+        deltas = []
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if stats.get(key) and base.get(key):
+                change = (stats[key] - base[key]) / base[key] * 100
+                deltas.append(f"{key[:3]} {change:+.1f}%")
+                if key != "p50_ms" and change > max_regression_pct:
+                    regressed = True
+        print(f"  {step:<18}{'  '.join(deltas)}")
+    if report["flows_per_second"] and baseline.get("flows_per_second"):
+        change = (report["flows_per_second"] - baseline["flows_per_second"]) / baseline["flows_per_second"] * 100
+        print(f"  throughput        {change:+.1f}%")
+        if change < -max_regression_pct:
+            regressed = True
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end KYC flow load test")
+    parser.add_argument("--base-url", default=os.getenv("KYC_BASE_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--admin-key", default=os.getenv("ADMIN_API_KEY", ""))
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="baseline file to write (default: benchmarks/baselines/kyc_flow_<commit>_<time>.json)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--max-regression-pct", type=float, default=10.0)
+    parser.add_argument("--cleanup", action="store_true", help="delete load-test profiles before and after the run")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        print(f"Removed {cleanup_loadtest_profiles()} profiles from previous runs")
+
+    users = load_synthetic_users(args.users)
+    if len(users) < args.users:
+        print(f"Only {len(users)} unused synthetic users available (asked for {args.users}). "
+              "Seed more with dummy_data.py or run with --cleanup.")
+    if not users:
+        return 1
+
+    runner = FlowRunner(args.base_url, args.admin_key, args.timeout)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        completed = sum(pool.map(runner.run_flow, users))
+    wall_seconds = time.perf_counter() - started
+
+    report = build_report(runner, args, len(users), completed, wall_seconds)
+    print_report(report)
+
+    output = args.output or os.path.join(
+        BASELINE_DIR, f"kyc_flow_{report['commit']}_{datetime.now(timezone.utc):%Y%m%d%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nbaseline written to {output}")
+
+    regressed = False
+    if args.compare:
+        with open(args.compare) as f:
+            regressed = compare_reports(report, json.load(f), args.max_regression_pct)
+
+    if args.cleanup:
+        cleanup_loadtest_profiles()
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
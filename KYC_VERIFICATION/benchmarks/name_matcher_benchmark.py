@@ -0,0 +1,153 @@
+"""
+Micro-benchmark for utils/name_matcher against the old difflib.SequenceMatcher scorer.
+
+    python -m benchmarks.name_matcher_benchmark --pairs 20000
+
+Times cold (cache cleared) and warm calls, lists pairs whose pass/fail at
+NAME_MATCH_THRESHOLD changed so false-reject fixes can be eyeballed, and scores
+a small hand-labelled set of same-person / different-person pairs to report
+false-accept and false-reject rates for both scorers.
+"""
+import argparse
+import random
+import time
+from difflib import SequenceMatcher
+from core.config import NAME_MATCH_THRESHOLD
+from utils import name_matcher
+from utils.name_matcher import name_match_percentage, normalize_name
+
+FIRST_NAMES = ["Rahul", "Priya", "Amit", "Sneha", "Vikram", "Anjali", "Suresh", "Lakshmi", "Mohammed", "Fatima",
+               "Arjun", "Kavya", "Rajesh", "Deepika", "Venkata", "Sai", "Harpreet", "Gurpreet", "Arunachalam"]
+MIDDLE_NAMES = ["Kumar", "Kumari", "Devi", "Singh", "Prasad", "Rao", "Lal", "Chandra"]
+LAST_NAMES = ["Sharma", "Verma", "Patel", "Reddy", "Iyer", "Nair", "Khan", "Gupta", "Subramanian",
+              "Chatterjee", "Venkataraman", "Banerjee", "Krishnamurthy"]
+HONORIFICS = ["Mr.", "Mrs.", "Ms.", "Dr.", "Shri", "Smt."]
+
+# (name on record, name from provider, same person?)
+LABELLED_PAIRS = [
+    ("Rahul Kumar Sharma",         "Sharma Rahul Kumar",           True),
+    ("Rahul Kumar Sharma",         "Rahul Sharma",                 True),
+    ("Rajesh Kumar Sharma",        "Rajesh K Sharma",              True),
+    ("Vikram Singh",               "Mr. Vikram Singh",             True),
+    ("Lakshmi Devi",               "Smt. LAKSHMI DEVI",            True),
+    ("Arunachalam Subramanian",    "Arunachalam Subramaniam",      True),
+    ("Venkataraman Krishnamurthy", "Krishnamurthy Venkataraman",   True),
+    ("Mohammed Fatima Khan",       "Mohammed Fatima Khan",         True),
+    ("Deepika Chatterjee",         "Deepika Chaterjee",            True),
+    ("Gurpreet Singh",             "Gurpreet Singh Sandhu",        True),
+    ("Sai Venkata Reddy",          "Venkata Sai Reddy",            True),
+    ("Priya Kumari",               "Priya Kumari Verma",           True),
+    ("Mohammed Khan",              "Mohd Khan",                    True),
+    ("Rahul Kumar Sharma",         "Rahul Kr. Sharma",             True),
+    ("José Fernandes",             "Jose Fernandes",               True),
+    ("Rahul Sharma",               "Rohit Sharma",                 False),
+    ("Sunita Reddy",               "S Reddy",                      False),
+    ("Priya Kumari",               "Priya",                        False),
+    ("Priya Kumari Sharma",        "Priya Devi Sharma",            False),
+    ("Amit Patel",                 "Anita Patel",                  False),
+    ("Sunil Gupta",                "Sunita Gupta",                 False),
+    ("Arjun Nair",                 "Arun Nair",                    False),
+    ("Kavya Iyer",                 "Kavitha Iyer",                 False),
+    ("Harpreet Singh",             "Gurpreet Singh",               False),
+    ("Rajesh Kumar Verma",         "Rakesh Kumar Verma",           False),
+    ("Sneha Banerjee",             "Sneha Chatterjee",             False),
+    ("Mohammed Khan",              "Fatima Khan",                  False),
+    ("राम कुमार",                  "श्याम लाल",                    False),
+    ("राम कुमार",                  "",                             False),
+]
+
+
+def legacy_percentage(name1: str, name2: str) -> float:
+    return SequenceMatcher(None, normalize_name(name1), normalize_name(name2)).ratio() * 100
+
+
+def _variant(rng: random.Random, first: str, middle: str, last: str) -> str:
+    choice = rng.randrange(7)
+    if choice == 0:
+        return f"{last} {first} {middle}"
+    if choice == 1:
+        return f"{first[0]}. {middle[0]}. {last}"
+    if choice == 2:
+        return f"{first} {last}"
+    if choice == 3:
+        return f"{rng.choice(HONORIFICS)} {first} {middle} {last}"
+    if choice == 4:
+        i = rng.randrange(len(last))
+        return f"{first} {middle} {last[:i]}{rng.choice('aeiou')}{last[i + 1:]}"
+    if choice == 5:
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return f"{first} {middle} {last}".upper()
+
+
+def build_pairs(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        first, middle, last = rng.choice(FIRST_NAMES), rng.choice(MIDDLE_NAMES), rng.choice(LAST_NAMES)
+        pairs.append((f"{first} {middle} {last}", _variant(rng, first, middle, last)))
+    return pairs
+
+
+def _time(fn, pairs: list) -> float:
+    started = time.perf_counter()
+    for a, b in pairs:
+        fn(a, b)
+    return time.perf_counter() - started
+
+
+def _clear_caches() -> None:
+    name_matcher._name_tokens.cache_clear()
+    name_matcher._score.cache_clear()
+    name_matcher._token_similarity.cache_clear()
+
+
+def labelled_error_rates(scorer) -> tuple:
+    """(false-accept rate, false-reject rate, falsely accepted pairs) of `scorer` on LABELLED_PAIRS."""
+    same = [(a, b) for a, b, label in LABELLED_PAIRS if label]
+    different = [(a, b) for a, b, label in LABELLED_PAIRS if not label]
+    accepted = [(a, b) for a, b in different if scorer(a, b) >= NAME_MATCH_THRESHOLD]
+    rejected = [(a, b) for a, b in same if scorer(a, b) < NAME_MATCH_THRESHOLD]
+    return len(accepted) / len(different), len(rejected) / len(same), accepted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Name matcher micro-benchmark")
+    parser.add_argument("--pairs", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--show", type=int, default=10, help="number of changed decisions to print")
+    args = parser.parse_args()
+
+    pairs = build_pairs(args.pairs, args.seed)
+    unique = list(dict.fromkeys(pairs))
+
+    legacy = _time(legacy_percentage, unique)
+    _clear_caches()
+    cold = _time(name_match_percentage, unique)
+    warm = _time(name_match_percentage, pairs)
+
+    print(f"{len(pairs)} pairs ({len(unique)} unique)")
+    print(f"difflib.SequenceMatcher   {legacy / len(unique) * 1e6:8.2f} us/pair")
+    print(f"name_matcher (cold)       {cold / len(unique) * 1e6:8.2f} us/pair")
+    print(f"name_matcher (warm cache) {warm / len(pairs) * 1e6:8.2f} us/pair")
+
+    changed = []
+    for a, b in unique:
+        old, new = legacy_percentage(a, b), name_match_percentage(a, b)
+        if (old >= NAME_MATCH_THRESHOLD) != (new >= NAME_MATCH_THRESHOLD):
+            changed.append((a, b, old, new))
+    accepted = sum(1 for *_, new in changed if new >= NAME_MATCH_THRESHOLD)
+    print(f"\ndecisions changed at {NAME_MATCH_THRESHOLD}%: {len(changed)} "
+          f"({accepted} now pass, {len(changed) - accepted} now fail)")
+    for a, b, old, new in changed[:args.show]:
+        print(f"  {a!r:38} vs {b!r:38} {old:6.2f} -> {new:6.2f}")
+
+    print(f"\nlabelled pairs at {NAME_MATCH_THRESHOLD}% ({len(LABELLED_PAIRS)} pairs)")
+    for label, scorer in (("difflib.SequenceMatcher", legacy_percentage), ("name_matcher", name_match_percentage)):
+        false_accept, false_reject, accepted = labelled_error_rates(scorer)
+        print(f"  {label:25} false accepts {false_accept * 100:5.1f}%   false rejects {false_reject * 100:5.1f}%")
+        for a, b in accepted:
+            print(f"    accepts {a!r} vs {b!r} ({scorer(a, b):.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-response serialization and compression cost of the admin user list.
+
+    python -m benchmarks.response_serialization_benchmark --rows 50 --iterations 2000
+
+Compares the old path (build UserKYCDetails models, jsonable_encoder, json.dumps
+as JSONResponse does) with the current one (plain dicts encoded by orjson), then
+times gzip and, when installed, brotli on the encoded body.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import orjson
+from fastapi.encoders import jsonable_encoder
+from core.compression import brotli, compress_bytes
+from schemas.document_schema import UserKYCDetails
+
+STATUSES = ["PENDING", "VERIFIED", "FAILED", "BLOCKED"]
+
+
+def build_users(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    users = []
+    for i in range(count):
+        verified = now - timedelta(days=rng.randrange(365)) if rng.random() < 0.7 else None
+        users.append(SimpleNamespace(
+            user_id=100000 + i, email=f"user{i}@example.com", full_name=f"Test User {i}",
+            pan_number=f"ABCDE{i % 10000:04d}F", aadhaar_number=f"{rng.randrange(10**11, 10**12)}",
+            pan_status=rng.choice(STATUSES), aadhaar_status=rng.choice(STATUSES), bank_status=rng.choice(STATUSES),
+            identity_status=rng.choice(STATUSES), document_status=rng.choice(STATUSES),
+            kyc_status=rng.choice(["COMPLETED", "INCOMPLETE", "BLOCKED"]),
+            created_at=now - timedelta(days=rng.randrange(400)),
+            pan_verified_at=verified, aadhaar_verified_at=verified, bank_verified_at=None,
+        ))
+    return users
+
+
+def legacy_encode(users: list) -> bytes:
+    models = [
+        UserKYCDetails(
+            user_id=u.user_id, email=u.email, full_name=u.full_name, pan_number=u.pan_number,
+            aadhaar_number=u.aadhaar_number, pan_status=u.pan_status, aadhaar_status=u.aadhaar_status,
+            bank_status=u.bank_status, identity_status=u.identity_status, document_status=u.document_status,
+            kyc_status=u.kyc_status, created_at=u.created_at.isoformat(),
+            pan_verified_at=u.pan_verified_at.isoformat() if u.pan_verified_at else None,
+            aadhaar_verified_at=u.aadhaar_verified_at.isoformat() if u.aadhaar_verified_at else None,
+            bank_verified_at=u.bank_verified_at.isoformat() if u.bank_verified_at else None,
+        )
+        for u in users
+    ]
+    content = jsonable_encoder(models)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def orjson_encode(users: list) -> bytes:
+    return orjson.dumps([
+        {
+            "user_id": u.user_id, "email": u.email, "full_name": u.full_name, "pan_number": u.pan_number,
+            "aadhaar_number": u.aadhaar_number, "pan_status": u.pan_status, "aadhaar_status": u.aadhaar_status,
+            "bank_status": u.bank_status, "identity_status": u.identity_status,
+            "document_status": u.document_status, "kyc_status": u.kyc_status, "created_at": u.created_at,
+            "pan_verified_at": u.pan_verified_at, "aadhaar_verified_at": u.aadhaar_verified_at,
+            "bank_verified_at": u.bank_verified_at,
+        }
+        for u in users
+    ])
+
+
+def _time(fn, arg, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response serialization benchmark")
+    parser.add_argument("--rows", type=int, default=50, help="users per response (admin list page size)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    users = build_users(args.rows, args.seed)
+    if json.loads(legacy_encode(users)) != json.loads(orjson_encode(users)):
+        raise SystemExit("encoders disagree on the payload")
+
+    legacy = _time(legacy_encode, users, args.iterations)
+    fast = _time(orjson_encode, users, args.iterations)
+    body = orjson_encode(users)
+
+    print(f"{args.rows} rows per response, {len(body)} bytes")
+    print(f"pydantic + jsonable_encoder + json  {legacy * 1e6:9.1f} us/response")
+    print(f"dicts + orjson                      {fast * 1e6:9.1f} us/response  ({legacy / fast:.1f}x)")
+
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        cost = _time(lambda data: compress_bytes(data, encoding), body, args.iterations)
+        size = len(compress_bytes(body, encoding))
+        print(f"{encoding:<5} compress                        {cost * 1e6:9.1f} us/response  "
+              f"{size} bytes ({size / len(body):.0%})")
+    if brotli is None:
+        print("brotli not installed; pip install brotli to compare")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,8 @@ ALLOWED_IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png']
 ALLOWED_DOCUMENT_EXTENSIONS = ['.pdf']
 UPLOAD_BASE_PATH = "uploads"
 
+# On partitioned verification tables FAILED/BLOCKED rows go a whole month at a time,
+# so they are kept for RETENTION_DAYS rounded up to the end of their month.
 RETENTION_DAYS              = int(os.getenv("RETENTION_DAYS",              "90"))
 TRACKER_CLEANUP_HOURS       = int(os.getenv("TRACKER_CLEANUP_HOURS",       "48"))
 REJECTED_DOCS_RETENTION_DAYS = int(os.getenv("REJECTED_DOCS_RETENTION_DAYS", "90"))
@@ -28,6 +30,8 @@ ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
 
 KARZA_API_KEY = os.getenv("KARZA_API_KEY", "")
 KARZA_PAN_URL = os.getenv("KARZA_PAN_URL", "https://api.karza.in/v3/sync/pan-verification")
+PAN_LOOKUP_CACHE_TTL_SECONDS = int(os.getenv("PAN_LOOKUP_CACHE_TTL_SECONDS", "900"))
+PAN_LOOKUP_CACHE_MAX_ENTRIES = int(os.getenv("PAN_LOOKUP_CACHE_MAX_ENTRIES", "10000"))
 
 DIGILOCKER_CLIENT_ID     = os.getenv("DIGILOCKER_CLIENT_ID", "")
 DIGILOCKER_CLIENT_SECRET = os.getenv("DIGILOCKER_CLIENT_SECRET", "")
@@ -43,7 +47,96 @@ CASHFREE_BANK_URL   = os.getenv("CASHFREE_BANK_URL", "https://api.cashfree.com/v
 DOC_MAX_ATTEMPTS       = int(os.getenv("DOC_MAX_ATTEMPTS", "3"))
 DOC_COOLDOWN_HOURS     = int(os.getenv("DOC_COOLDOWN_HOURS", "24"))
 DOC_MATCH_THRESHOLD    = float(os.getenv("DOC_MATCH_THRESHOLD", "75.0"))
+# Most recent pairs per source the admin rescore endpoint will score in-process;
+# larger runs go through rescore_name_matches.py
+NAME_MATCH_RESCORE_MAX_PAIRS = int(os.getenv("NAME_MATCH_RESCORE_MAX_PAIRS", "20000"))
 
 HYPERVERGE_APP_ID      = os.getenv("HYPERVERGE_APP_ID", "")
 HYPERVERGE_APP_KEY     = os.getenv("HYPERVERGE_APP_KEY", "")
-HYPERVERGE_API_URL     = os.getenv("HYPERVERGE_API_URL", "https://ind-docs.hyperverge.co/v2.0/readKYC")
\ No newline at end of file
+HYPERVERGE_API_URL     = os.getenv("HYPERVERGE_API_URL", "https://ind-docs.hyperverge.co/v2.0/readKYC")
+
+PROVIDER_FAILURE_THRESHOLD     = int(os.getenv("PROVIDER_FAILURE_THRESHOLD", "5"))
+PROVIDER_SLOW_CALL_RATIO       = float(os.getenv("PROVIDER_SLOW_CALL_RATIO", "0.8"))
+PROVIDER_OPEN_SECONDS          = int(os.getenv("PROVIDER_OPEN_SECONDS", "30"))
+PROVIDER_MAX_CONCURRENCY       = int(os.getenv("PROVIDER_MAX_CONCURRENCY", "8"))
+PROVIDER_BULKHEAD_WAIT_SECONDS = float(os.getenv("PROVIDER_BULKHEAD_WAIT_SECONDS", "0.5"))
+
+PROVIDER_LATENCY_WINDOW      = int(os.getenv("PROVIDER_LATENCY_WINDOW", "500"))
+PROVIDER_TIMEOUT_MIN_SAMPLES = int(os.getenv("PROVIDER_TIMEOUT_MIN_SAMPLES", "50"))
+PROVIDER_TIMEOUT_HEADROOM    = float(os.getenv("PROVIDER_TIMEOUT_HEADROOM", "1.5"))
+PROVIDER_MIN_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_MIN_TIMEOUT_SECONDS", "2"))
+PROVIDER_HEDGING_ENABLED     = os.getenv("PROVIDER_HEDGING_ENABLED", "false").lower() == "true"
+PROVIDER_HEDGE_WORKERS       = int(os.getenv("PROVIDER_HEDGE_WORKERS", "16"))
+
+BATCH_MAX_CONCURRENCY     = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS           = int(os.getenv("BATCH_MAX_ITEMS", "50000"))
+BATCH_ITEM_MAX_RETRIES    = int(os.getenv("BATCH_ITEM_MAX_RETRIES", "5"))
+BATCH_STALE_CLAIM_SECONDS = int(os.getenv("BATCH_STALE_CLAIM_SECONDS", "300"))
+BATCH_POLL_SECONDS        = float(os.getenv("BATCH_POLL_SECONDS", "5"))
+
+CLEANUP_BATCH_SIZE          = int(os.getenv("CLEANUP_BATCH_SIZE", "1000"))
+CLEANUP_TIME_BUDGET_SECONDS = int(os.getenv("CLEANUP_TIME_BUDGET_SECONDS", "600"))
+CLEANUP_BATCH_PAUSE_SECONDS = float(os.getenv("CLEANUP_BATCH_PAUSE_SECONDS", "0.2"))
+CLEANUP_LOCK_TIMEOUT_MS     = int(os.getenv("CLEANUP_LOCK_TIMEOUT_MS", "2000"))
+CLEANUP_PROGRESS_EVERY      = int(os.getenv("CLEANUP_PROGRESS_EVERY", "20"))
+
+FILE_DELETE_WORKERS        = int(os.getenv("FILE_DELETE_WORKERS", "8"))
+ORPHAN_FILE_GRACE_MINUTES  = int(os.getenv("ORPHAN_FILE_GRACE_MINUTES", "60"))
+ORPHAN_SWEEP_BATCH_SIZE    = int(os.getenv("ORPHAN_SWEEP_BATCH_SIZE", "1000"))
+
+# Cleanup schedules are cron expressions evaluated in UTC
+CLEANUP_TRACKERS_CRON         = os.getenv("CLEANUP_TRACKERS_CRON", "15 * * * *")
+CLEANUP_VERIFICATIONS_CRON    = os.getenv("CLEANUP_VERIFICATIONS_CRON", "30 2 * * *")
+CLEANUP_DOCUMENTS_CRON        = os.getenv("CLEANUP_DOCUMENTS_CRON", "45 2 * * *")
+CLEANUP_ORPHAN_FILES_CRON     = os.getenv("CLEANUP_ORPHAN_FILES_CRON", "15 3 * * *")
+CLEANUP_TOKEN_NONCES_CRON     = os.getenv("CLEANUP_TOKEN_NONCES_CRON", "*/30 * * * *")
+CLEANUP_IDEMPOTENCY_KEYS_CRON = os.getenv("CLEANUP_IDEMPOTENCY_KEYS_CRON", "40 * * * *")
+CLEANUP_JITTER_SECONDS        = int(os.getenv("CLEANUP_JITTER_SECONDS", "300"))
+CLEANUP_LEADER_RETRY_SECONDS  = int(os.getenv("CLEANUP_LEADER_RETRY_SECONDS", "60"))
+
+PARTITION_MONTHS_AHEAD       = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+LATEST_LOOKUP_WINDOW_DAYS    = int(os.getenv("LATEST_LOOKUP_WINDOW_DAYS", "31"))
+CLEANUP_PARTITIONS_CRON      = os.getenv("CLEANUP_PARTITIONS_CRON", "0 1 * * *")
+
+ARCHIVE_ENABLED     = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+ARCHIVE_BASE_PATH   = os.getenv("ARCHIVE_BASE_PATH", "archive")
+ARCHIVE_BLOCK_ROWS  = int(os.getenv("ARCHIVE_BLOCK_ROWS", "500"))
+
+TRACING_ENABLED      = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACE_SAMPLE_RATE    = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+TRACE_EXPORT_PATH    = os.getenv("TRACE_EXPORT_PATH", "traces/spans.jsonl")
+TRACE_OTLP_ENDPOINT  = os.getenv("TRACE_OTLP_ENDPOINT", "")
+TRACE_SERVICE_NAME   = os.getenv("TRACE_SERVICE_NAME", "kyc-verification")
+
+PROFILING_ENABLED          = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE        = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS        = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_OUTPUT_PATH        = os.getenv("PROFILE_OUTPUT_PATH", "profiles")
+PROFILE_MAX_KEPT           = int(os.getenv("PROFILE_MAX_KEPT", "200"))
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "10"))
+PROFILE_TRACEMALLOC_TOP    = int(os.getenv("PROFILE_TRACEMALLOC_TOP", "30"))
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL           = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY       = int(os.getenv("BROTLI_QUALITY", "4"))
+
+EVENTS_ENABLED           = os.getenv("EVENTS_ENABLED", "true").lower() == "true"
+EVENTS_CHANNEL           = os.getenv("EVENTS_CHANNEL", "kyc_status_events")
+EVENTS_RECONNECT_SECONDS = float(os.getenv("EVENTS_RECONNECT_SECONDS", "5"))
+SSE_HEARTBEAT_SECONDS    = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_RETRY_MS             = int(os.getenv("SSE_RETRY_MS", "3000"))
+SSE_QUEUE_SIZE           = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+
+# Aadhaar session tokens are HMAC-signed; set the same secret on every worker.
+# Required when VERIFICATION_MODE=api: the app will not start without it.
+# During a rotation, put the old secret in AADHAAR_TOKEN_PREVIOUS_SECRET.
+AADHAAR_TOKEN_SECRET          = os.getenv("AADHAAR_TOKEN_SECRET", "")
+AADHAAR_TOKEN_PREVIOUS_SECRET = os.getenv("AADHAAR_TOKEN_PREVIOUS_SECRET", "")
+AADHAAR_TOKEN_EXPIRY_MINUTES  = int(os.getenv("AADHAAR_TOKEN_EXPIRY_MINUTES", "10"))
+
+IDEMPOTENCY_TTL_HOURS    = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "120"))
+
+SINGLE_FLIGHT_WAIT_SECONDS    = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "30"))
+# Connections per worker for single-flight advisory locks, separate from the request pool
+SINGLE_FLIGHT_LOCK_POOL_SIZE  = int(os.getenv("SINGLE_FLIGHT_LOCK_POOL_SIZE", "10"))
@@ -1,7 +1,11 @@
 import os
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
+from core.metrics import REGISTRY
+from core.config import TRACING_ENABLED, SINGLE_FLIGHT_LOCK_POOL_SIZE, SINGLE_FLIGHT_WAIT_SECONDS
+from core.tracing import record_span
 
 load_dotenv()
 
@@ -10,9 +14,41 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Single-flight advisory locks (services/single_flight.py) hold a connection for the
+# whole verification while the request's Session holds another. Taking both from
+# `engine` lets a burst of verifications each hold one connection and wait for a
+# second until the pool deadlocks, so the locks get their own small pool.
+advisory_lock_engine = create_engine(
+    DATABASE_URL,
+    pool_size=SINGLE_FLIGHT_LOCK_POOL_SIZE,
+    max_overflow=0,
+    pool_timeout=SINGLE_FLIGHT_WAIT_SECONDS,
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def _pool_metrics():
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    yield "db_pool_size", "gauge", "Configured connection pool size", [("", {}, pool.size())]
+    yield "db_pool_checked_out", "gauge", "Connections currently in use", [("", {}, pool.checkedout())]
+    yield "db_pool_checked_in", "gauge", "Idle connections in the pool", [("", {}, pool.checkedin())]
+    yield "db_pool_overflow", "gauge", "Connections open beyond the pool size", [("", {}, max(pool.overflow(), 0))]
+
+REGISTRY.add_collector(_pool_metrics)
+
+if TRACING_ENABLED:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._trace_started_ns = time.time_ns()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query_span(conn, cursor, statement, parameters, context, executemany):
+        record_span("db.query", context._trace_started_ns, time.time_ns(),
+                    **{"db.system": "postgresql", "db.statement": statement[:500]})
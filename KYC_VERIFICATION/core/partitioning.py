@@ -0,0 +1,207 @@
+"""
+Monthly partitions for the verification log tables.
+
+Each table is RANGE-partitioned on created_at by calendar month (UTC), and each
+month is LIST-partitioned on status into a `_purge` leaf (FAILED, BLOCKED) and a
+`_keep` leaf (everything else):
+
+    kyc_pan_verifications
+    └── kyc_pan_verifications_y2026m10      created_at in [2026-10-01, 2026-11-01)
+        ├── kyc_pan_verifications_y2026m10_purge   status IN ('FAILED', 'BLOCKED')
+        └── kyc_pan_verifications_y2026m10_keep    DEFAULT
+
+Retention then drops whole `_purge` leaves instead of deleting rows, and queries
+bounded on created_at only touch the months they need. A month's leaf goes once
+the whole month is older than the cutoff, so FAILED/BLOCKED rows are kept for
+RETENTION_DAYS rounded up to the end of their month (up to ~31 days longer).
+"""
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Callable, Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from core.config import PARTITION_MONTHS_AHEAD, ARCHIVE_BLOCK_ROWS, CLEANUP_LOCK_TIMEOUT_MS
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("kyc_pan_verifications", "kyc_aadhaar_verifications", "kyc_bank_verifications")
+PURGEABLE_STATUSES = ("FAILED", "BLOCKED")
+
+# Every worker calls ensure_partitions at startup; concurrent CREATE TABLE ... PARTITION OF
+# can fail on a duplicate pg_type/pg_class key, so creation is serialized on this lock.
+PARTITION_LOCK_KEY = 0x4B5943_50415254   # "KYC" "PART"
+
+_MONTH_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    return relkind == "p"
+
+
+def month_partitions(conn: Connection, table: str) -> List[Tuple[str, date]]:
+    """(partition name, month) for every monthly partition of `table`, oldest first."""
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table)"
+    ), {"table": table}).scalars().all()
+    months = []
+    for name in names:
+        match = _MONTH_SUFFIX.search(name)
+        if match:
+            months.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(months, key=lambda item: item[1])
+
+
+def create_month_partition(conn: Connection, table: str, month: date) -> None:
+    name = partition_name(table, month)
+    statuses = ", ".join(f"'{s}'" for s in PURGEABLE_STATUSES)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00:00+00') "
+        f"PARTITION BY LIST (status)"
+    ))
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name}_purge PARTITION OF {name} FOR VALUES IN ({statuses})"))
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name}_keep PARTITION OF {name} DEFAULT"))
+
+
+def ensure_partitions(engine: Engine, since: Optional[datetime] = None,
+                      months_ahead: int = PARTITION_MONTHS_AHEAD) -> int:
+    """
+    Create monthly partitions from the month of `since` (default: this month) through
+    `months_ahead` months from now, for every partitioned table. Tables still in the
+    old unpartitioned layout are skipped with a warning. Runs under a transaction-level
+    advisory lock, so workers starting together take turns; the later ones find the
+    partitions already there. Returns partitions created.
+    """
+    today = month_start(datetime.now(timezone.utc))
+    first = month_start(since) if since else today
+    last = add_months(today, months_ahead)
+    created = 0
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                logger.warning(f"{table} is not partitioned; run partition_verification_tables.py to migrate it")
+                continue
+            existing = {month for _, month in month_partitions(conn, table)}
+            month = first
+            while month <= last:
+                if month not in existing:
+                    create_month_partition(conn, table, month)
+                    created += 1
+                month = add_months(month, 1)
+    if created:
+        logger.info(f"Created {created} verification log partition(s) through {last.isoformat()}")
+    return created
+
+
+def drop_purgeable_partitions(engine: Engine, table: str, cutoff: datetime,
+                              archive: Optional[Callable[[str, Iterable], int]] = None) -> int:
+    """
+    Detach and drop the `_purge` leaf of every month that ends on or before `cutoff`,
+    one leaf at a time. Each DETACH runs in its own short transaction under
+    CLEANUP_LOCK_TIMEOUT_MS, so it gives up (and is retried next run) rather than
+    queueing reads of `table` behind its ACCESS EXCLUSIVE lock. Only once a leaf is
+    detached, and no query of `table` can see it, are its rows streamed to
+    `archive(table, rows)` (ordered by user_id) and the leaf dropped. A leaf left
+    detached by an interrupted run is picked up again. Returns the rows dropped.
+    """
+    with engine.connect() as conn:
+        if not is_partitioned(conn, table):
+            return 0
+        months = month_partitions(conn, table)
+
+    dropped_rows = 0
+    for name, month in months:
+        month_end = datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=timezone.utc)
+        if month_end > cutoff:
+            break
+        leaf = f"{name}_purge"
+        try:
+            with engine.begin() as conn:
+                exists, attached = conn.execute(text(
+                    "SELECT to_regclass(:leaf) IS NOT NULL, "
+                    "EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:leaf))"
+                ), {"leaf": leaf}).one()
+                if not exists:
+                    continue
+                if attached:
+                    conn.execute(text(f"SET LOCAL lock_timeout = '{CLEANUP_LOCK_TIMEOUT_MS}ms'"))
+                    conn.execute(text(f"ALTER TABLE {name} DETACH PARTITION {leaf}"))
+        except OperationalError as e:
+            logger.warning(f"Detaching {leaf} gave up waiting for locks, retrying next run: {e.orig}")
+            continue
+
+        with engine.connect() as conn:
+            if archive:
+                result = conn.execution_options(stream_results=True, yield_per=ARCHIVE_BLOCK_ROWS).execute(
+                    text(f"SELECT * FROM {leaf} ORDER BY user_id, created_at")
+                )
+                rows = archive(table, result.mappings())
+            else:
+                rows = conn.execute(text(f"SELECT count(*) FROM {leaf}")).scalar()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE {leaf}"))
+        dropped_rows += rows
+        logger.info(f"Dropped partition {leaf} ({rows} rows)")
+    return dropped_rows
+
+
+def migrate_table(engine: Engine, model, keep_legacy: bool = False) -> Optional[int]:
+    """
+    Move an existing unpartitioned verification table into the partitioned layout
+    in one transaction: rename it aside, create the partitioned table from the model,
+    copy the rows across and carry the id sequence forward. Returns rows copied, or
+    None if the table was already partitioned or did not exist (it is created).
+    """
+    table = model.__table__
+    name, legacy = table.name, f"{table.name}_legacy"
+    with engine.begin() as conn:
+        if is_partitioned(conn, name):
+            return None
+        if conn.execute(text("SELECT to_regclass(:table)"), {"table": name}).scalar() is None:
+            table.create(conn)
+            return None
+        sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": name}).scalar()
+        conn.execute(text(f"ALTER TABLE {name} RENAME TO {legacy}"))
+        conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {name}_pkey TO {legacy}_pkey"))
+        for index in table.indexes:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        if sequence:
+            conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {legacy}_id_seq"))
+
+        table.create(conn)
+        oldest = conn.execute(text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+        today = month_start(datetime.now(timezone.utc))
+        month = month_start(oldest) if oldest else today
+        while month <= add_months(today, PARTITION_MONTHS_AHEAD):
+            create_month_partition(conn, name, month)
+            month = add_months(month, 1)
+
+        columns = ", ".join(column.name for column in table.columns)
+        copied = conn.execute(text(f"INSERT INTO {name} ({columns}) SELECT {columns} FROM {legacy}")).rowcount
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), COALESCE((SELECT max(id) FROM {name}), 0) + 1, false)"
+        ))
+        if not keep_legacy:
+            conn.execute(text(f"DROP TABLE {legacy}"))
+    logger.info(f"Migrated {name} to monthly partitions ({copied} rows)")
+    return copied
@@ -0,0 +1,263 @@
+"""
+On-demand profiling of individual requests to the KYC and upload endpoints.
+
+A request is profiled when it sends `X-Profile: true` together with a valid
+`X-Admin-Key`, or when it is picked by PROFILE_SAMPLE_RATE. While it runs, a
+sampler thread records the Python stacks of the event loop and the threadpool
+workers every PROFILE_INTERVAL_MS, and tracemalloc compares a snapshot taken
+before and after. Each capture is written to PROFILE_OUTPUT_PATH/<profile_id>/:
+
+    stacks.collapsed   one `frame;frame;frame count` line per stack, ready for
+                       flamegraph.pl, speedscope or inferno
+    memory.txt         top allocation growth by source line, plus the peak
+    meta.json          method, path, status, duration, samples
+
+Only one request is profiled at a time; others pass through untouched. With
+PROFILING_ENABLED=false the middleware is not installed at all.
+"""
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from core.config import (
+    ADMIN_API_KEY, PROFILE_SAMPLE_RATE, PROFILE_INTERVAL_MS, PROFILE_OUTPUT_PATH, PROFILE_MAX_KEPT,
+    PROFILE_TRACEMALLOC_FRAMES, PROFILE_TRACEMALLOC_TOP,
+)
+
+logger = logging.getLogger(__name__)
+
+PROFILED_PREFIXES = ("/api/v1/kyc/",)
+PROFILED_PATHS    = ("/api/v1/documents/upload",)
+ARTIFACTS         = {"stacks": "stacks.collapsed", "memory": "memory.txt"}
+WORKER_THREAD_NAMES = ("AnyIO worker thread",)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+_capture_lock = threading.Lock()
+
+
+def should_profile_path(path: str) -> bool:
+    return path.startswith(PROFILED_PREFIXES) or path in PROFILED_PATHS
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(APP_ROOT):
+        filename = os.path.relpath(filename, APP_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of the given thread plus the threadpool workers. Stacks
+    that never enter application code (idle workers, the bare event loop) are
+    dropped, so the output is the request's work plus whatever else the
+    process was running in app code at the same moment.
+    """
+
+    def __init__(self, loop_thread_id: int, interval_seconds: float):
+        self.loop_thread_id   = loop_thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks           = Counter()
+        self.samples          = 0
+        self._stop            = threading.Event()
+        self._thread          = threading.Thread(target=self._run, daemon=True, name="request-profiler")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            names = {
+                t.ident: t.name for t in threading.enumerate()
+                if t.ident == self.loop_thread_id or t.name.startswith(WORKER_THREAD_NAMES)
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or thread_id not in names:
+                    continue
+                stack = self._collapse(frame)
+                if stack:
+                    self.stacks[f"{names[thread_id]};{stack}"] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _collapse(frame) -> Optional[str]:
+        labels = []
+        in_app = False
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(APP_ROOT) and filename != __file__:
+                in_app = True
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if not in_app:
+            return None
+        return ";".join(reversed(labels))
+
+
+class RequestProfile:
+
+    def __init__(self, method: str, path: str, trigger: str, loop_thread_id: int):
+        self.profile_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.method     = method
+        self.path       = path
+        self.trigger    = trigger
+        self.status     = None
+        self.sampler    = StackSampler(loop_thread_id, PROFILE_INTERVAL_MS / 1000)
+        self.duration_ms = None
+        self._own_tracemalloc = False
+        self._before    = None
+        self._after     = None
+        self._peak      = 0
+        self._started   = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+            self._own_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._before = tracemalloc.take_snapshot()
+        self._started = time.perf_counter()
+        self.sampler.start()
+
+    def stop(self) -> None:
+        self.sampler.stop()
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 2)
+        self._after = tracemalloc.take_snapshot()
+        self._peak = tracemalloc.get_traced_memory()[1]
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+
+    def write(self) -> None:
+        directory = os.path.join(PROFILE_OUTPUT_PATH, self.profile_id)
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, ARTIFACTS["stacks"]), "w") as f:
+            for stack, count in self.sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        growth = self._after.filter_traces(ignore).compare_to(self._before.filter_traces(ignore), "lineno")
+        with open(os.path.join(directory, ARTIFACTS["memory"]), "w") as f:
+            f.write(f"peak traced memory: {self._peak / 1024:.1f} KiB\n\n")
+            for stat in growth[:PROFILE_TRACEMALLOC_TOP]:
+                f.write(f"{stat}\n")
+
+        meta = {
+            "profile_id":      self.profile_id,
+            "captured_at":     datetime.now(timezone.utc).isoformat(),
+            "method":          self.method,
+            "path":            self.path,
+            "status":          self.status,
+            "trigger":         self.trigger,
+            "duration_ms":     self.duration_ms,
+            "samples":         self.sampler.samples,
+            "interval_ms":     PROFILE_INTERVAL_MS,
+            "peak_memory_kib": round(self._peak / 1024, 1),
+        }
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        _prune(PROFILE_MAX_KEPT)
+
+
+def _prune(keep: int) -> None:
+    profile_ids = sorted(p for p in os.listdir(PROFILE_OUTPUT_PATH) if _PROFILE_ID.match(p))
+    for profile_id in profile_ids[:-keep] if keep > 0 else profile_ids:
+        shutil.rmtree(os.path.join(PROFILE_OUTPUT_PATH, profile_id), ignore_errors=True)
+
+
+def list_profiles(limit: int = 50) -> List[dict]:
+    """Metadata of captured profiles, newest first."""
+    if not os.path.isdir(PROFILE_OUTPUT_PATH):
+        return []
+    profiles = []
+    for profile_id in sorted((p for p in os.listdir(PROFILE_OUTPUT_PATH) if _PROFILE_ID.match(p)), reverse=True):
+        try:
+            with open(os.path.join(PROFILE_OUTPUT_PATH, profile_id, "meta.json")) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue   # still being written, or pruned meanwhile
+        if len(profiles) >= limit:
+            break
+    return profiles
+
+
+def read_artifact(profile_id: str, artifact: str) -> Optional[str]:
+    if not _PROFILE_ID.match(profile_id) or artifact not in ARTIFACTS:
+        return None
+    path = os.path.join(PROFILE_OUTPUT_PATH, profile_id, ARTIFACTS[artifact])
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read()
+
+
+def _requested_trigger(headers: dict) -> Optional[str]:
+    if headers.get(b"x-profile", b"").lower() in (b"1", b"true"):
+        key = headers.get(b"x-admin-key", b"").decode("latin-1")
+        if ADMIN_API_KEY and hmac.compare_digest(key, ADMIN_API_KEY):
+            return "header"
+        return None
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+class ProfilingMiddleware:
+    """Profiles selected requests to the hot endpoints and adds `X-Profile-Id` to their responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not should_profile_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        trigger = _requested_trigger(dict(scope.get("headers") or []))
+        if trigger is None or not _capture_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], trigger, threading.get_ident())
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.profile_id.encode())]
+            await send(message)
+
+        try:
+            profile.start()
+            try:
+                await self.app(scope, receive, send_with_header)
+            finally:
+                profile.stop()
+                try:
+                    await run_in_threadpool(profile.write)
+                except Exception as e:
+                    logger.warning(f"Could not store profile {profile.profile_id}: {e}")
+        finally:
+            _capture_lock.release()
@@ -0,0 +1,313 @@
+"""
+Lightweight tracing with OpenTelemetry-compatible ids and export.
+
+Spans carry W3C trace context (an incoming `traceparent` header is continued and
+one is returned on every response). Finished spans of sampled traces are written
+as OTLP/JSON `resourceSpans` lines to TRACE_EXPORT_PATH, and also POSTed to an
+OTLP/HTTP collector (e.g. http://localhost:4318/v1/traces) when
+TRACE_OTLP_ENDPOINT is set. Every traced request also gets a `Server-Timing`
+header summing its child spans by name.
+
+With TRACING_ENABLED=false, span() returns a shared no-op context manager and the
+middleware is not installed.
+"""
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import requests
+from core.config import (
+    TRACING_ENABLED, TRACE_SAMPLE_RATE, TRACE_EXPORT_PATH, TRACE_OTLP_ENDPOINT, TRACE_SERVICE_NAME,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_MAX_ENTRIES = 20
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "error", "sampled", "timings")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool,
+                 kind: int = 1, attributes: Optional[dict] = None, timings: Optional[dict] = None):
+        self.trace_id   = trace_id
+        self.span_id    = os.urandom(8).hex()
+        self.parent_id  = parent_id
+        self.name       = name
+        self.kind       = kind          # OTLP SpanKind: 1 internal, 2 server, 3 client
+        self.start_ns   = time.time_ns()
+        self.end_ns     = None
+        self.attributes = attributes or {}
+        self.error      = None
+        self.sampled    = sampled
+        self.timings    = timings       # shared per request: name -> [total ns, count]
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def finish(self, end_ns: Optional[int] = None) -> None:
+        self.end_ns = end_ns or time.time_ns()
+        if self.timings is not None and self.parent_id is not None:
+            entry = self.timings.setdefault(self.name, [0, 0])
+            entry[0] += self.end_ns - self.start_ns
+            entry[1] += 1
+        if self.sampled:
+            _exporter.submit(self)
+
+
+class _NoopSpan:
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@contextmanager
+def _noop_context():
+    yield _NOOP_SPAN
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def parse_traceparent(header: Optional[str]):
+    """(trace_id, parent span_id, sampled) from a W3C traceparent header, or None."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or parts[1] == "0" * 32:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+def start_root_span(name: str, traceparent: Optional[str] = None, kind: int = 2, **attributes) -> Span:
+    parent = parse_traceparent(traceparent)
+    if parent:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id, sampled = os.urandom(16).hex(), None, random.random() < TRACE_SAMPLE_RATE
+    return Span(name, trace_id, parent_id, sampled, kind, attributes, timings={})
+
+
+@contextmanager
+def _span_context(name: str, kind: int, attributes: dict):
+    parent = _current_span.get()
+    if parent is None:
+        span = Span(name, os.urandom(16).hex(), None, random.random() < TRACE_SAMPLE_RATE, kind, attributes)
+    else:
+        span = Span(name, parent.trace_id, parent.span_id, parent.sampled, kind, attributes, parent.timings)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
+
+
+def span(name: str, kind: int = 1, **attributes):
+    """Context manager timing a unit of work as a child of the current span."""
+    if not TRACING_ENABLED:
+        return _noop_context()
+    return _span_context(name, kind, attributes)
+
+
+def traced(name: str, kind: int = 1):
+    """Decorator form of span()."""
+    def decorator(fn):
+        if not TRACING_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _span_context(name, kind, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_methods(prefix: str):
+    """Class decorator: wrap every public static method in a span named `<prefix>.<method>`."""
+    def decorator(cls):
+        if not TRACING_ENABLED:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if isinstance(value, staticmethod) and not attr.startswith("_"):
+                setattr(cls, attr, staticmethod(traced(f"{prefix}.{attr}")(value.__func__)))
+        return cls
+    return decorator
+
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes) -> None:
+    """Record an already-finished child span (for work timed by callbacks, e.g. DB commits)."""
+    parent = _current_span.get()
+    if not TRACING_ENABLED or parent is None:
+        return
+    child = Span(name, parent.trace_id, parent.span_id, parent.sampled, 1, attributes, parent.timings)
+    child.start_ns = start_ns
+    child.finish(end_ns)
+
+
+def server_timing(root: Span, total_ns: int) -> str:
+    entries = sorted(root.timings.items(), key=lambda item: item[1][0], reverse=True)[:SERVER_TIMING_MAX_ENTRIES]
+    parts = [f'{name};dur={total / 1e6:.2f};desc="x{count}"' for name, (total, count) in entries]
+    parts.append(f"total;dur={total_ns / 1e6:.2f}")
+    return ", ".join(parts)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> dict:
+    record = {
+        "traceId":           span.trace_id,
+        "spanId":            span.span_id,
+        "name":              span.name,
+        "kind":              span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano":   str(span.end_ns),
+        "attributes":        [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        "status":            {"code": 2, "message": span.error} if span.error else {"code": 0},
+    }
+    if span.parent_id:
+        record["parentSpanId"] = span.parent_id
+    return record
+
+
+class _SpanExporter:
+    """Batches finished spans on a daemon thread so request threads never do export I/O."""
+
+    def __init__(self, batch_size: int = 256, flush_seconds: float = 2.0):
+        self.batch_size    = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue        = queue.Queue(maxsize=10000)
+        self._thread       = None
+        self._lock         = threading.Lock()
+        self.dropped       = 0
+
+    def submit(self, span: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="trace-exporter")
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._export(batch)
+            except Exception as e:
+                logger.warning(f"Trace export failed for {len(batch)} spans: {e}")
+
+    def _export(self, batch) -> None:
+        payload = {"resourceSpans": [{
+            "resource":   {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "kyc.tracing"}, "spans": [_otlp_span(s) for s in batch]}],
+        }]}
+        if TRACE_EXPORT_PATH:
+            directory = os.path.dirname(TRACE_EXPORT_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(TRACE_EXPORT_PATH, "a") as f:
+                f.write(json.dumps(payload) + "\n")
+        if TRACE_OTLP_ENDPOINT:
+            requests.post(TRACE_OTLP_ENDPOINT, json=payload, timeout=5)
+
+
+_exporter = _SpanExporter()
+
+
+class TracingMiddleware:
+    """
+    Opens the server span for each HTTP request (continuing an incoming traceparent)
+    and adds `traceparent` and `Server-Timing` headers to the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        root = start_root_span(
+            f"{scope['method']} {scope['path']}",
+            traceparent=headers.get(b"traceparent", b"").decode("latin-1") or None,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        token = _current_span.set(root)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{scope['method']} {route}"
+                    root.set_attribute("http.route", route)
+                root.set_attribute("http.status_code", message["status"])
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"traceparent", root.traceparent.encode()),
+                    (b"server-timing", server_timing(root, time.time_ns() - root.start_ns).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            # Root timings stay out of Server-Timing; only children are summed there.
+            root.timings = None
+            root.finish()
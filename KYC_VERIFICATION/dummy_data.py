@@ -1,20 +1,44 @@
-from faker import Faker
+"""
+Seed data for dummy mode and capacity testing.
+
+    python dummy_data.py                                   # curated 83 users (default)
+    python dummy_data.py --count 1000000 --workers 8       # generated users + dummy PAN/bank rows
+    python dummy_data.py --count 200000 --profiles 0.7     # ...plus profiles, verification logs, documents
+    python dummy_data.py --count 50000 --no-reset --offset 1000000
+
+Generated rows depend only on --seed and the row index, so a run is reproducible
+whatever --workers is. PAN, Aadhaar, account and mobile numbers come from a
+bijection of the index, so they never collide and need no uniqueness retries.
+"""
+import argparse
+import csv
+import hashlib
+import io
+import os
 import random
 import string
-import hashlib
-from sqlalchemy import delete
-from core.database import SessionLocal, Base, engine
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from decimal import Decimal
+from faker import Faker
+from sqlalchemy import insert, text
+from core.database import Base, engine
+from core.partitioning import ensure_partitions
 from models.module1_user import User
 from models.dummy_pan import DummyPAN
 from models.dummy_bank_account import DummyBankAccount
-
-Base.metadata.create_all(bind=engine, checkfirst=True)
+from models.user_profile import UserProfile
+from models.kyc_pan_verification import KYCPANVerification
+from models.kyc_aadhaar_verification import KYCAadhaarVerification
+from models.kyc_bank_verification import KYCBankVerification
+from models.document_upload import DocumentUpload
+import models.attempt_tracker
 
 MIN_AGE = 18
 MAX_AGE = 60
 
 fake = Faker("en_IN")
-db = SessionLocal()
 
 BANKS = [
     ("State Bank of India", "SBIN"),
@@ -60,9 +84,7 @@ FEMALE_NAMES = [
     "Nithya Murthy", "Varsha Chowdary", "Supriya Shaik", "Bhargavi Shetty"
 ]
 
-random.seed(42)
 ALL_NAMES = MALE_NAMES + FEMALE_NAMES
-random.shuffle(ALL_NAMES)
 
 def generate_pan(name: str) -> str:
     letters = string.ascii_uppercase
@@ -112,66 +134,438 @@ def fake_password_hash(username: str) -> str:
     raw = f"Test@1234:{username}"
     return hashlib.sha256(raw.encode()).hexdigest()
 
-print("Clearing existing dummy data...")
-db.execute(delete(DummyPAN))
-db.execute(delete(DummyBankAccount))
-db.execute(delete(User))
-db.commit()
-print("Cleared.")
 
-existing_pans = set()
-existing_aadhaars = set()
-existing_accounts = set()
 
-try:
-    for i, name in enumerate(ALL_NAMES, start=1):
+# ── Curated set (default) ─────────────────────────────────────
 
+def seed_curated(seed: int) -> list:
+    """The hand-picked AP/TG names. Returns the rows written, as dicts, for optional KYC generation."""
+    random.seed(seed)
+    Faker.seed(seed)
+    names = list(ALL_NAMES)
+    random.shuffle(names)
+
+    existing_pans, existing_aadhaars, existing_accounts = set(), set(), set()
+    users, pans, banks = [], [], []
+    for i, name in enumerate(names, start=1):
         username = make_username(name, i)
         gender = "Female" if name in FEMALE_NAMES else "Male"
         district = random.choice(DISTRICTS)
-        if district in AP_DISTRICTS:
-            state = "Andhra Pradesh"
-        else:
-            state = "Telangana"
-
-        address = f"{district}, {state}"
-
-        user = User(
-            username=username,
-            mobile_number=make_mobile(i),
-            password_hash=fake_password_hash(username),
-            device_id=None,
-            role="USER",
-        )
-        db.add(user)
-        db.flush()
-
-        pan = DummyPAN(
-            pan_number=generate_unique_pan(name, existing_pans),
-            aadhaar_number=generate_unique_aadhaar(existing_aadhaars),
-            full_name=name,
-            dob=fake.date_of_birth(minimum_age=MIN_AGE, maximum_age=MAX_AGE),
-            address=address,
-            gender=gender,
-        )
-        db.add(pan)
+        state = "Andhra Pradesh" if district in AP_DISTRICTS else "Telangana"
 
+        users.append({
+            "username":      username,
+            "mobile_number": make_mobile(i),
+            "password_hash": fake_password_hash(username),
+            "device_id":     None,
+            "role":          "USER",
+        })
+        pans.append({
+            "pan_number":     generate_unique_pan(name, existing_pans),
+            "aadhaar_number": generate_unique_aadhaar(existing_aadhaars),
+            "full_name":      name,
+            "dob":            fake.date_of_birth(minimum_age=MIN_AGE, maximum_age=MAX_AGE),
+            "address":        f"{district}, {state}",
+            "gender":         gender,
+        })
         bank_name, prefix = random.choice(BANKS)
-        bank = DummyBankAccount(
-            account_number=generate_unique_account(i, existing_accounts),
-            ifsc=generate_ifsc(prefix),
-            bank_name=bank_name,
-            account_holder_name=name,
-            is_active=random.choice([True, True, True, False])
-        )
-        db.add(bank)
-
-    db.commit()
-
-except Exception as e:
-    db.rollback()
-    print(f"\nERROR: {e}")
-    raise
-
-finally:
-    db.close()
\ No newline at end of file
+        banks.append({
+            "account_number":      generate_unique_account(i, existing_accounts),
+            "ifsc":                generate_ifsc(prefix),
+            "bank_name":           bank_name,
+            "account_holder_name": name,
+            "is_active":           random.choice([True, True, True, False]),
+        })
+
+    with engine.begin() as conn:
+        user_ids = [row.id for row in conn.execute(insert(User.__table__).returning(User.__table__.c.id), users)]
+        conn.execute(insert(DummyPAN.__table__), pans)
+        conn.execute(insert(DummyBankAccount.__table__), banks)
+    return [
+        {"user_id": uid, "username": u["username"], **p, "bank": b}
+        for uid, u, p, b in zip(user_ids, users, pans, banks)
+    ]
+
+
+# ── Generated set (--count) ───────────────────────────────────
+
+CHUNK_ROWS = 5000
+PERMUTATION_MULTIPLIER = 2_654_435_761   # prime, coprime with every space below, so index -> number is a bijection
+PAN_SPACE     = 26 ** 5 * 10 ** 4
+AADHAAR_SPACE = 8 * 10 ** 11
+ACCOUNT_SPACE = 9 * 10 ** 11
+MOBILE_SPACE  = 4 * 10 ** 9
+
+FIRST_NAMES_MALE   = sorted({n.split()[0] for n in MALE_NAMES})
+FIRST_NAMES_FEMALE = sorted({n.split()[0] for n in FEMALE_NAMES})
+SURNAMES           = sorted({n.split()[-1] for n in ALL_NAMES})
+MIDDLE_NAMES       = ["Sai", "Sri", "Venkata", "Naga", "Lakshmi", "Siva", "Rama"]
+EMPLOYMENT_TYPES   = [("Salaried", 0.7), ("Self-Employed", 0.2), ("Business", 0.1)]
+DOB_START, DOB_DAYS = date(1966, 1, 1), (date(2006, 12, 31) - date(1966, 1, 1)).days
+
+# Share of profiled users that end each step in each status. A step is only
+# attempted when the previous one is VERIFIED (the API enforces the same order).
+STATUS_RATIOS = {
+    "pan":       {"VERIFIED": 0.88, "FAILED": 0.09, "BLOCKED": 0.03},
+    "aadhaar":   {"VERIFIED": 0.92, "FAILED": 0.06, "BLOCKED": 0.02},
+    "bank":      {"VERIFIED": 0.90, "FAILED": 0.08, "BLOCKED": 0.02},
+    "documents": {"COMPLETE": 0.75, "PENDING_REVIEW": 0.15, "REJECTED": 0.10},
+}
+REVIEWED_DOCUMENT_RATIO = 0.8
+DOCUMENT_UPLOAD_RATIO = 0.85
+RETRIED_BEFORE_SUCCESS_RATIO = 0.10
+ACTIVITY_WINDOW_DAYS = 120
+
+DOCUMENT_FILES = {
+    "PAN_CARD":       ("uploads/pan",             ".jpg", "image/jpeg"),
+    "AADHAAR_FRONT":  ("uploads/aadhaar",         ".jpg", "image/jpeg"),
+    "AADHAAR_BACK":   ("uploads/aadhaar",         ".jpg", "image/jpeg"),
+    "SALARY_SLIP":    ("uploads/salary_slips",    ".pdf", "application/pdf"),
+    "BANK_STATEMENT": ("uploads/bank_statements", ".pdf", "application/pdf"),
+}
+
+
+def _permute(index: int, space: int) -> int:
+    return (index * PERMUTATION_MULTIPLIER + 7_654_321) % space
+
+def bulk_pan(index: int, female: bool) -> str:
+    x = _permute(index, PAN_SPACE)
+    x, digits = divmod(x, 10 ** 4)
+    letters = []
+    for _ in range(5):
+        x, r = divmod(x, 26)
+        letters.append(string.ascii_uppercase[r])
+    return f"{''.join(letters[:3])}{'F' if female else 'P'}{letters[3]}{digits:04d}{letters[4]}"
+
+def bulk_aadhaar(index: int) -> str:
+    x = _permute(index, AADHAAR_SPACE)
+    return f"{2 + x // 10 ** 11}{x % 10 ** 11:011d}"
+
+def bulk_account(index: int) -> str:
+    x = _permute(index, ACCOUNT_SPACE)
+    return f"{1 + x // 10 ** 11}{x % 10 ** 11:011d}"
+
+def bulk_mobile(index: int) -> str:
+    x = _permute(index, MOBILE_SPACE)
+    return f"{6 + x // 10 ** 9}{x % 10 ** 9:09d}"
+
+def _weighted(rng: random.Random, ratios: dict) -> str:
+    return rng.choices(list(ratios), weights=list(ratios.values()))[0]
+
+
+def build_people(rng: random.Random, start: int, stop: int, id_base: int) -> list:
+    people = []
+    for index in range(start, stop):
+        female = rng.random() < 0.5
+        first = rng.choice(FIRST_NAMES_FEMALE if female else FIRST_NAMES_MALE)
+        name = f"{first} {rng.choice(SURNAMES)}"
+        if rng.random() < 0.15:
+            name = f"{rng.choice(MIDDLE_NAMES)} {name}"
+        district = rng.choice(DISTRICTS)
+        bank_name, prefix = rng.choice(BANKS)
+        username = f"{name.lower().replace(' ', '_')}_{index + 1:07d}"
+        people.append({
+            "user_id":        id_base + index,
+            "username":       username,
+            "mobile_number":  bulk_mobile(index),
+            "pan_number":     bulk_pan(index, female),
+            "aadhaar_number": bulk_aadhaar(index),
+            "full_name":      name,
+            "dob":            DOB_START + timedelta(days=rng.randrange(DOB_DAYS)),
+            "address":        f"{district}, {'Andhra Pradesh' if district in AP_DISTRICTS else 'Telangana'}",
+            "gender":         "Female" if female else "Male",
+            "bank": {
+                "account_number":      bulk_account(index),
+                "ifsc":                f"{prefix}0{rng.randrange(10 ** 6):06d}",
+                "bank_name":           bank_name,
+                "account_holder_name": name,
+                "is_active":           rng.random() < 0.75,
+            },
+        })
+    return people
+
+
+def _attempt_outcomes(rng: random.Random, final: str) -> list:
+    """Statuses of each logged attempt for a step that ended in `final`."""
+    if final == "BLOCKED":
+        return ["FAILED", "FAILED", "BLOCKED"]
+    if final == "FAILED":
+        return ["FAILED"] * rng.randint(1, 2)
+    return (["FAILED"] if rng.random() < RETRIED_BEFORE_SUCCESS_RATIO else []) + ["VERIFIED"]
+
+
+def build_kyc_rows(rng: random.Random, person: dict, as_of: datetime) -> dict:
+    """user_profiles row plus the verification logs and documents for one person, at STATUS_RATIOS."""
+    uid, name, bank = person["user_id"], person["full_name"], person["bank"]
+    clock = as_of - timedelta(days=rng.uniform(1, ACTIVITY_WINDOW_DAYS))
+    rows = {"pan": [], "aadhaar": [], "bank": [], "documents": []}
+
+    def tick() -> datetime:
+        nonlocal clock
+        clock = min(as_of, clock + timedelta(minutes=rng.uniform(1, 90)))
+        return clock
+
+    created_at = clock
+    employment = _weighted(rng, dict(EMPLOYMENT_TYPES))
+    profile = {
+        "user_id": uid, "full_name": name, "dob": person["dob"],
+        "email": f"{person['username']}@kyc-seed.dev",
+        "address": f"{rng.randint(1, 999)}-{rng.randint(1, 99)}, {person['address']} - 5{rng.randrange(10 ** 5):05d}",
+        "employment_type": employment,
+        "monthly_income": Decimal(rng.randrange(15000, 250000, 500)),
+        "aadhaar_number": person["aadhaar_number"], "pan_number": person["pan_number"],
+        "verified_name": None, "profile_status": "PROFILE_COMPLETED",
+        "pan_status": "PENDING", "aadhaar_status": "PENDING", "bank_status": "PENDING",
+        "identity_status": "PENDING", "document_status": "PENDING", "kyc_status": "INCOMPLETE",
+        "pan_locked": False, "aadhaar_locked": False, "dob_locked": False, "name_locked": False, "bank_locked": False,
+        "pan_verified_at": None, "aadhaar_verified_at": None, "bank_verified_at": None,
+        "created_at": created_at,
+    }
+
+    pan_final = _weighted(rng, STATUS_RATIOS["pan"])
+    for attempt, status in enumerate(_attempt_outcomes(rng, pan_final), start=1):
+        verified = status == "VERIFIED"
+        at = tick()
+        rows["pan"].append({
+            "user_id": uid, "pan_number": person["pan_number"],
+            "full_name_submitted": name if verified else f"{name.split()[0]} {rng.choice(SURNAMES)}",
+            "verified_name": name,
+            "match_percentage": 100.0 if verified else round(rng.uniform(40, 79), 2),
+            "name_match": verified, "status": status,
+            "failure_reason": None if verified else "Name mismatch",
+            "attempt_number": attempt, "created_at": at,
+        })
+    profile["pan_status"] = pan_final
+    if pan_final == "VERIFIED":
+        profile.update(verified_name=name, pan_locked=True, name_locked=True, pan_verified_at=clock)
+
+        aadhaar_final = _weighted(rng, STATUS_RATIOS["aadhaar"])
+        for attempt, status in enumerate(_attempt_outcomes(rng, aadhaar_final), start=1):
+            verified = status == "VERIFIED"
+            at = tick()
+            submitted = person["dob"] if verified else person["dob"] + timedelta(days=rng.choice([-365, -31, 1, 30]))
+            rows["aadhaar"].append({
+                "user_id": uid, "aadhaar_number": person["aadhaar_number"],
+                "dob_submitted": str(submitted), "verified_dob": str(person["dob"]),
+                "dob_match": verified, "status": status,
+                "failure_reason": None if verified else "Date of birth does not match Aadhaar records",
+                "attempt_number": attempt, "created_at": at, "verified_at": at,
+            })
+        profile["aadhaar_status"] = aadhaar_final
+        if aadhaar_final == "VERIFIED":
+            profile.update(aadhaar_locked=True, dob_locked=True, aadhaar_verified_at=clock, identity_status="VERIFIED")
+
+            bank_final = _weighted(rng, STATUS_RATIOS["bank"]) if bank["is_active"] else rng.choice(["FAILED", "BLOCKED"])
+            for attempt, status in enumerate(_attempt_outcomes(rng, bank_final), start=1):
+                verified = status == "VERIFIED"
+                at = tick()
+                reason = None
+                if not verified:
+                    reason = ("Bank account is inactive or closed — please use an active account"
+                              if not bank["is_active"] else "Account holder name mismatch")
+                rows["bank"].append({
+                    "user_id": uid, "account_number": bank["account_number"],
+                    "account_holder_name": name, "bank_name": bank["bank_name"], "ifsc": bank["ifsc"],
+                    "name_match_percentage": 100.0 if verified or not bank["is_active"] else round(rng.uniform(40, 79), 2),
+                    "status": status, "failure_reason": reason,
+                    "attempt_number": attempt, "created_at": at, "verified_at": at,
+                })
+            profile["bank_status"] = bank_final
+            if bank_final == "VERIFIED":
+                profile.update(bank_locked=True, bank_verified_at=clock)
+
+    if profile["bank_status"] == "VERIFIED" and rng.random() < DOCUMENT_UPLOAD_RATIO:
+        income_doc = "SALARY_SLIP" if employment == "Salaried" else "BANK_STATEMENT"
+        doc_types = ("PAN_CARD", "AADHAAR_FRONT", "AADHAAR_BACK", income_doc)
+        outcome = _weighted(rng, STATUS_RATIOS["documents"])
+        odd_one = rng.choice(doc_types)
+        for doc_type in doc_types:
+            folder, ext, mime = DOCUMENT_FILES[doc_type]
+            status = "APPROVED" if rng.random() < REVIEWED_DOCUMENT_RATIO else "VERIFIED"
+            if doc_type == odd_one and outcome != "COMPLETE":
+                status = "UPLOADED" if outcome == "PENDING_REVIEW" else "REJECTED"
+            uploaded_at = tick()
+            reviewed = status in ("APPROVED", "REJECTED")
+            reviewed_at = uploaded_at + timedelta(hours=rng.uniform(1, 48)) if reviewed else None
+            file_name = f"{uid}_{doc_type}{ext}"
+            rows["documents"].append({
+                "user_id": uid, "email": profile["email"], "document_type": doc_type,
+                "file_name": file_name, "file_path": f"{folder}/{file_name}",
+                "file_size": rng.randint(60_000, 1_900_000), "mime_type": mime, "status": status,
+                "extracted_name": None, "extracted_id_number": None, "name_match_percentage": None,
+                "verification_remarks": None, "verified_at": uploaded_at if status == "VERIFIED" else None,
+                "admin_remarks": "Document is blurry, please re-upload" if status == "REJECTED" else None,
+                "uploaded_at": uploaded_at,
+                "reviewed_at": reviewed_at,
+                "reviewed_by": "seed-admin" if reviewed else None,
+                "updated_at": reviewed_at or uploaded_at,
+            })
+        statuses = {d["document_type"]: d["status"] for d in rows["documents"]}
+        if all(s in ("APPROVED", "VERIFIED") for s in statuses.values()):
+            profile["document_status"] = "APPROVED"
+            profile["kyc_status"] = "COMPLETED"
+        else:
+            profile["document_status"] = "UPLOADED"
+
+    profile["updated_at"] = clock
+    rows["profile"] = profile
+    return rows
+
+
+def _copy_rows(conn, table, rows: list) -> None:
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+    buffer.seek(0)
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def write_rows(conn, table, rows: list, method: str, batch_size: int) -> None:
+    if not rows:
+        return
+    if method == "copy":
+        _copy_rows(conn, table, rows)
+        return
+    for i in range(0, len(rows), batch_size):
+        conn.execute(insert(table), rows[i:i + batch_size])
+
+
+def _init_worker() -> None:
+    # Connections inherited from the parent process must not be reused after fork.
+    engine.dispose(close=False)
+
+
+def seed_chunk(chunk_start: int, chunk_stop: int, options: dict) -> dict:
+    """Generate and write one chunk in a single transaction. Row content depends only on seed and index."""
+    rng = random.Random(f"{options['seed']}:{chunk_start}")
+    people = build_people(rng, chunk_start, chunk_stop, options["id_base"])
+
+    users = [{
+        "id": p["user_id"], "username": p["username"], "mobile_number": p["mobile_number"],
+        "password_hash": fake_password_hash(p["username"]), "device_id": None, "role": "USER",
+    } for p in people]
+    pans = [{k: p[k] for k in ("pan_number", "aadhaar_number", "full_name", "dob", "address", "gender")} for p in people]
+    banks = [p["bank"] for p in people]
+
+    kyc = {"profile": [], "pan": [], "aadhaar": [], "bank": [], "documents": []}
+    for person in people:
+        if rng.random() < options["profiles"]:
+            rows = build_kyc_rows(rng, person, options["as_of"])
+            kyc["profile"].append(rows.pop("profile"))
+            for key, value in rows.items():
+                kyc[key].extend(value)
+
+    method, batch_size = options["method"], options["batch_size"]
+    with engine.begin() as conn:
+        # users belongs to the auth module, whose model may rely on Python-side defaults, so it always goes through insert()
+        write_rows(conn, User.__table__, users, "insert", batch_size)
+        write_rows(conn, DummyPAN.__table__, pans, method, batch_size)
+        write_rows(conn, DummyBankAccount.__table__, banks, method, batch_size)
+        write_rows(conn, UserProfile.__table__, kyc["profile"], method, batch_size)
+        write_rows(conn, KYCPANVerification.__table__, kyc["pan"], method, batch_size)
+        write_rows(conn, KYCAadhaarVerification.__table__, kyc["aadhaar"], method, batch_size)
+        write_rows(conn, KYCBankVerification.__table__, kyc["bank"], method, batch_size)
+        write_rows(conn, DocumentUpload.__table__, kyc["documents"], method, batch_size)
+
+    return {"users": len(users), "profiles": len(kyc["profile"]), "verification_logs":
+            len(kyc["pan"]) + len(kyc["aadhaar"]) + len(kyc["bank"]), "documents": len(kyc["documents"])}
+
+
+def seed_generated(args, as_of: datetime) -> dict:
+    with engine.connect() as conn:
+        id_base = (conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM users")).scalar() or 0) + 1 - args.offset
+    options = {
+        "seed": args.seed, "id_base": id_base, "profiles": args.profiles, "as_of": as_of,
+        "method": args.method, "batch_size": args.batch_size,
+    }
+    chunks = [(s, min(s + CHUNK_ROWS, args.offset + args.count)) for s in range(args.offset, args.offset + args.count, CHUNK_ROWS)]
+    totals = {"users": 0, "profiles": 0, "verification_logs": 0, "documents": 0}
+    started = time.perf_counter()
+
+    def collect(result: dict) -> None:
+        for key, value in result.items():
+            totals[key] += value
+        elapsed = time.perf_counter() - started
+        print(f"  {totals['users']:>10,} users  {totals['profiles']:>10,} profiles  "
+              f"({totals['users'] / elapsed:,.0f} users/s)", end="\r", flush=True)
+
+    if args.workers <= 1:
+        for start, stop in chunks:
+            collect(seed_chunk(start, stop, options))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(seed_chunk, start, stop, options) for start, stop in chunks]
+            for future in futures:
+                collect(future.result())
+    print()
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))"))
+    return totals
+
+
+def seed_curated_kyc(people: list, seed: int, profiles: float, as_of: datetime) -> int:
+    rng = random.Random(f"{seed}:curated-kyc")
+    kyc = {"profile": [], "pan": [], "aadhaar": [], "bank": [], "documents": []}
+    for person in people:
+        if rng.random() < profiles:
+            rows = build_kyc_rows(rng, person, as_of)
+            kyc["profile"].append(rows.pop("profile"))
+            for key, value in rows.items():
+                kyc[key].extend(value)
+    with engine.begin() as conn:
+        for table, key in ((UserProfile, "profile"), (KYCPANVerification, "pan"), (KYCAadhaarVerification, "aadhaar"),
+                           (KYCBankVerification, "bank"), (DocumentUpload, "documents")):
+            write_rows(conn, table.__table__, kyc[key], "insert", 1000)
+    return len(kyc["profile"])
+
+
+def reset_tables() -> None:
+    # CASCADE also clears user_profiles and every table that references it.
+    with engine.begin() as conn:
+        conn.execute(text(
+            "TRUNCATE TABLE users, dummy_pans, dummy_bank_accounts, verification_attempt_trackers RESTART IDENTITY CASCADE"
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed dummy-mode reference data and synthetic KYC users")
+    parser.add_argument("--count", type=int, default=0, help="generated users (0 = curated 83-name set)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT when --method insert")
+    parser.add_argument("--method", choices=["copy", "insert"], default="copy")
+    parser.add_argument("--profiles", type=float, default=0.0,
+                        help="fraction of users that also get a profile, verification logs and documents")
+    parser.add_argument("--offset", type=int, default=0, help="first row index; use a fresh range when appending")
+    parser.add_argument("--no-reset", action="store_true", help="keep existing rows instead of truncating")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, checkfirst=True)
+    as_of = datetime.combine(date.today(), dtime.min, tzinfo=timezone.utc)
+    ensure_partitions(engine, since=as_of - timedelta(days=ACTIVITY_WINDOW_DAYS + 1))
+
+    if not args.no_reset:
+        print("Clearing existing dummy data...")
+        reset_tables()
+        print("Cleared.")
+
+    if args.count <= 0:
+        people = seed_curated(args.seed)
+        print(f"Inserted {len(people)} curated users, dummy PANs and bank accounts")
+        if args.profiles > 0:
+            print(f"Inserted {seed_curated_kyc(people, args.seed, args.profiles, as_of)} profiles with KYC history")
+        return
+
+    started = time.perf_counter()
+    totals = seed_generated(args, as_of)
+    print(f"Inserted {totals['users']:,} users, {totals['profiles']:,} profiles, "
+          f"{totals['verification_logs']:,} verification logs and {totals['documents']:,} documents "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,85 @@
 import logging
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import os
-from core.database import Base, engine
+from sqlalchemy import inspect, text
+from core.database import Base, engine, SessionLocal
+from core.config import VERIFICATION_MODE, TRACING_ENABLED, PROFILING_ENABLED
+from core.partitioning import ensure_partitions
 from routers.profile_router import router as profile_router
 from routers.pan_router import router as pan_router
 from routers.aadhaar_router import router as aadhaar_router
 from routers.bank_router import router as bank_router
 from routers.document_router import router as document_router
 from routers.admin_router import router as admin_router
-from services.auto_cleanup import AutoCleanup
+from routers.metrics_router import router as metrics_router
+from routers.events_router import router as events_router
+from routers.kyc_summary_router import router as kyc_summary_router
+from core.metrics import MetricsMiddleware
+from core.compression import CompressionMiddleware
+from core.tracing import TracingMiddleware
+from core.profiling import ProfilingMiddleware
+from services.cleanup_scheduler import cleanup_scheduler
+from services.status_event_bus import status_events
+from services.batch_verification_service import batch_runner
+from repositories.dummy_reference_index import DUMMY_REFERENCE_INDEX, RELOAD_EVENT
 import models.module1_user
 
 logging.basicConfig( level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-auto_cleanup = AutoCleanup(interval_hours=24)
+def load_dummy_index():
+    db = SessionLocal()
+    try:
+        DUMMY_REFERENCE_INDEX.load(db)
+    finally:
+        db.close()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting KYC backend...")
     Base.metadata.create_all(bind=engine, checkfirst=True)
+    # create_all does not add columns to existing tables; document_uploads.updated_at drives list ETags.
+    if "updated_at" not in {c["name"] for c in inspect(engine).get_columns("document_uploads")}:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE document_uploads ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now()"))
+    # kyc_bank_verifications.verified_name (the bank's name for the account) feeds name-match rescoring.
+    if "verified_name" not in {c["name"] for c in inspect(engine).get_columns("kyc_bank_verifications")}:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE kyc_bank_verifications ADD COLUMN IF NOT EXISTS verified_name VARCHAR(150)"))
     logger.info("Database tables created")
+    ensure_partitions(engine)
 
     upload_dirs = ["uploads","uploads/aadhaar","uploads/pan","uploads/salary_slips","uploads/bank_statements"]
     for dir_path in upload_dirs:
         os.makedirs(dir_path, exist_ok=True)
     logger.info("Upload directories ready")
 
-    auto_cleanup.start()
-    logger.info("Auto cleanup service started")
+    if VERIFICATION_MODE == "dummy":
+        load_dummy_index()
+        status_events.on_control(RELOAD_EVENT, load_dummy_index)
+
+    cleanup_scheduler.start()
+
+    batch_runner.start(is_leader=cleanup_scheduler.is_leader)
+
+    status_events.start()
 
     yield
 
-    auto_cleanup.stop()
-    logger.info("Auto cleanup service stopped")
+    status_events.stop()
+    batch_runner.stop()
+    cleanup_scheduler.stop()
     logger.info("KYC backend stopped")
 
-app = FastAPI(title="KYC Verification Module",lifespan=lifespan)
+app = FastAPI(title="KYC Verification Module",lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 app.include_router(profile_router)
 app.include_router(pan_router)
@@ -45,6 +87,9 @@ app.include_router(aadhaar_router)
 app.include_router(bank_router)
 app.include_router(document_router)
 app.include_router(admin_router)
+app.include_router(metrics_router)
+app.include_router(events_router)
+app.include_router(kyc_summary_router)
 
 @app.get("/")
 def root():
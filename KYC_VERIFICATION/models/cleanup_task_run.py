@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, Integer
+from core.database import Base
+
+class CleanupTaskRun(Base):
+    __tablename__ = "cleanup_task_runs"
+
+    task = Column(String(50), primary_key=True)
+    status = Column(String(20), nullable=False)          # RUNNING, SUCCEEDED, FAILED
+    runner = Column(String(100), nullable=False)         # host:pid of the leader that ran it
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    next_run_at = Column(DateTime(timezone=True), nullable=True)
+    removed = Column(Integer, nullable=True)
+    error = Column(String(500), nullable=True)
@@ -39,6 +39,7 @@ class DocumentUpload(Base):
     uploaded_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
     reviewed_by = Column(String(100), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
     # FIX: relationship INSIDE the class (was outside, caused SQLAlchemy crash)
     user = relationship("UserProfile", back_populates="documents")
@@ -46,4 +47,5 @@ class DocumentUpload(Base):
     __table_args__ = (
         Index("idx_document_status", "status"),
         Index("idx_user_document",   "user_id", "document_type"),
+        Index("idx_document_file_path", "file_path"),
     )
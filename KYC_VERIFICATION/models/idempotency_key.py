@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, Integer, LargeBinary, Index
+from core.database import Base
+
+class IdempotencyKey(Base):
+    """
+    One row per Idempotency-Key: a hash of the key, a hash of the request it was first
+    used with and, once that request finished, its status code and JSON body.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key_hash = Column(String(64), primary_key=True)
+    scope = Column(String(30), nullable=False)
+    user_id = Column(BigInteger, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)        # NULL while the first request is still running
+    response_body = Column(LargeBinary, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("idx_idempotency_key_expires", "expires_at"),
+    )
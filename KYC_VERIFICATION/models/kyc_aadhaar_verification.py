@@ -6,16 +6,17 @@ from core.database import Base
 class KYCAadhaarVerification(Base):
     __tablename__ = "kyc_aadhaar_verifications"
 
+    # created_at and status are the partition keys, so Postgres needs them in the primary key
     id  = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id  = Column(BigInteger, ForeignKey("user_profiles.user_id"), nullable=False, index=True)
     aadhaar_number = Column(String(12), nullable=False)
     dob_submitted = Column(String(20), nullable=False, default="")
     verified_dob = Column(String(20), nullable=False, default="")
     dob_match = Column(Boolean, nullable=False, default=False)
-    status = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False, primary_key=True)
     failure_reason = Column(String(200), nullable=True)
     attempt_number = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False, primary_key=True)
     verified_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     # FIX: relationship INSIDE the class (was outside, caused crash)
@@ -23,5 +24,7 @@ class KYCAadhaarVerification(Base):
 
     __table_args__ = (
         Index("idx_aadhaar_status", "status"),
+        Index("idx_aadhaar_user_created", "user_id", "created_at"),
         Index("idx_user_aadhaar",   "user_id", "aadhaar_number"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # see core/partitioning.py
     )
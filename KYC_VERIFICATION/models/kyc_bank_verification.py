@@ -6,6 +6,7 @@ from core.database import Base
 class KYCBankVerification(Base):
     __tablename__ = "kyc_bank_verifications"
 
+    # created_at and status are the partition keys, so Postgres needs them in the primary key
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey("user_profiles.user_id"), nullable=False, index=True)
     account_number = Column(String(20),  nullable=False)
@@ -13,10 +14,11 @@ class KYCBankVerification(Base):
     bank_name = Column(String(100), nullable=False)
     ifsc = Column(String(11),  nullable=False)
     name_match_percentage = Column(Float, nullable=True)
-    status = Column(String(20),  nullable=False)
+    verified_name = Column(String(150), nullable=True)  # name returned by the bank (Cashfree name_at_bank / dummy record)
+    status = Column(String(20),  nullable=False, primary_key=True)
     failure_reason = Column(String(200), nullable=True)
     attempt_number = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False, primary_key=True)
     verified_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     # FIX: relationship INSIDE the class (was outside, caused crash)
@@ -24,6 +26,8 @@ class KYCBankVerification(Base):
 
     __table_args__ = (
         Index("idx_bank_status",    "status"),
+        Index("idx_bank_user_created", "user_id", "created_at"),
         Index("idx_user_bank",      "user_id", "account_number"),
         Index("idx_account_lookup", "account_number"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # see core/partitioning.py
     )
@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime, Integer, Index, ForeignKey, BigInteger, JSON
+from core.database import Base
+
+class KYCBatchJob(Base):
+    __tablename__ = "kyc_batch_jobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    step = Column(String(20), nullable=False)                       # PAN or BANK
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING, RUNNING, COMPLETED, CANCELLED
+    total_items = Column(Integer, nullable=False)
+    concurrency = Column(Integer, nullable=False)
+    created_by = Column(String(100), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_batch_job_status", "status"),
+    )
+
+class KYCBatchJobItem(Base):
+    __tablename__ = "kyc_batch_job_items"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    job_id = Column(BigInteger, ForeignKey("kyc_batch_jobs.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(BigInteger, nullable=False)
+    payload = Column(JSON, nullable=True)                            # bank account details for BANK jobs
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING, RUNNING, SUCCEEDED, FAILED, SKIPPED
+    http_status = Column(Integer, nullable=True)
+    message = Column(String(500), nullable=True)
+    retries = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_batch_item_job_status", "job_id", "status"),
+    )
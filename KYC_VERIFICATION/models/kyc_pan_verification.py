@@ -6,6 +6,7 @@ from core.database import Base
 class KYCPANVerification(Base):
     __tablename__ = "kyc_pan_verifications"
 
+    # created_at and status are the partition keys, so Postgres needs them in the primary key
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey("user_profiles.user_id"), nullable=False, index=True)
     pan_number = Column(String(10),  nullable=False)
@@ -13,15 +14,17 @@ class KYCPANVerification(Base):
     verified_name = Column(String(150), nullable=False, default="")
     match_percentage = Column(Float, nullable=True)
     name_match = Column(Boolean, nullable=False, default=False)
-    status = Column(String(20),  nullable=False)
+    status = Column(String(20),  nullable=False, primary_key=True)
     failure_reason = Column(String(200), nullable=True)
     attempt_number= Column(Integer,     nullable=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False, primary_key=True)
 
     # FIX: relationship INSIDE the class (was outside, caused crash)
     user = relationship("UserProfile", back_populates="pan_verifications")
 
     __table_args__ = (
         Index("idx_pan_status", "status"),
+        Index("idx_pan_user_created", "user_id", "created_at"),
         Index("idx_user_pan",   "user_id", "pan_number"),
-    )
\ No newline at end of file
+        {"postgresql_partition_by": "RANGE (created_at)"},  # see core/partitioning.py
+    )
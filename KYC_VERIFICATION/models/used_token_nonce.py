@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, Index
+from core.database import Base
+
+class UsedTokenNonce(Base):
+    """Nonces of spent single-use tokens, kept until the token would have expired anyway."""
+    __tablename__ = "used_token_nonces"
+
+    nonce = Column(String(32), primary_key=True)
+    purpose = Column(String(20), nullable=False)
+    user_id = Column(BigInteger, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("idx_used_token_nonce_expires", "expires_at"),
+    )
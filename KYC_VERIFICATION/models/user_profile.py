@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Date, DateTime, DECIMAL, Boolean, Index, BigInteger, Integer, ForeignKey
+from sqlalchemy import Column, String, Date, DateTime, DECIMAL, Boolean, Index, BigInteger, ForeignKey
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -23,9 +23,6 @@ class UserProfile(Base):
     identity_status = Column(String(20), default="PENDING", nullable=False)
     document_status = Column(String(20), default="PENDING", nullable=False)
     kyc_status = Column(String(20), default="INCOMPLETE", nullable=False)
-    aadhaar_initiate_token = Column(String(64),nullable=True)
-    aadhaar_token_created_at = Column(DateTime(timezone=True), nullable=True)
-    aadhaar_token_attempt_count = Column(Integer, default=0,nullable=True)
     pan_locked = Column(Boolean, default=False, nullable=False)
     aadhaar_locked = Column(Boolean, default=False, nullable=False)
     dob_locked = Column(Boolean, default=False, nullable=False)
@@ -0,0 +1,35 @@
+"""
+Move existing kyc_*_verifications tables into the monthly partitioned layout
+(see core/partitioning.py). Each table is migrated in its own transaction and
+holds an exclusive lock on it until the copy finishes, so run this in a
+maintenance window. Tables that are already partitioned are left alone.
+
+    python partition_verification_tables.py
+    python partition_verification_tables.py --keep-legacy    # keep <table>_legacy for checking
+"""
+import argparse
+from core.database import engine
+from core.partitioning import migrate_table, ensure_partitions
+from models.kyc_pan_verification import KYCPANVerification
+from models.kyc_aadhaar_verification import KYCAadhaarVerification
+from models.kyc_bank_verification import KYCBankVerification
+import models.module1_user
+import models.user_profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partition the verification log tables by month")
+    parser.add_argument("--keep-legacy", action="store_true", help="keep the old table as <table>_legacy")
+    args = parser.parse_args()
+
+    for model in (KYCPANVerification, KYCAadhaarVerification, KYCBankVerification):
+        copied = migrate_table(engine, model, keep_legacy=args.keep_legacy)
+        if copied is None:
+            print(f"{model.__tablename__}: already partitioned")
+        else:
+            print(f"{model.__tablename__}: {copied} rows copied")
+    ensure_partitions(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,13 @@ import requests
 from datetime import date
 from sqlalchemy.orm import Session
 from core.config import VERIFICATION_MODE, DIGILOCKER_CLIENT_ID, DIGILOCKER_CLIENT_SECRET, DIGILOCKER_REDIRECT_URI, DIGILOCKER_AUTH_URL, DIGILOCKER_TOKEN_URL, DIGILOCKER_AADHAAR_URL
-from repositories.dummy_pan_repository import DummyPANRepository
+from repositories.dummy_reference_index import DUMMY_REFERENCE_INDEX
+from utils.provider_guard import get_provider_guard
 
 logger = logging.getLogger(__name__)
 
+DIGILOCKER_GUARD = get_provider_guard("digilocker", service="Aadhaar", timeout=10)
+
 class DummyAadhaarProvider:
     @staticmethod
     def get_auth_url(state: str = "") -> str:
@@ -15,7 +18,7 @@ class DummyAadhaarProvider:
     @staticmethod
     def verify(db: Session, aadhaar_number: str, dob_submitted: date,
                auth_code: str = None) -> dict:
-        record = DummyPANRepository.get_by_aadhaar_number(db, aadhaar_number)
+        record = DUMMY_REFERENCE_INDEX.get_by_aadhaar(db, aadhaar_number)
 
         if not record:
             return {
@@ -60,28 +63,33 @@ class DigiLockerAadhaarProvider:
 
     @staticmethod
     def _exchange_code_for_token(auth_code: str) -> str:
-        resp = requests.post(
-            DIGILOCKER_TOKEN_URL,
-            data={
-                "code": auth_code,
-                "grant_type": "authorization_code",
-                "client_id": DIGILOCKER_CLIENT_ID,
-                "client_secret": DIGILOCKER_CLIENT_SECRET,
-                "redirect_uri": DIGILOCKER_REDIRECT_URI,
-            },
-            timeout=10,
-        )
-        resp.raise_for_status()
+        with DIGILOCKER_GUARD.protect("token"):
+            resp = requests.post(
+                DIGILOCKER_TOKEN_URL,
+                data={
+                    "code": auth_code,
+                    "grant_type": "authorization_code",
+                    "client_id": DIGILOCKER_CLIENT_ID,
+                    "client_secret": DIGILOCKER_CLIENT_SECRET,
+                    "redirect_uri": DIGILOCKER_REDIRECT_URI,
+                },
+                timeout=DIGILOCKER_GUARD.timeout,
+            )
+            resp.raise_for_status()
         return resp.json()["access_token"]
 
     @staticmethod
     def _fetch_aadhaar_xml(access_token: str) -> dict:
-        resp = requests.get(
-            DIGILOCKER_AADHAAR_URL,
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=10,
-        )
-        resp.raise_for_status()
+        with DIGILOCKER_GUARD.protect("aadhaar_xml"):
+            resp = DIGILOCKER_GUARD.send(
+                lambda timeout: requests.get(
+                    DIGILOCKER_AADHAAR_URL,
+                    headers={"Authorization": f"Bearer {access_token}"},
+                    timeout=timeout,
+                ),
+                hedge=True,
+            )
+            resp.raise_for_status()
         import xml.etree.ElementTree as ET
         root = ET.fromstring(resp.text)
         uid_data = root.find(".//UidData/Poi")
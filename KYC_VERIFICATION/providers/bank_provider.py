@@ -2,16 +2,19 @@ import logging
 import requests
 from sqlalchemy.orm import Session
 from core.config import VERIFICATION_MODE, NAME_MATCH_THRESHOLD, CASHFREE_APP_ID, CASHFREE_SECRET_KEY, CASHFREE_BANK_URL, BANK_MAX_ATTEMPTS, BANK_COOLDOWN_HOURS
-from repositories.dummy_bank_account_repository import DummyBankAccountRepository
+from repositories.dummy_reference_index import DUMMY_REFERENCE_INDEX
 from utils.name_matcher import name_match_percentage
+from utils.provider_guard import get_provider_guard
 
 logger = logging.getLogger(__name__)
 
+CASHFREE_GUARD = get_provider_guard("cashfree", service="Bank", timeout=15)
+
 class DummyBankProvider:
     @staticmethod
     def verify(db: Session, account_number: str, account_holder_name: str,
                bank_name: str, ifsc: str) -> dict:
-        record = DummyBankAccountRepository.get_by_account_number(db, account_number)
+        record = DUMMY_REFERENCE_INDEX.get_account(db, account_number)
 
         if not record:
             return {
@@ -79,21 +82,24 @@ class CashfreeBankProvider:
             )
 
         try:
-            response = requests.post(
-                CASHFREE_BANK_URL,
-                headers={
-                    "x-client-id":     CASHFREE_APP_ID,
-                    "x-client-secret": CASHFREE_SECRET_KEY,
-                    "Content-Type":    "application/json",
-                },
-                json={
-                    "bank_account": account_number,
-                    "ifsc":         ifsc,
-                    "name":         account_holder_name,
-                },
-                timeout=15,
-            )
-            response.raise_for_status()
+            with CASHFREE_GUARD.protect():
+                response = CASHFREE_GUARD.send(
+                    lambda timeout: requests.post(
+                        CASHFREE_BANK_URL,
+                        headers={
+                            "x-client-id":     CASHFREE_APP_ID,
+                            "x-client-secret": CASHFREE_SECRET_KEY,
+                            "Content-Type":    "application/json",
+                        },
+                        json={
+                            "bank_account": account_number,
+                            "ifsc":         ifsc,
+                            "name":         account_holder_name,
+                        },
+                        timeout=timeout,
+                    ),
+                )
+                response.raise_for_status()
             data = response.json()
             api_status = data.get("account_status", "")
             if api_status not in ("VALID",):
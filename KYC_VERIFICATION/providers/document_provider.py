@@ -2,9 +2,13 @@ import logging
 import requests
 from core.config import VERIFICATION_MODE, HYPERVERGE_APP_ID, HYPERVERGE_APP_KEY, HYPERVERGE_API_URL
 from models.document_upload import DocumentType
+from utils.name_matcher import name_match_percentage
+from utils.provider_guard import get_provider_guard
 
 logger = logging.getLogger(__name__)
 
+HYPERVERGE_GUARD = get_provider_guard("hyperverge", service="Document", timeout=30)
+
 
 class DummyDocumentProvider:
     """
@@ -55,17 +59,6 @@ class HyperVergeDocumentProvider:
         DocumentType.BANK_STATEMENT: None,
     }
 
-    @staticmethod
-    def _name_match(a: str, b: str) -> float:
-        a, b = a.upper().strip(), b.upper().strip()
-        if a == b:
-            return 100.0
-        longer = max(len(a), len(b))
-        if longer == 0:
-            return 100.0
-        matches = sum(c1 == c2 for c1, c2 in zip(a, b))
-        return round((matches / longer) * 100, 2)
-
     @staticmethod
     def verify(document_type: DocumentType, file_path: str, registered_name: str) -> dict:
         if not HYPERVERGE_APP_ID or not HYPERVERGE_APP_KEY:
@@ -79,12 +72,12 @@ class HyperVergeDocumentProvider:
         url = HYPERVERGE_API_URL.rstrip("/") + endpoint
 
         try:
-            with open(file_path, "rb") as f:
+            with open(file_path, "rb") as f, HYPERVERGE_GUARD.protect():
                 resp = requests.post(
                     url,
                     files={"file": (file_path.split("/")[-1], f)},
                     headers={"appId": HYPERVERGE_APP_ID, "appKey": HYPERVERGE_APP_KEY},
-                    timeout=30,
+                    timeout=HYPERVERGE_GUARD.timeout,
                 )
                 resp.raise_for_status()
 
@@ -111,7 +104,7 @@ class HyperVergeDocumentProvider:
 
             name_match = None
             if extracted_name and registered_name:
-                name_match = HyperVergeDocumentProvider._name_match(extracted_name, registered_name)
+                name_match = name_match_percentage(extracted_name, registered_name)
 
             return {
                 "success":               True,
@@ -1,17 +1,26 @@
 import logging
 import requests
 from sqlalchemy.orm import Session
-from core.config import VERIFICATION_MODE,NAME_MATCH_THRESHOLD, KARZA_API_KEY, KARZA_PAN_URL, PAN_MAX_ATTEMPTS, PAN_COOLDOWN_HOURS
-from repositories.dummy_pan_repository import DummyPANRepository
+from core.config import VERIFICATION_MODE,NAME_MATCH_THRESHOLD, KARZA_API_KEY, KARZA_PAN_URL, PAN_MAX_ATTEMPTS, PAN_COOLDOWN_HOURS, PAN_LOOKUP_CACHE_TTL_SECONDS, PAN_LOOKUP_CACHE_MAX_ENTRIES
+from repositories.dummy_reference_index import DUMMY_REFERENCE_INDEX
 from utils.name_matcher import name_match_percentage
+from utils.provider_guard import get_provider_guard
+from utils.ttl_cache import get_cache
 
 
 logger = logging.getLogger(__name__)
 
+KARZA_GUARD = get_provider_guard("karza", service="PAN", timeout=10)
+# Karza statusCodes that are a final answer about the PAN itself: 101 valid,
+# 102 invalid PAN, 103 no records found. Anything else (rate limits, upstream or
+# internal errors, consent issues) is temporary and must not stick to the PAN.
+KARZA_DEFINITIVE_STATUS_CODES = {101, 102, 103}
+KARZA_LOOKUP_CACHE = get_cache("karza_pan_lookup", PAN_LOOKUP_CACHE_TTL_SECONDS, PAN_LOOKUP_CACHE_MAX_ENTRIES)
+
 class DummyPANProvider:
     @staticmethod
     def verify(db: Session, pan_number: str, full_name: str) -> dict:
-        record = DummyPANRepository.get_by_pan_number(db, pan_number)
+        record = DUMMY_REFERENCE_INDEX.get_pan(db, pan_number)
 
         if not record:
             return {
@@ -38,6 +47,40 @@ class DummyPANProvider:
 
 class KarzaPANProvider:
 
+    @staticmethod
+    def _lookup(pan_number: str) -> dict:
+        # Karza's answer for a PAN doesn't depend on the submitted name, so a retry
+        # after a profile name fix re-runs only the local comparison.
+        cached = KARZA_LOOKUP_CACHE.get(pan_number)
+        if cached is not None:
+            return cached
+
+        with KARZA_GUARD.protect():
+            response = KARZA_GUARD.send(
+                lambda timeout: requests.post(
+                    KARZA_PAN_URL,
+                    headers={
+                        "x-karza-key": KARZA_API_KEY,
+                        "Content-Type": "application/json",
+                    },
+                    json={"pan": pan_number, "consent": "Y"},
+                    timeout=timeout,
+                ),
+            )
+            response.raise_for_status()
+        data = response.json()
+        status_code = data.get("statusCode")
+        if status_code != 101:
+            lookup = {"found": False, "name": None, "error": data.get("error", "PAN verification failed")}
+        else:
+            lookup = {"found": True, "name": data["result"].get("name", ""), "error": None}
+
+        if status_code in KARZA_DEFINITIVE_STATUS_CODES:
+            KARZA_LOOKUP_CACHE.set(pan_number, lookup)
+        else:
+            logger.warning(f"Karza PAN lookup returned statusCode {status_code}; not caching")
+        return lookup
+
     @staticmethod
     def verify(db: Session, pan_number: str, full_name: str) -> dict:
         if not KARZA_API_KEY:
@@ -46,45 +89,35 @@ class KarzaPANProvider:
             )
 
         try:
-            response = requests.post(
-                KARZA_PAN_URL,
-                headers={
-                    "x-karza-key": KARZA_API_KEY,
-                    "Content-Type": "application/json",
-                },
-                json={"pan": pan_number, "consent": "Y"},
-                timeout=10,
-            )
-            response.raise_for_status()
-            data = response.json()
-            if data.get("statusCode") != 101:
-                return {
-                    "success": False,
-                    "verified_name": None,
-                    "failure_reason": data.get("error", "PAN verification failed"),
-                }
-
-            api_name = data["result"].get("name", "")
-            match_pct = name_match_percentage(full_name, api_name)
-
-            if match_pct < NAME_MATCH_THRESHOLD:
-                return {
-                    "success": False,
-                    "verified_name": api_name,
-                    "match_percentage": match_pct,
-                    "failure_reason": "Name mismatch"
-                }
+            lookup = KarzaPANProvider._lookup(pan_number)
+        except requests.RequestException as e:
+            logger.error(f"Karza PAN API error: {e}")
+            raise RuntimeError("PAN verification service temporarily unavailable") from e
 
+        if not lookup["found"]:
             return {
-                "success": True,
+                "success": False,
+                "verified_name": None,
+                "failure_reason": lookup["error"],
+            }
+
+        api_name = lookup["name"]
+        match_pct = name_match_percentage(full_name, api_name)
+
+        if match_pct < NAME_MATCH_THRESHOLD:
+            return {
+                "success": False,
                 "verified_name": api_name,
                 "match_percentage": match_pct,
-                "failure_reason": None,
+                "failure_reason": "Name mismatch"
             }
 
-        except requests.RequestException as e:
-            logger.error(f"Karza PAN API error: {e}")
-            raise RuntimeError("PAN verification service temporarily unavailable") from e
+        return {
+            "success": True,
+            "verified_name": api_name,
+            "match_percentage": match_pct,
+            "failure_reason": None,
+        }
 
 def get_pan_provider():
     if VERIFICATION_MODE == "api":
@@ -1,8 +1,11 @@
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.orm import Session
 from models.attempt_tracker import AttemptTracker, VerificationType
 from datetime import datetime, timezone
 from typing import Optional
+from core.tracing import trace_methods
 
+@trace_methods("repo.attempt_tracker")
 class AttemptTrackerRepository:
     
     @staticmethod
@@ -66,4 +69,19 @@ class AttemptTrackerRepository:
             db.commit()
             db.refresh(tracker)
 
-        return tracker
\ No newline at end of file
+        return tracker
+
+    @staticmethod
+    def delete_stale_chunk(db: Session, lock_cutoff: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` trackers whose lock expired before `lock_cutoff`, or that
+        were never used (no lock, zero attempts). Rows another transaction holds are
+        skipped. Does not commit.
+        """
+        stale = select(AttemptTracker.id).where(or_(
+            and_(AttemptTracker.locked_until.isnot(None), AttemptTracker.locked_until < lock_cutoff),
+            and_(AttemptTracker.locked_until.is_(None), AttemptTracker.attempts_count == 0),
+        )).limit(limit).with_for_update(skip_locked=True)
+        return len(db.execute(
+            delete(AttemptTracker).where(AttemptTracker.id.in_(stale.scalar_subquery())).returning(AttemptTracker.id)
+        ).all())
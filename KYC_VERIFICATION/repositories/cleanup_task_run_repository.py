@@ -0,0 +1,44 @@
+from sqlalchemy.orm import Session
+from models.cleanup_task_run import CleanupTaskRun
+from typing import List, Optional
+from datetime import datetime, timezone
+
+class CleanupTaskRunRepository:
+
+    @staticmethod
+    def mark_started(db: Session, task: str, runner: str) -> None:
+        run = db.get(CleanupTaskRun, task)
+        if not run:
+            run = CleanupTaskRun(task=task)
+            db.add(run)
+        run.status      = "RUNNING"
+        run.runner      = runner
+        run.started_at  = datetime.now(timezone.utc)
+        run.finished_at = None
+        run.removed     = None
+        run.error       = None
+        db.commit()
+
+    @staticmethod
+    def mark_finished(db: Session, task: str, status: str, removed: Optional[int],
+                      error: Optional[str], next_run_at: datetime) -> None:
+        run = db.get(CleanupTaskRun, task)
+        if not run:
+            return
+        run.status      = status
+        run.finished_at = datetime.now(timezone.utc)
+        run.removed     = removed
+        run.error       = (error or "")[:500] or None
+        run.next_run_at = next_run_at
+        db.commit()
+
+    @staticmethod
+    def set_next_run(db: Session, task: str, next_run_at: datetime) -> None:
+        run = db.get(CleanupTaskRun, task)
+        if run:
+            run.next_run_at = next_run_at
+            db.commit()
+
+    @staticmethod
+    def list_all(db: Session) -> List[CleanupTaskRun]:
+        return db.query(CleanupTaskRun).order_by(CleanupTaskRun.task).all()
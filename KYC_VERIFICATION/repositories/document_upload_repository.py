@@ -1,8 +1,12 @@
+from sqlalchemy import delete, func, select, true
 from sqlalchemy.orm import Session
 from models.document_upload import DocumentUpload, DocumentType, DocumentStatus
-from typing import List, Optional
+from models.user_profile import UserProfile
+from typing import List, Optional, Set, Tuple
 from datetime import datetime
+from core.tracing import trace_methods
 
+@trace_methods("repo.document_upload")
 class DocumentUploadRepository:
 
     @staticmethod
@@ -13,6 +17,23 @@ class DocumentUploadRepository:
     def get_by_user_id(db: Session, user_id: int) -> List[DocumentUpload]:
         return db.query(DocumentUpload).filter(DocumentUpload.user_id == user_id).all()
 
+    @staticmethod
+    def get_list_version(db: Session, user_id: int) -> Optional[Tuple]:
+        """
+        (profile updated_at, document count, latest document updated_at) in one
+        statement, or None if the user has no profile. The count catches deletes.
+        """
+        documents = select(
+            func.count().label("count"), func.max(DocumentUpload.updated_at).label("latest")
+        ).where(DocumentUpload.user_id == user_id).subquery()
+        row = db.execute(
+            select(UserProfile.updated_at, documents.c.count, documents.c.latest)
+            .select_from(UserProfile)
+            .join(documents, true())
+            .where(UserProfile.user_id == user_id)
+        ).first()
+        return tuple(row) if row else None
+
     @staticmethod
     def get_by_user_and_type(db: Session, user_id: int, document_type: DocumentType) -> Optional[DocumentUpload]:
         return db.query(DocumentUpload).filter(
@@ -57,9 +78,40 @@ class DocumentUploadRepository:
             DocumentUpload.reviewed_at < cutoff_date
         ).all()
 
+    @staticmethod
+    def delete_rejected_before_date_chunk(db: Session, cutoff_date: datetime, limit: int) -> List[str]:
+        """Delete up to `limit` rejected documents reviewed before `cutoff_date`, returning their file paths. Does not commit."""
+        rejected = select(DocumentUpload.id).where(
+            DocumentUpload.status == DocumentStatus.REJECTED,
+            DocumentUpload.reviewed_at < cutoff_date,
+        ).limit(limit).with_for_update(skip_locked=True)
+        return db.execute(
+            delete(DocumentUpload).where(DocumentUpload.id.in_(rejected.scalar_subquery())).returning(DocumentUpload.file_path)
+        ).scalars().all()
+
+    @staticmethod
+    def get_known_file_paths(db: Session, file_paths: List[str]) -> Set[str]:
+        """The subset of `file_paths` that some document row still points at."""
+        rows = db.query(DocumentUpload.file_path).filter(DocumentUpload.file_path.in_(file_paths)).all()
+        return {row.file_path for row in rows}
+
     @staticmethod
     def get_by_user_and_status(db: Session, user_id: int, status: DocumentStatus) -> List[DocumentUpload]:
         return db.query(DocumentUpload).filter(
             DocumentUpload.user_id == user_id,
             DocumentUpload.status == status
         ).all()
+
+    @staticmethod
+    def get_name_pairs(db: Session, since: Optional[datetime] = None, limit: Optional[int] = None) -> List[tuple]:
+        """(registered full_name, OCR extracted_name, name_match_percentage) for documents that went through OCR."""
+        query = db.query(
+            UserProfile.full_name,
+            DocumentUpload.extracted_name,
+            DocumentUpload.name_match_percentage,
+        ).join(UserProfile, UserProfile.user_id == DocumentUpload.user_id).filter(
+            DocumentUpload.extracted_name.isnot(None),
+        )
+        if since is not None:
+            query = query.filter(DocumentUpload.uploaded_at >= since)
+        return query.order_by(DocumentUpload.id.desc()).limit(limit).all()
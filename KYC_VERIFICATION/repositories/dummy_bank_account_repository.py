@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 from models.dummy_bank_account import DummyBankAccount
 from typing import Optional
+from core.tracing import trace_methods
 
+@trace_methods("repo.dummy_bank_account")
 class DummyBankAccountRepository:
     
     @staticmethod
@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from datetime import date
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session
+from models.dummy_pan import DummyPAN
+from models.dummy_bank_account import DummyBankAccount
+from repositories.dummy_pan_repository import DummyPANRepository
+from repositories.dummy_bank_account_repository import DummyBankAccountRepository
+
+logger = logging.getLogger(__name__)
+
+RELOAD_EVENT = "dummy_data_reload"   # broadcast to the other workers after /dummy-data/reload
+
+
+class DummyPANRecord(NamedTuple):
+    pan_number: str
+    aadhaar_number: str
+    full_name: str
+    dob: date
+
+
+class DummyBankRecord(NamedTuple):
+    account_number: str
+    ifsc: str
+    bank_name: str
+    account_holder_name: str
+    is_active: bool
+
+
+class DummyReferenceIndex:
+    """
+    dummy_pans and dummy_bank_accounts held in memory, keyed by PAN, Aadhaar and
+    account number, so dummy-mode verification does not pay for a DB read.
+    Misses (or an index that was never loaded) fall back to the repositories, and
+    rows found that way are added to the index.
+    """
+
+    def __init__(self):
+        self._by_pan     = {}
+        self._by_aadhaar = {}
+        self._accounts   = {}
+        self._loaded_at  = None
+        self._lock       = threading.Lock()
+
+    @staticmethod
+    def _pan_record(row) -> DummyPANRecord:
+        return DummyPANRecord(row.pan_number, row.aadhaar_number, row.full_name, row.dob)
+
+    @staticmethod
+    def _bank_record(row) -> DummyBankRecord:
+        return DummyBankRecord(row.account_number, row.ifsc, row.bank_name, row.account_holder_name, bool(row.is_active))
+
+    def load(self, db: Session) -> dict:
+        started = time.perf_counter()
+        by_pan, by_aadhaar, accounts = {}, {}, {}
+        pan_rows = db.query(
+            DummyPAN.pan_number, DummyPAN.aadhaar_number, DummyPAN.full_name, DummyPAN.dob,
+        ).yield_per(10000)
+        for row in pan_rows:
+            record = self._pan_record(row)
+            by_pan[record.pan_number] = record
+            by_aadhaar[record.aadhaar_number] = record
+        bank_rows = db.query(
+            DummyBankAccount.account_number, DummyBankAccount.ifsc, DummyBankAccount.bank_name,
+            DummyBankAccount.account_holder_name, DummyBankAccount.is_active,
+        ).yield_per(10000)
+        for row in bank_rows:
+            record = self._bank_record(row)
+            accounts[record.account_number] = record
+
+        with self._lock:
+            self._by_pan, self._by_aadhaar, self._accounts = by_pan, by_aadhaar, accounts
+            self._loaded_at = time.time()
+        stats = self.stats()
+        logger.info(
+            f"Dummy reference index loaded: {stats['pans']} PANs, {stats['bank_accounts']} bank accounts "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return stats
+
+    def get_pan(self, db: Session, pan_number: str) -> Optional[DummyPANRecord]:
+        record = self._by_pan.get(pan_number)
+        if record is None:
+            row = DummyPANRepository.get_by_pan_number(db, pan_number)
+            record = self._remember_pan(row) if row else None
+        return record
+
+    def get_by_aadhaar(self, db: Session, aadhaar_number: str) -> Optional[DummyPANRecord]:
+        record = self._by_aadhaar.get(aadhaar_number)
+        if record is None:
+            row = DummyPANRepository.get_by_aadhaar_number(db, aadhaar_number)
+            record = self._remember_pan(row) if row else None
+        return record
+
+    def get_account(self, db: Session, account_number: str) -> Optional[DummyBankRecord]:
+        record = self._accounts.get(account_number)
+        if record is None:
+            row = DummyBankAccountRepository.get_by_account_number(db, account_number)
+            if row:
+                record = self._bank_record(row)
+                with self._lock:
+                    self._accounts[record.account_number] = record
+        return record
+
+    def _remember_pan(self, row) -> DummyPANRecord:
+        record = self._pan_record(row)
+        with self._lock:
+            self._by_pan[record.pan_number] = record
+            self._by_aadhaar[record.aadhaar_number] = record
+        return record
+
+    def stats(self) -> dict:
+        return {
+            "loaded":        self._loaded_at is not None,
+            "loaded_at":     self._loaded_at,
+            "pans":          len(self._by_pan),
+            "bank_accounts": len(self._accounts),
+        }
+
+
+DUMMY_REFERENCE_INDEX = DummyReferenceIndex()
@@ -0,0 +1,82 @@
+from typing import Optional, Tuple
+from sqlalchemy import Row, delete, select, update, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models.idempotency_key import IdempotencyKey
+from datetime import datetime
+from core.tracing import trace_methods
+
+@trace_methods("repo.idempotency_key")
+class IdempotencyKeyRepository:
+
+    @staticmethod
+    def claim(
+        db: Session, key_hash: str, scope: str, user_id: int, fingerprint: str,
+        now: datetime, expires_at: datetime, stale_before: datetime,
+    ) -> Tuple[bool, Optional[Row]]:
+        """
+        Claim `key_hash` for a request about to run: (True, None) when the caller now
+        owns it, i.e. the key was new, its record had expired, or the request holding
+        it never finished (locked before `stale_before`). Otherwise (False, the
+        record's fingerprint, status_code and response_body), where the record may
+        be None if its holder released it meanwhile. Commits.
+        """
+        claimed = db.execute(
+            insert(IdempotencyKey).values(
+                key_hash=key_hash, scope=scope, user_id=user_id, fingerprint=fingerprint,
+                locked_at=now, expires_at=expires_at,
+            ).on_conflict_do_nothing(index_elements=[IdempotencyKey.key_hash]).returning(IdempotencyKey.key_hash)
+        ).scalar()
+        if claimed is None:
+            claimed = db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key_hash == key_hash, or_(
+                    IdempotencyKey.expires_at < now,
+                    and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_at < stale_before),
+                ))
+                .values(
+                    fingerprint=fingerprint, status_code=None, response_body=None,
+                    locked_at=now, expires_at=expires_at,
+                )
+                .returning(IdempotencyKey.key_hash)
+            ).scalar()
+        if claimed is not None:
+            db.commit()
+            return True, None
+        existing = db.execute(
+            select(IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.response_body)
+            .where(IdempotencyKey.key_hash == key_hash)
+        ).one_or_none()
+        db.commit()
+        return False, existing
+
+    @staticmethod
+    def complete(db: Session, key_hash: str, status_code: int, response_body: bytes) -> None:
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key_hash == key_hash)
+            .values(status_code=status_code, response_body=response_body)
+        )
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, key_hash: str) -> None:
+        """Drop an unfinished claim so a retry with the same key runs again. Commits."""
+        db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key_hash == key_hash, IdempotencyKey.status_code.is_(None))
+        )
+        db.commit()
+
+    @staticmethod
+    def delete_expired_chunk(db: Session, now: datetime, limit: int) -> int:
+        """Delete up to `limit` expired records; locked rows are skipped. Does not commit."""
+        expired = (
+            select(IdempotencyKey.key_hash)
+            .where(IdempotencyKey.expires_at < now)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return len(db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key_hash.in_(expired.scalar_subquery())).returning(IdempotencyKey.key_hash)
+        ).all())
@@ -1,8 +1,13 @@
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from typing import List, Optional
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
+from core.metrics import VERIFICATIONS
+from core.config import LATEST_LOOKUP_WINDOW_DAYS
 from models.kyc_aadhaar_verification import KYCAadhaarVerification
+from core.tracing import trace_methods
 
+@trace_methods("repo.aadhaar_verification")
 class KYCAadhaarVerificationRepository:
 
     @staticmethod
@@ -21,6 +26,7 @@ class KYCAadhaarVerificationRepository:
         )
         db.add(log)
         db.commit()
+        VERIFICATIONS.labels("AADHAAR", status).inc()
         return log
 
     @staticmethod
@@ -34,12 +40,14 @@ class KYCAadhaarVerificationRepository:
 
     @staticmethod
     def get_latest_by_user_id(db: Session, user_id: int) -> Optional[KYCAadhaarVerification]:
-        return (
+        # Look in the recent monthly partitions first; only go back further if nothing is there.
+        query = (
             db.query(KYCAadhaarVerification)
             .filter(KYCAadhaarVerification.user_id == user_id)
             .order_by(KYCAadhaarVerification.created_at.desc())
-            .first()
         )
+        recent_since = datetime.now(timezone.utc) - timedelta(days=LATEST_LOOKUP_WINDOW_DAYS)
+        return query.filter(KYCAadhaarVerification.created_at >= recent_since).first() or query.first()
 
     @staticmethod
     def get_verified_by_aadhaar(db: Session, aadhaar_number: str) -> Optional[KYCAadhaarVerification]:
@@ -62,3 +70,19 @@ class KYCAadhaarVerificationRepository:
             )
             .delete(synchronize_session=False)
         )
+
+    @staticmethod
+    def delete_failed_verifications_chunk(db: Session, cutoff_date: datetime, limit: int) -> List[dict]:
+        """
+        Chunked form of delete_failed_verifications for the cleanup job: returns the
+        deleted rows so they can be archived before commit. Skips locked rows; does not commit.
+        """
+        purgeable = (
+            KYCAadhaarVerification.status.in_(["FAILED", "BLOCKED"]),
+            KYCAadhaarVerification.created_at < cutoff_date,
+        )
+        failed = select(KYCAadhaarVerification.id).where(*purgeable).limit(limit).with_for_update(skip_locked=True)
+        # Repeating the filters on the DELETE lets Postgres prune it to the same partitions.
+        return db.execute(
+            delete(KYCAadhaarVerification).where(KYCAadhaarVerification.id.in_(failed.scalar_subquery()), *purgeable).returning(*KYCAadhaarVerification.__table__.columns)
+        ).mappings().all()
@@ -1,8 +1,13 @@
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
+from core.metrics import VERIFICATIONS
 from models.kyc_bank_verification import KYCBankVerification
 from typing import List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from core.config import LATEST_LOOKUP_WINDOW_DAYS
+from core.tracing import trace_methods
 
+@trace_methods("repo.bank_verification")
 class KYCBankVerificationRepository:
 
     @staticmethod
@@ -17,6 +22,7 @@ class KYCBankVerificationRepository:
         status: str,
         failure_reason: Optional[str],
         attempt_number: int,
+        verified_name: Optional[str] = None,
     ) -> KYCBankVerification:
         log = KYCBankVerification(
             user_id             = user_id,
@@ -25,6 +31,7 @@ class KYCBankVerificationRepository:
             bank_name           = bank_name,
             ifsc                = ifsc,
             name_match_percentage = name_match_percentage,
+            verified_name       = verified_name,
             status              = status,
             failure_reason      = failure_reason,
             attempt_number      = attempt_number,
@@ -32,6 +39,7 @@ class KYCBankVerificationRepository:
         )
         db.add(log)
         db.commit()
+        VERIFICATIONS.labels("BANK", status).inc()
         return log
 
     @staticmethod
@@ -42,9 +50,12 @@ class KYCBankVerificationRepository:
 
     @staticmethod
     def get_latest_by_user_id(db: Session, user_id: int) -> Optional[KYCBankVerification]:
-        return db.query(KYCBankVerification).filter(
+        # Look in the recent monthly partitions first; only go back further if nothing is there.
+        query = db.query(KYCBankVerification).filter(
             KYCBankVerification.user_id == user_id
-        ).order_by(KYCBankVerification.created_at.desc()).first()
+        ).order_by(KYCBankVerification.created_at.desc())
+        recent_since = datetime.now(timezone.utc) - timedelta(days=LATEST_LOOKUP_WINDOW_DAYS)
+        return query.filter(KYCBankVerification.created_at >= recent_since).first() or query.first()
 
     @staticmethod
     def get_verified_by_account_number(db: Session, account_number: str) -> Optional[KYCBankVerification]:
@@ -61,3 +72,31 @@ class KYCBankVerificationRepository:
         ).delete(synchronize_session=False)
         db.commit()
         return count
+
+    @staticmethod
+    def delete_failed_verifications_chunk(db: Session, cutoff_date: datetime, limit: int) -> List[dict]:
+        """
+        Chunked form of delete_failed_verifications for the cleanup job: returns the
+        deleted rows so they can be archived before commit. Skips locked rows; does not commit.
+        """
+        purgeable = (
+            KYCBankVerification.status.in_(["FAILED", "BLOCKED"]),
+            KYCBankVerification.created_at < cutoff_date,
+        )
+        failed = select(KYCBankVerification.id).where(*purgeable).limit(limit).with_for_update(skip_locked=True)
+        # Repeating the filters on the DELETE lets Postgres prune it to the same partitions.
+        return db.execute(
+            delete(KYCBankVerification).where(KYCBankVerification.id.in_(failed.scalar_subquery()), *purgeable).returning(*KYCBankVerification.__table__.columns)
+        ).mappings().all()
+
+    @staticmethod
+    def get_name_pairs(db: Session, since: Optional[datetime] = None, limit: Optional[int] = None) -> List[tuple]:
+        """(account_holder_name, verified_name, name_match_percentage) for attempts where the bank returned a name."""
+        query = db.query(
+            KYCBankVerification.account_holder_name,
+            KYCBankVerification.verified_name,
+            KYCBankVerification.name_match_percentage,
+        ).filter(KYCBankVerification.verified_name.isnot(None), KYCBankVerification.verified_name != "")
+        if since is not None:
+            query = query.filter(KYCBankVerification.created_at >= since)
+        return query.order_by(KYCBankVerification.id.desc()).limit(limit).all()
@@ -0,0 +1,130 @@
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from models.kyc_batch_job import KYCBatchJob, KYCBatchJobItem
+from typing import List, Optional
+from datetime import datetime, timezone, timedelta
+from core.tracing import trace_methods
+
+FINAL_JOB_STATUSES = ("COMPLETED", "CANCELLED")
+
+@trace_methods("repo.batch_job")
+class KYCBatchJobRepository:
+
+    @staticmethod
+    def create_job(db: Session, step: str, items: List[dict], concurrency: int, created_by: str) -> KYCBatchJob:
+        job = KYCBatchJob(
+            step        = step,
+            status      = "PENDING",
+            total_items = len(items),
+            concurrency = concurrency,
+            created_by  = created_by,
+            created_at  = datetime.now(timezone.utc),
+        )
+        db.add(job)
+        db.flush()
+        rows = [{"job_id": job.id, "user_id": i["user_id"], "payload": i.get("payload"), "status": "PENDING", "retries": 0}
+                for i in items]
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(KYCBatchJobItem), rows[start:start + 5000])
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[KYCBatchJob]:
+        return db.query(KYCBatchJob).filter(KYCBatchJob.id == job_id).first()
+
+    @staticmethod
+    def list_jobs(db: Session, limit: int = 50, offset: int = 0) -> List[KYCBatchJob]:
+        return db.query(KYCBatchJob).order_by(KYCBatchJob.id.desc()).offset(offset).limit(limit).all()
+
+    @staticmethod
+    def get_resumable_jobs(db: Session) -> List[KYCBatchJob]:
+        return db.query(KYCBatchJob).filter(KYCBatchJob.status.in_(["PENDING", "RUNNING"])).order_by(KYCBatchJob.id).all()
+
+    @staticmethod
+    def set_status(db: Session, job: KYCBatchJob, status: str) -> None:
+        now = datetime.now(timezone.utc)
+        job.status = status
+        if status == "RUNNING" and job.started_at is None:
+            job.started_at = now
+        if status in FINAL_JOB_STATUSES:
+            job.finished_at = now
+        db.commit()
+
+    @staticmethod
+    def count_items_by_status(db: Session, job_id: int) -> dict:
+        rows = db.query(KYCBatchJobItem.status, func.count(KYCBatchJobItem.id)).filter(
+            KYCBatchJobItem.job_id == job_id
+        ).group_by(KYCBatchJobItem.status).all()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def get_items(db: Session, job_id: int, status: Optional[str] = None,
+                  limit: int = 100, offset: int = 0) -> List[KYCBatchJobItem]:
+        query = db.query(KYCBatchJobItem).filter(KYCBatchJobItem.job_id == job_id)
+        if status:
+            query = query.filter(KYCBatchJobItem.status == status)
+        return query.order_by(KYCBatchJobItem.id).offset(offset).limit(limit).all()
+
+    @staticmethod
+    def claim_items(db: Session, job_id: int, limit: int) -> List[KYCBatchJobItem]:
+        """
+        Move up to `limit` due PENDING items to RUNNING and return them. SKIP LOCKED
+        lets several app instances work the same job without handing out an item twice.
+        """
+        now = datetime.now(timezone.utc)
+        due = select(KYCBatchJobItem.id).where(
+            KYCBatchJobItem.job_id == job_id,
+            KYCBatchJobItem.status == "PENDING",
+            or_(KYCBatchJobItem.next_attempt_at.is_(None), KYCBatchJobItem.next_attempt_at <= now),
+        ).order_by(KYCBatchJobItem.id).limit(limit).with_for_update(skip_locked=True)
+        claimed = db.execute(
+            update(KYCBatchJobItem)
+            .where(KYCBatchJobItem.id.in_(due.scalar_subquery()))
+            .values(status="RUNNING", claimed_at=now)
+            .returning(KYCBatchJobItem.id, KYCBatchJobItem.user_id, KYCBatchJobItem.payload, KYCBatchJobItem.retries)
+        ).all()
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def finish_item(db: Session, item_id: int, status: str, http_status: Optional[int], message: Optional[str]) -> None:
+        db.execute(
+            update(KYCBatchJobItem).where(KYCBatchJobItem.id == item_id).values(
+                status=status, http_status=http_status, message=(message or "")[:500],
+                finished_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def retry_item_later(db: Session, item_id: int, retry_after_seconds: int, message: str) -> None:
+        db.execute(
+            update(KYCBatchJobItem).where(KYCBatchJobItem.id == item_id).values(
+                status="PENDING", retries=KYCBatchJobItem.retries + 1, message=message[:500],
+                next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=retry_after_seconds),
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def requeue_stale_items(db: Session, job_id: int, stale_seconds: int) -> int:
+        """Items left RUNNING by a process that died mid-call go back to PENDING."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+        count = db.execute(
+            update(KYCBatchJobItem).where(
+                KYCBatchJobItem.job_id == job_id,
+                KYCBatchJobItem.status == "RUNNING",
+                KYCBatchJobItem.claimed_at < cutoff,
+            ).values(status="PENDING")
+        ).rowcount
+        db.commit()
+        return count
+
+    @staticmethod
+    def count_unfinished(db: Session, job_id: int) -> int:
+        return db.query(KYCBatchJobItem).filter(
+            KYCBatchJobItem.job_id == job_id,
+            KYCBatchJobItem.status.in_(["PENDING", "RUNNING"]),
+        ).count()
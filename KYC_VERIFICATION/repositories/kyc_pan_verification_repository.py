@@ -1,8 +1,13 @@
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
+from core.metrics import VERIFICATIONS
 from models.kyc_pan_verification import KYCPANVerification
 from typing import List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from core.config import LATEST_LOOKUP_WINDOW_DAYS
+from core.tracing import trace_methods
 
+@trace_methods("repo.pan_verification")
 class KYCPANVerificationRepository:
 
     @staticmethod
@@ -32,6 +37,7 @@ class KYCPANVerificationRepository:
         )
         db.add(log)
         db.commit()
+        VERIFICATIONS.labels("PAN", status).inc()
         return log
 
     @staticmethod
@@ -42,9 +48,12 @@ class KYCPANVerificationRepository:
 
     @staticmethod
     def get_latest_by_user_id(db: Session, user_id: int) -> Optional[KYCPANVerification]:
-        return db.query(KYCPANVerification).filter(
+        # Look in the recent monthly partitions first; only go back further if nothing is there.
+        query = db.query(KYCPANVerification).filter(
             KYCPANVerification.user_id == user_id
-        ).order_by(KYCPANVerification.created_at.desc()).first()
+        ).order_by(KYCPANVerification.created_at.desc())
+        recent_since = datetime.now(timezone.utc) - timedelta(days=LATEST_LOOKUP_WINDOW_DAYS)
+        return query.filter(KYCPANVerification.created_at >= recent_since).first() or query.first()
 
     @staticmethod
     def delete_failed_verifications(db: Session, cutoff_date: datetime) -> int:
@@ -54,3 +63,31 @@ class KYCPANVerificationRepository:
         ).delete(synchronize_session=False)
         db.commit()
         return count
+
+    @staticmethod
+    def delete_failed_verifications_chunk(db: Session, cutoff_date: datetime, limit: int) -> List[dict]:
+        """
+        Chunked form of delete_failed_verifications for the cleanup job: returns the
+        deleted rows so they can be archived before commit. Skips locked rows; does not commit.
+        """
+        purgeable = (
+            KYCPANVerification.status.in_(["FAILED", "BLOCKED"]),
+            KYCPANVerification.created_at < cutoff_date,
+        )
+        failed = select(KYCPANVerification.id).where(*purgeable).limit(limit).with_for_update(skip_locked=True)
+        # Repeating the filters on the DELETE lets Postgres prune it to the same partitions.
+        return db.execute(
+            delete(KYCPANVerification).where(KYCPANVerification.id.in_(failed.scalar_subquery()), *purgeable).returning(*KYCPANVerification.__table__.columns)
+        ).mappings().all()
+
+    @staticmethod
+    def get_name_pairs(db: Session, since: Optional[datetime] = None, limit: Optional[int] = None) -> List[tuple]:
+        """(full_name_submitted, verified_name, name_match) for attempts where the provider returned a name."""
+        query = db.query(
+            KYCPANVerification.full_name_submitted,
+            KYCPANVerification.verified_name,
+            KYCPANVerification.name_match,
+        ).filter(KYCPANVerification.verified_name != "")
+        if since is not None:
+            query = query.filter(KYCPANVerification.created_at >= since)
+        return query.order_by(KYCPANVerification.id.desc()).limit(limit).all()
@@ -0,0 +1,112 @@
+from typing import Optional
+from sqlalchemy import func, literal, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from models.user_profile import UserProfile
+from models.attempt_tracker import AttemptTracker
+from models.document_upload import DocumentUpload
+from models.kyc_pan_verification import KYCPANVerification
+from models.kyc_aadhaar_verification import KYCAadhaarVerification
+from models.kyc_bank_verification import KYCBankVerification
+from core.tracing import trace_methods
+
+
+def _json_object(**fields):
+    """json_build_object('key', column, ...)"""
+    args = []
+    for key, column in fields.items():
+        args += [literal(key), column]
+    return func.json_build_object(*args)
+
+
+def _latest_log(model, name: str, **fields):
+    """LATERAL (the user's newest row of `model` as one JSON object)."""
+    return (
+        select(_json_object(**fields).label("log"))
+        .where(model.user_id == UserProfile.user_id)
+        .order_by(model.created_at.desc())
+        .limit(1)
+        .lateral(name)
+    )
+
+
+@trace_methods("repo.kyc_summary")
+class KYCSummaryRepository:
+
+    @staticmethod
+    def get_summary(db: Session, user_id: int) -> Optional[Row]:
+        """
+        Everything the KYC summary shows, in one statement: the profile row plus, via
+        LATERAL joins, the newest PAN/Aadhaar/bank log, the attempt trackers and the
+        documents (the last two as JSON arrays, which are NULL when empty). None if
+        the user has no profile.
+        """
+        pan = _latest_log(
+            KYCPANVerification, "pan_log",
+            status=KYCPANVerification.status,
+            failure_reason=KYCPANVerification.failure_reason,
+            attempt_number=KYCPANVerification.attempt_number,
+            match_percentage=KYCPANVerification.match_percentage,
+            created_at=KYCPANVerification.created_at,
+        )
+        aadhaar = _latest_log(
+            KYCAadhaarVerification, "aadhaar_log",
+            status=KYCAadhaarVerification.status,
+            failure_reason=KYCAadhaarVerification.failure_reason,
+            attempt_number=KYCAadhaarVerification.attempt_number,
+            dob_match=KYCAadhaarVerification.dob_match,
+            created_at=KYCAadhaarVerification.created_at,
+        )
+        bank = _latest_log(
+            KYCBankVerification, "bank_log",
+            status=KYCBankVerification.status,
+            failure_reason=KYCBankVerification.failure_reason,
+            attempt_number=KYCBankVerification.attempt_number,
+            name_match_percentage=KYCBankVerification.name_match_percentage,
+            bank_name=KYCBankVerification.bank_name,
+            ifsc=KYCBankVerification.ifsc,
+            account_last4=func.right(KYCBankVerification.account_number, 4),
+            created_at=KYCBankVerification.created_at,
+        )
+        trackers = (
+            select(func.json_agg(_json_object(
+                verification_type=AttemptTracker.verification_type,
+                attempts_count=AttemptTracker.attempts_count,
+                # Stored as naive UTC; tag it so the JSON carries the offset.
+                locked_until=func.timezone("UTC", AttemptTracker.locked_until),
+                locked=func.coalesce(AttemptTracker.locked_until > func.timezone("UTC", func.now()), False),
+                last_attempt_at=func.timezone("UTC", AttemptTracker.last_attempt_at),
+            )).label("trackers"))
+            .where(AttemptTracker.email == UserProfile.email)
+            .lateral("trackers")
+        )
+        documents = (
+            select(func.json_agg(aggregate_order_by(_json_object(
+                id=DocumentUpload.id,
+                document_type=DocumentUpload.document_type,
+                status=DocumentUpload.status,
+                file_name=DocumentUpload.file_name,
+                uploaded_at=DocumentUpload.uploaded_at,
+                remarks=func.coalesce(DocumentUpload.admin_remarks, DocumentUpload.verification_remarks),
+            ), DocumentUpload.uploaded_at)).label("documents"))
+            .where(DocumentUpload.user_id == UserProfile.user_id)
+            .lateral("documents")
+        )
+        return db.execute(
+            select(
+                UserProfile.user_id, UserProfile.full_name, UserProfile.pan_status, UserProfile.aadhaar_status,
+                UserProfile.bank_status, UserProfile.identity_status, UserProfile.document_status,
+                UserProfile.kyc_status, UserProfile.pan_verified_at, UserProfile.aadhaar_verified_at,
+                UserProfile.bank_verified_at, UserProfile.updated_at,
+                pan.c.log.label("pan_log"), aadhaar.c.log.label("aadhaar_log"), bank.c.log.label("bank_log"),
+                trackers.c.trackers, documents.c.documents,
+            )
+            .select_from(UserProfile)
+            .outerjoin(pan, true())
+            .outerjoin(aadhaar, true())
+            .outerjoin(bank, true())
+            .outerjoin(trackers, true())
+            .outerjoin(documents, true())
+            .where(UserProfile.user_id == user_id)
+        ).first()
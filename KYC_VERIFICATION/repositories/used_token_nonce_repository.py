@@ -0,0 +1,38 @@
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models.used_token_nonce import UsedTokenNonce
+from datetime import datetime
+from core.tracing import trace_methods
+
+@trace_methods("repo.used_token_nonce")
+class UsedTokenNonceRepository:
+
+    @staticmethod
+    def consume(db: Session, nonce: str, purpose: str, user_id: int, expires_at: datetime) -> bool:
+        """Record `nonce` as spent. False if it already was (a replay). Commits."""
+        stmt = insert(UsedTokenNonce).values(
+            nonce=nonce, purpose=purpose, user_id=user_id, expires_at=expires_at,
+        ).on_conflict_do_nothing(index_elements=[UsedTokenNonce.nonce]).returning(UsedTokenNonce.nonce)
+        consumed = db.execute(stmt).scalar() is not None
+        db.commit()
+        return consumed
+
+    @staticmethod
+    def release(db: Session, nonce: str) -> None:
+        """Make a token usable again, e.g. when the provider was unavailable. Commits."""
+        db.execute(delete(UsedTokenNonce).where(UsedTokenNonce.nonce == nonce))
+        db.commit()
+
+    @staticmethod
+    def delete_expired_chunk(db: Session, now: datetime, limit: int) -> int:
+        """Delete up to `limit` nonces whose tokens have expired; locked rows are skipped. Does not commit."""
+        expired = (
+            select(UsedTokenNonce.nonce)
+            .where(UsedTokenNonce.expires_at < now)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return len(db.execute(
+            delete(UsedTokenNonce).where(UsedTokenNonce.nonce.in_(expired.scalar_subquery())).returning(UsedTokenNonce.nonce)
+        ).all())
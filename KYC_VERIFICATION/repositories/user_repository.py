@@ -2,7 +2,10 @@ from sqlalchemy.orm import Session
 from models.user_profile import UserProfile
 from models.module1_user import User
 from typing import Optional, List
+from datetime import datetime
+from core.tracing import trace_methods
 
+@trace_methods("repo.user")
 class UserRepository:
     @staticmethod
     def get_module1_user_by_id(db: Session, user_id: int) -> Optional[User]:
@@ -16,6 +19,11 @@ class UserRepository:
     def get_by_user_id(db: Session, user_id: int) -> Optional[UserProfile]:
         return db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
 
+    @staticmethod
+    def get_updated_at(db: Session, user_id: int) -> Optional[datetime]:
+        """Profile version for conditional GETs: one primary-key lookup, no row load."""
+        return db.query(UserProfile.updated_at).filter(UserProfile.user_id == user_id).scalar()
+
     @staticmethod
     def get_by_pan_number(db: Session, pan_number: str) -> Optional[UserProfile]:
         return db.query(UserProfile).filter(UserProfile.pan_number == pan_number).first()
@@ -0,0 +1,61 @@
+"""
+Re-score historical name pairs with the current matcher and show pass/fail per candidate threshold.
+
+    python rescore_name_matches.py
+    python rescore_name_matches.py --sources pan,document --thresholds 70,75,80,85 --since-days 90
+    python rescore_name_matches.py --json > rescore.json
+"""
+import argparse
+import json
+from core.database import SessionLocal
+from services.name_match_tuning_service import NameMatchTuningService, DEFAULT_THRESHOLDS
+import models.module1_user
+import models.kyc_aadhaar_verification
+
+
+def print_report(results: dict) -> None:
+    for source, report in results.items():
+        print(f"\n{source.upper()}: {report['pairs']} pairs "
+              f"(load {report['load_seconds']}s, score {report['score_seconds']}s), "
+              f"current threshold {report['current_threshold']}%")
+        if not report["pairs"]:
+            continue
+        print("  score percentiles: " + "  ".join(f"{k}={v:.1f}" for k, v in report["score_percentiles"].items()))
+        print(f"  {'threshold':>10}{'pass':>10}{'fail':>10}{'pass rate':>11}")
+        for row in report["thresholds"]:
+            print(f"  {row['threshold']:>10}{row['pass']:>10}{row['fail']:>10}{row['pass_rate'] * 100:>10.1f}%")
+        print(f"  stored decisions passing: {report['stored_pass']}  "
+              f"would flip at current threshold: +{report['flipped_to_pass']} / -{report['flipped_to_fail']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score stored name matches for threshold tuning")
+    parser.add_argument("--sources", default="pan,bank,document")
+    parser.add_argument("--thresholds", default=",".join(str(t) for t in DEFAULT_THRESHOLDS))
+    parser.add_argument("--since-days", type=int)
+    parser.add_argument("--limit", type=int, help="most recent N pairs per source")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        results = NameMatchTuningService.rescore(
+            db,
+            sources=[s.strip() for s in args.sources.split(",") if s.strip()],
+            thresholds=[float(t) for t in args.thresholds.split(",") if t.strip()],
+            since_days=args.since_days,
+            limit=args.limit,
+            workers=args.workers,
+        )
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime, timezone
 from core.database import get_db
-from core.config import ADMIN_API_KEY
+from core.config import ADMIN_API_KEY, ORPHAN_FILE_GRACE_MINUTES, NAME_MATCH_RESCORE_MAX_PAIRS
+from core.profiling import list_profiles, read_artifact
 from models.document_upload import DocumentStatus
 from repositories.user_repository import UserRepository
 from repositories.document_upload_repository import DocumentUploadRepository
+from utils.provider_guard import all_provider_guards
+from utils.ttl_cache import all_caches
+from services.name_match_tuning_service import NameMatchTuningService
+from repositories.dummy_reference_index import DUMMY_REFERENCE_INDEX, RELOAD_EVENT
+from repositories.kyc_batch_job_repository import KYCBatchJobRepository, FINAL_JOB_STATUSES
+from services.batch_verification_service import BatchVerificationService, batch_runner
+from services.orphan_file_sweeper import OrphanFileSweeper
+from services.verification_archive import verification_archive
+from services.cleanup_scheduler import cleanup_scheduler
+from services.status_event_bus import status_events
+from repositories.cleanup_task_run_repository import CleanupTaskRunRepository
 import logging
 from schemas.document_schema import DocumentReviewRequest, DocumentReviewResponse, UserKYCDetails
+from schemas.batch_job_schema import BatchJobCreateRequest, BatchJobResponse, BatchJobItemResponse
 
 logger = logging.getLogger(__name__)
 
@@ -141,6 +155,199 @@ def get_kyc_stats(db: Session = Depends(get_db), _: str = Depends(verify_admin_k
         logger.error(f"Error fetching KYC stats: {str(e)}", exc_info=True)
         raise HTTPException(500, "Failed to fetch KYC statistics")
 
+@router.get("/stats/providers")
+def get_provider_stats(_: str = Depends(verify_admin_key)):
+    return {name: guard.snapshot() for name, guard in all_provider_guards().items()}
+
+@router.get("/stats/cache")
+def get_cache_stats(_: str = Depends(verify_admin_key)):
+    return {name: cache.stats() for name, cache in all_caches().items()}
+
+@router.post("/batch-jobs", response_model=BatchJobResponse, status_code=202)
+def create_batch_job(
+    request: BatchJobCreateRequest,
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin_key),
+):
+    try:
+        job = BatchVerificationService.create_job(db, request)
+        batch_runner.submit(job.id)
+        return BatchJobResponse(**BatchVerificationService.job_summary(db, job))
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error creating batch job: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to create batch job")
+
+@router.get("/batch-jobs", response_model=List[BatchJobResponse])
+def list_batch_jobs(
+    limit: int  = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin_key),
+):
+    jobs = KYCBatchJobRepository.list_jobs(db, limit=limit, offset=offset)
+    return [BatchJobResponse(**BatchVerificationService.job_summary(db, job)) for job in jobs]
+
+@router.get("/batch-jobs/{job_id}", response_model=BatchJobResponse)
+def get_batch_job(job_id: int, db: Session = Depends(get_db), _: str = Depends(verify_admin_key)):
+    job = KYCBatchJobRepository.get_job(db, job_id)
+    if not job:
+        raise HTTPException(404, f"Batch job {job_id} not found")
+    return BatchJobResponse(**BatchVerificationService.job_summary(db, job))
+
+@router.get("/batch-jobs/{job_id}/items", response_model=List[BatchJobItemResponse])
+def get_batch_job_items(
+    job_id: int,
+    status: Optional[str] = Query(None, description="PENDING, RUNNING, SUCCEEDED, FAILED, SKIPPED"),
+    limit: int  = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin_key),
+):
+    if not KYCBatchJobRepository.get_job(db, job_id):
+        raise HTTPException(404, f"Batch job {job_id} not found")
+    items = KYCBatchJobRepository.get_items(db, job_id, status=status, limit=limit, offset=offset)
+    return [
+        BatchJobItemResponse(
+            id=item.id, user_id=item.user_id, status=item.status, http_status=item.http_status,
+            message=item.message, retries=item.retries,
+            finished_at=item.finished_at.isoformat() if item.finished_at else None,
+        )
+        for item in items
+    ]
+
+@router.post("/batch-jobs/{job_id}/cancel", response_model=BatchJobResponse)
+def cancel_batch_job(job_id: int, db: Session = Depends(get_db), _: str = Depends(verify_admin_key)):
+    job = KYCBatchJobRepository.get_job(db, job_id)
+    if not job:
+        raise HTTPException(404, f"Batch job {job_id} not found")
+    if job.status in FINAL_JOB_STATUSES:
+        raise HTTPException(400, f"Batch job is already {job.status.lower()}")
+    KYCBatchJobRepository.set_status(db, job, "CANCELLED")
+    return BatchJobResponse(**BatchVerificationService.job_summary(db, job))
+
+@router.post("/dummy-data/reload")
+def reload_dummy_data(db: Session = Depends(get_db), _: str = Depends(verify_admin_key)):
+    # Each worker holds its own index: this one reloads now, the others on the broadcast.
+    try:
+        stats = DUMMY_REFERENCE_INDEX.load(db)
+    except Exception as e:
+        logger.error(f"Error reloading dummy reference data: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to reload dummy reference data")
+    try:
+        broadcast = status_events.broadcast(RELOAD_EVENT)
+    except Exception as e:
+        logger.warning(f"Could not broadcast dummy data reload: {str(e)}")
+        broadcast = False
+    return {
+        **stats,
+        "other_workers": "reloading" if broadcast else "not notified; they keep their index until restart",
+    }
+
+@router.get("/archive/verifications/{user_id}")
+def archived_verifications(
+    user_id: int,
+    type: Optional[str] = Query(None, description="PAN, AADHAAR or BANK (default: all)"),
+    _: str = Depends(verify_admin_key),
+):
+    tables = {
+        "PAN":     "kyc_pan_verifications",
+        "AADHAAR": "kyc_aadhaar_verifications",
+        "BANK":    "kyc_bank_verifications",
+    }
+    if type and type.upper() not in tables:
+        raise HTTPException(400, f"type must be one of {', '.join(tables)}")
+    try:
+        rows = verification_archive.fetch_user_history(user_id, [tables[type.upper()]] if type else list(tables.values()))
+        return {"user_id": user_id, "count": len(rows), "verifications": rows}
+    except Exception as e:
+        logger.error(f"Error reading verification archive: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to read verification archive")
+
+@router.get("/cleanup/status")
+def cleanup_status(db: Session = Depends(get_db), _: str = Depends(verify_admin_key)):
+    try:
+        runs = {run.task: run for run in CleanupTaskRunRepository.list_all(db)}
+        tasks = []
+        for task, schedule in cleanup_scheduler.schedules.items():
+            run = runs.get(task)
+            tasks.append({
+                "task":        task,
+                "schedule":    schedule.expression,
+                "status":      run.status if run else None,
+                "runner":      run.runner if run else None,
+                "started_at":  run.started_at.isoformat() if run and run.started_at else None,
+                "finished_at": run.finished_at.isoformat() if run and run.finished_at else None,
+                "next_run_at": run.next_run_at.isoformat() if run and run.next_run_at else None,
+                "removed":     run.removed if run else None,
+                "error":       run.error if run else None,
+            })
+        return {"this_worker": cleanup_scheduler.runner, "this_worker_is_leader": cleanup_scheduler.is_leader(), "tasks": tasks}
+    except Exception as e:
+        logger.error(f"Error fetching cleanup status: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to fetch cleanup status")
+
+@router.post("/uploads/sweep-orphans")
+def sweep_orphan_files(
+    dry_run: bool = Query(True, description="Only count orphans; pass false to delete them"),
+    grace_minutes: int = Query(ORPHAN_FILE_GRACE_MINUTES, ge=0, description="Skip files modified this recently"),
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin_key),
+):
+    try:
+        return OrphanFileSweeper.sweep(db, dry_run=dry_run, grace_minutes=grace_minutes)
+    except Exception as e:
+        logger.error(f"Error sweeping orphan files: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to sweep orphan files")
+
+@router.get("/profiles")
+def captured_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    _: str = Depends(verify_admin_key),
+):
+    try:
+        profiles = list_profiles(limit)
+        return {"count": len(profiles), "profiles": profiles}
+    except Exception as e:
+        logger.error(f"Error listing profiles: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to list profiles")
+
+@router.get("/profiles/{profile_id}/{artifact}", response_class=PlainTextResponse)
+def profile_artifact(profile_id: str, artifact: str, _: str = Depends(verify_admin_key)):
+    """`stacks` (collapsed stacks for flame graphs) or `memory` (tracemalloc growth)."""
+    content = read_artifact(profile_id, artifact)
+    if content is None:
+        raise HTTPException(404, "Profile not found")
+    return content
+
+@router.get("/name-match/rescore")
+def rescore_name_matches(
+    sources: Optional[str] = Query(None, description="Comma-separated: pan, bank, document (default: all)"),
+    thresholds: Optional[str] = Query(None, description="Comma-separated candidate thresholds, e.g. 70,75,80,85"),
+    since_days: Optional[int] = Query(None, ge=1, description="Only pairs from the last N days"),
+    limit: int = Query(NAME_MATCH_RESCORE_MAX_PAIRS, ge=1, le=NAME_MATCH_RESCORE_MAX_PAIRS,
+                       description="Most recent N pairs per source (use rescore_name_matches.py for full history)"),
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin_key),
+):
+    try:
+        # Capped and scored in this process: no process pool forked from a serving worker.
+        return NameMatchTuningService.rescore(
+            db,
+            sources=[s.strip() for s in sources.split(",") if s.strip()] if sources else None,
+            thresholds=[float(t) for t in thresholds.split(",") if t.strip()] if thresholds else None,
+            since_days=since_days,
+            limit=limit,
+            workers=1,
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        logger.error(f"Error re-scoring name matches: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to re-score name matches")
+
 @router.get("/users", response_model=List[UserKYCDetails])
 def get_all_users(
     kyc_status: Optional[str] = Query(None, description="COMPLETED, INCOMPLETE, BLOCKED"),
@@ -157,26 +364,28 @@ def get_all_users(
         else:
             users = UserRepository.get_all_users(db, limit, offset)
 
-        return [
-            UserKYCDetails(
-                user_id             = user.user_id,
-                email               = user.email,
-                full_name           = user.full_name,
-                pan_number          = user.pan_number,
-                aadhaar_number      = user.aadhaar_number,
-                pan_status          = user.pan_status,
-                aadhaar_status      = user.aadhaar_status,
-                bank_status         = user.bank_status,
-                identity_status     = user.identity_status,
-                document_status     = user.document_status,
-                kyc_status          = user.kyc_status,
-                created_at          = user.created_at.isoformat(),
-                pan_verified_at     = user.pan_verified_at.isoformat()     if user.pan_verified_at     else None,
-                aadhaar_verified_at = user.aadhaar_verified_at.isoformat() if user.aadhaar_verified_at else None,
-                bank_verified_at    = user.bank_verified_at.isoformat()    if user.bank_verified_at    else None,
-            )
+        # Built as plain dicts and encoded by orjson directly: response_model stays for
+        # the OpenAPI schema, but returning a Response skips per-row validation/encoding.
+        return ORJSONResponse([
+            {
+                "user_id":             user.user_id,
+                "email":               user.email,
+                "full_name":           user.full_name,
+                "pan_number":          user.pan_number,
+                "aadhaar_number":      user.aadhaar_number,
+                "pan_status":          user.pan_status,
+                "aadhaar_status":      user.aadhaar_status,
+                "bank_status":         user.bank_status,
+                "identity_status":     user.identity_status,
+                "document_status":     user.document_status,
+                "kyc_status":          user.kyc_status,
+                "created_at":          user.created_at,
+                "pan_verified_at":     user.pan_verified_at,
+                "aadhaar_verified_at": user.aadhaar_verified_at,
+                "bank_verified_at":    user.bank_verified_at,
+            }
             for user in users
-        ]
+        ])
     except HTTPException:
         raise
     except Exception as e:
@@ -196,7 +405,7 @@ def get_user_details(
 
         documents = DocumentUploadRepository.get_by_user_id(db, user_id)
 
-        return {
+        return ORJSONResponse({
             "user": {
                 "user_id":         user.user_id,
                 "email":           user.email,
@@ -209,7 +418,7 @@ def get_user_details(
                 "identity_status": user.identity_status,
                 "document_status": user.document_status,
                 "kyc_status":      user.kyc_status,
-                "created_at":      user.created_at.isoformat(),
+                "created_at":      user.created_at,
             },
             "documents": [
                 {
@@ -219,16 +428,16 @@ def get_user_details(
                     "file_path":     doc.file_path,
                     "file_size":     doc.file_size,
                     "status":        doc.status.value,
-                    "uploaded_at":   doc.uploaded_at.isoformat(),
-                    "verified_at":   doc.verified_at.isoformat() if doc.verified_at else None,
-                    "reviewed_at":   doc.reviewed_at.isoformat() if doc.reviewed_at else None,
+                    "uploaded_at":   doc.uploaded_at,
+                    "verified_at":   doc.verified_at,
+                    "reviewed_at":   doc.reviewed_at,
                     "reviewed_by":   doc.reviewed_by,
                     "admin_remarks": doc.admin_remarks,
                 }
                 for doc in documents
             ],
             "total_documents": len(documents),
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, BackgroundTasks, Header, Response
 from sqlalchemy.orm import Session
 from core.database import get_db
 from core.config import VERIFICATION_MODE
 from schemas.document_schema import DocumentUploadResponse, AllDocumentsResponse, DocumentListItem, DocumentVerifyResponse
 from services.document_upload_service import DocumentUploadService
+import hashlib
 import logging
+from typing import Optional
+from repositories.document_upload_repository import DocumentUploadRepository
+from utils.http_cache import weak_etag, etag_matches, not_modified, set_validators
+from services.idempotency_store import idempotent, request_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +25,7 @@ async def upload_document(
         example="PAN_CARD",
     ),
     file: UploadFile = File(..., description="JPG/PNG for ID docs, PDF for financial docs. Max 2MB"),
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     try:
@@ -39,19 +45,23 @@ async def upload_document(
             raise HTTPException(400, f"File too large. Max 2MB. Got {round(len(contents)/1024/1024, 2)}MB")
         await file.seek(0)
 
-        result = DocumentUploadService.upload_document(
-            db=db,
-            user_id=user_id,
-            document_type=document_type,
-            file=file,
-        )
-        if VERIFICATION_MODE == "api":
-            background_tasks.add_task(
-                DocumentUploadService.verify_document_background,
-                result["id"],
+        fingerprint = request_fingerprint(user_id, document_type, hashlib.sha256(contents).hexdigest())
+        with idempotent("documents-upload", user_id, idempotency_key, fingerprint) as call:
+            if call.replay is not None:
+                return call.replay
+            result = DocumentUploadService.upload_document(
+                db=db,
+                user_id=user_id,
+                document_type=document_type,
+                file=file,
             )
+            if VERIFICATION_MODE == "api":
+                background_tasks.add_task(
+                    DocumentUploadService.verify_document_background,
+                    result["id"],
+                )
 
-        return DocumentUploadResponse(**result)
+            return call.save(DocumentUploadResponse(**result))
 
     except HTTPException:
         raise
@@ -62,10 +72,21 @@ async def upload_document(
 
 @router.get("/list", response_model=AllDocumentsResponse)
 def list_documents(
+    response: Response,
     user_id: int = Query(..., description="User ID"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     try:
+        # Read before the list so a change racing this request can only make the ETag stale, never the body.
+        version = DocumentUploadRepository.get_list_version(db, user_id)
+        if version:
+            profile_updated_at, count, latest = version
+            etag = weak_etag("documents", user_id, profile_updated_at.isoformat(), count, latest.isoformat() if latest else "")
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+            set_validators(response, etag)
+
         result = DocumentUploadService.list_documents(db=db, user_id=user_id)
         documents = [DocumentListItem(**doc) for doc in result["documents"]]
         return AllDocumentsResponse(
@@ -0,0 +1,70 @@
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from core.database import SessionLocal
+from core.config import SSE_HEARTBEAT_SECONDS, SSE_RETRY_MS
+from services.status_event_bus import Subscription, build_snapshot, status_events
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/events", tags=["Status Events"])
+
+
+def _load_snapshot(user_id: int):
+    db = SessionLocal()
+    try:
+        return build_snapshot(db, user_id)
+    finally:
+        db.close()
+
+
+def _format(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream(request: Request, subscription: Subscription, snapshot: dict):
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n" + _format("snapshot", snapshot)
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield _format(message["type"], message)
+    finally:
+        status_events.unsubscribe(subscription)
+
+
+@router.get("/status")
+async def status_stream(request: Request, user_id: int = Query(..., description="User ID")):
+    """
+    Server-sent events: a `snapshot` of the user's KYC and document statuses, then
+    `kyc_status`, `document_status` and `document_deleted` events as they commit.
+    `resync` means events may have been missed; reconnect or refetch.
+    """
+    if not status_events.running:
+        raise HTTPException(503, "Status events are not available")
+
+    # Subscribe before reading the snapshot so no change can fall between the two.
+    subscription = status_events.subscribe(user_id)
+    try:
+        snapshot = await run_in_threadpool(_load_snapshot, user_id)
+    except Exception as e:
+        status_events.unsubscribe(subscription)
+        logger.error(f"Status stream snapshot error: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to open status stream")
+    if snapshot is None:
+        status_events.unsubscribe(subscription)
+        raise HTTPException(404, "User not found")
+
+    return StreamingResponse(
+        _stream(request, subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from core.database import get_db
+from services.kyc_summary_service import KYCSummaryService
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/kyc", tags=["KYC Summary"])
+
+@router.get("/summary")
+def get_kyc_summary(
+    user_id: int = Query(..., description="User ID"),
+    db: Session = Depends(get_db),
+):
+    try:
+        return KYCSummaryService.get_summary(db, user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"KYC summary error: {str(e)}", exc_info=True)
+        raise HTTPException(500, "Failed to fetch KYC summary")
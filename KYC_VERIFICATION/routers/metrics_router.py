@@ -0,0 +1,8 @@
+from fastapi import APIRouter, Response
+from core.metrics import REGISTRY, CONTENT_TYPE
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
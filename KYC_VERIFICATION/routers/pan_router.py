@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header
 from sqlalchemy.orm import Session
 from core.database import get_db
 from services.pan_verification_service import PANVerificationService
+from services.idempotency_store import idempotent, request_fingerprint
 import logging
+from typing import Optional
 from schemas.pan_schema import PANVerificationRequest, PANVerificationResponse
 
 logger = logging.getLogger(__name__)
@@ -10,16 +12,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/kyc", tags=["PAN Verification"])
 
 @router.post("/pan-verify", response_model=PANVerificationResponse)
-def verify_pan(request: PANVerificationRequest, db: Session = Depends(get_db)):
+def verify_pan(
+    request: PANVerificationRequest,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
     try:
-        result = PANVerificationService.verify_pan(db=db, user_id=request.user_id)
-        return PANVerificationResponse(
-            message=result["message"],
-            pan_status=result["pan_status"],
-            verified_name=result.get("verified_name"),
-            identity_status=result["identity_status"],
-            next_step=result["next_step"],
-        )
+        with idempotent("pan-verify", request.user_id, idempotency_key, request_fingerprint(request.model_dump())) as call:
+            if call.replay is not None:
+                return call.replay
+            result = PANVerificationService.verify_pan(db=db, user_id=request.user_id)
+            return call.save(PANVerificationResponse(
+                message=result["message"],
+                pan_status=result["pan_status"],
+                verified_name=result.get("verified_name"),
+                identity_status=result["identity_status"],
+                next_step=result["next_step"],
+            ))
     except HTTPException:
         raise
     except Exception as e:
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from core.database import get_db
 from schemas.user_profile_schema import UserRegistrationRequest, UserRegistrationResponse, UserProfileUpdateRequest, UserProfileUpdateResponse
 import logging
+from typing import Optional
 from services.registration_service import RegistrationService
+from repositories.user_repository import UserRepository
+from utils.http_cache import weak_etag, etag_matches, not_modified, set_validators
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +16,22 @@ router = APIRouter(prefix="/api/v1/user", tags=["User Profile"])
 @router.get("/profile")
 def get_user_profile(
     user_id: int = Query(..., description="User ID"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     try:
+        if if_none_match:
+            updated_at = UserRepository.get_updated_at(db, user_id)
+            etag = weak_etag("profile", user_id, updated_at.isoformat()) if updated_at else None
+            if etag and etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
         user = RegistrationService.get_profile_by_user_id(db, user_id)
-        return {
+        response = ORJSONResponse({
             "user_id": user.user_id,
             "email": user.email,
             "full_name": user.full_name,
-            "dob": user.dob.isoformat(),
+            "dob": user.dob,
             "address": user.address,
             "employment_type": user.employment_type,
             "monthly_income": float(user.monthly_income),
@@ -32,7 +43,9 @@ def get_user_profile(
             "document_status": user.document_status,
             "identity_status": user.identity_status,
             "kyc_status":user.kyc_status,
-        }
+        })
+        set_validators(response, weak_etag("profile", user_id, user.updated_at.isoformat()))
+        return response
     except HTTPException:
         raise
     except Exception as e:
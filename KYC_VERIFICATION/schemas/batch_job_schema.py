@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict
+from schemas.bank_schema import BankVerificationRequest
+
+class BatchJobCreateRequest(BaseModel):
+    step: str                                                     # "PAN" or "BANK"
+    user_ids: Optional[List[int]] = None                          # PAN jobs
+    bank_accounts: Optional[List[BankVerificationRequest]] = None # BANK jobs, one entry per user
+    concurrency: Optional[int] = Field(None, ge=1)
+    created_by: str = Field(..., min_length=1, max_length=100)
+
+    @model_validator(mode="after")
+    def validate_items(self):
+        self.step = self.step.strip().upper()
+        if self.step == "PAN":
+            if not self.user_ids:
+                raise ValueError("user_ids is required for PAN jobs")
+        elif self.step == "BANK":
+            if not self.bank_accounts:
+                raise ValueError("bank_accounts is required for BANK jobs")
+        else:
+            raise ValueError("step must be 'PAN' or 'BANK'")
+        return self
+
+class BatchJobResponse(BaseModel):
+    id: int
+    step: str
+    status: str
+    total_items: int
+    concurrency: int
+    created_by: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    items: Dict[str, int]
+
+class BatchJobItemResponse(BaseModel):
+    id: int
+    user_id: int
+    status: str
+    http_status: Optional[int] = None
+    message: Optional[str] = None
+    retries: int
+    finished_at: Optional[str] = None
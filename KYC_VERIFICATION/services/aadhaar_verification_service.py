@@ -1,5 +1,5 @@
+import hashlib
 import logging
-import secrets
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
@@ -7,17 +7,39 @@ from models.attempt_tracker import VerificationType
 from repositories.user_repository import UserRepository
 from repositories.attempt_tracker_repository import AttemptTrackerRepository
 from repositories.kyc_aadhaar_verification_repository import KYCAadhaarVerificationRepository
+from repositories.used_token_nonce_repository import UsedTokenNonceRepository
 from providers.aadhaar_provider import get_aadhaar_provider
-from core.config import AADHAAR_MAX_ATTEMPTS, AADHAAR_COOLDOWN_HOURS, VERIFICATION_MODE
+from utils.provider_guard import ProviderUnavailableError
+from utils.signed_token import TokenSigner, InvalidTokenError
+from core.database import DATABASE_URL
+from core.config import (
+    AADHAAR_MAX_ATTEMPTS, AADHAAR_COOLDOWN_HOURS, VERIFICATION_MODE,
+    AADHAAR_TOKEN_SECRET, AADHAAR_TOKEN_PREVIOUS_SECRET, AADHAAR_TOKEN_EXPIRY_MINUTES,
+)
 
 logger = logging.getLogger(__name__)
 
-AADHAAR_TOKEN_EXPIRY_MINUTES = 10
+TOKEN_PURPOSE = "aadhaar"
 
-def _clear_aadhaar_session(user):
-    user.aadhaar_initiate_token      = None
-    user.aadhaar_token_created_at    = None
-    user.aadhaar_token_attempt_count = 0
+def _token_secret() -> str:
+    """
+    AADHAAR_TOKEN_SECRET, required in API mode, so the app refuses to start without it.
+    In dummy mode a missing secret falls back to a key derived from DATABASE_URL, which
+    every worker pointed at the same database shares and which survives restarts.
+    """
+    if AADHAAR_TOKEN_SECRET:
+        return AADHAAR_TOKEN_SECRET
+    if VERIFICATION_MODE == "api":
+        raise RuntimeError(
+            "AADHAAR_TOKEN_SECRET is not set. Add it to .env (the same value on every worker) "
+            "or switch VERIFICATION_MODE=dummy."
+        )
+    logger.warning("AADHAAR_TOKEN_SECRET is not set; signing Aadhaar tokens with a key derived from DATABASE_URL")
+    return hashlib.sha256(f"{TOKEN_PURPOSE}-token-key:{DATABASE_URL}".encode()).hexdigest()
+
+# Aadhaar sessions live entirely in the signed initiate_token; the only state kept
+# is the nonce of each token once it has been spent on a verify attempt.
+_session_tokens = TokenSigner(TOKEN_PURPOSE, _token_secret(), AADHAAR_TOKEN_PREVIOUS_SECRET)
 
 class AadhaarVerificationService:
 
@@ -54,18 +76,12 @@ class AadhaarVerificationService:
             AttemptTrackerRepository.lock_tracker(
                 db, tracker, now + timedelta(hours=AADHAAR_COOLDOWN_HOURS)
             )
-            _clear_aadhaar_session(user)
-            UserRepository.save(db)
             raise HTTPException(
                 423,
                 f"Maximum attempts ({AADHAAR_MAX_ATTEMPTS}) exceeded. "
                 f"Aadhaar verification blocked for {AADHAAR_COOLDOWN_HOURS} hours."
             )
-        token = secrets.token_hex(32)
-        user.aadhaar_initiate_token      = token
-        user.aadhaar_token_created_at    = now
-        user.aadhaar_token_attempt_count = 0
-        UserRepository.save(db)
+        token, _ = _session_tokens.issue(user.user_id)
 
         attempts_used      = current_initiates
         attempts_remaining = AADHAAR_MAX_ATTEMPTS - attempts_used
@@ -134,27 +150,15 @@ class AadhaarVerificationService:
             if locked_until > now:
                 remaining_hrs = round((locked_until - now).total_seconds() / 3600, 1)
                 raise HTTPException( 423, f"Aadhaar verification is blocked for {remaining_hrs} more hour(s).")
-        if not user.aadhaar_initiate_token:
-            raise HTTPException(
-                400,
-                "No active Aadhaar session. "
-                "Please call POST /api/v1/kyc/aadhaar-initiate first."
-            )
-        if user.aadhaar_token_created_at:
-            created_at = user.aadhaar_token_created_at
-            if created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
-
-            age_minutes = (now - created_at).total_seconds() / 60
-            if age_minutes > AADHAAR_TOKEN_EXPIRY_MINUTES:
-                _clear_aadhaar_session(user)
-                UserRepository.save(db)
+        try:
+            claims = _session_tokens.verify(initiate_token, user.user_id, AADHAAR_TOKEN_EXPIRY_MINUTES * 60)
+        except InvalidTokenError as e:
+            if e.reason == "expired":
                 raise HTTPException(
                     400,
                     f"Session token expired (valid {AADHAAR_TOKEN_EXPIRY_MINUTES} minutes). "
                     "Please call POST /api/v1/kyc/aadhaar-initiate to get a new token."
                 )
-        if user.aadhaar_initiate_token != initiate_token:
             raise HTTPException(
                 400,
                 "Invalid or expired token. "
@@ -168,6 +172,15 @@ class AadhaarVerificationService:
         if existing and existing.user_id != user.user_id:
             raise HTTPException(409, "This Aadhaar number is already linked to another account")
 
+        # Each token buys one verify attempt; a second use of the same token is a replay.
+        token_expires_at = datetime.fromtimestamp(claims.issued_at, timezone.utc) + timedelta(minutes=AADHAAR_TOKEN_EXPIRY_MINUTES)
+        if not UsedTokenNonceRepository.consume(db, claims.nonce, TOKEN_PURPOSE, user.user_id, token_expires_at):
+            raise HTTPException(
+                400,
+                "This Aadhaar session token has already been used. "
+                "Please call POST /api/v1/kyc/aadhaar-initiate to get a fresh token."
+            )
+
         current_attempt = tracker.attempts_count  
         provider = get_aadhaar_provider()
         try:
@@ -177,14 +190,17 @@ class AadhaarVerificationService:
                 dob_submitted=user.dob,
                 auth_code=auth_code,
             )
+        except ProviderUnavailableError as e:
+            # The provider never saw the attempt, so the token stays usable for a retry.
+            UsedTokenNonceRepository.release(db, claims.nonce)
+            raise HTTPException(503, str(e), headers={"Retry-After": str(e.retry_after)})
         except RuntimeError as e:
+            UsedTokenNonceRepository.release(db, claims.nonce)
             raise HTTPException(503, str(e))
 
         verified_dob = result.get("verified_dob") or ""
 
         if not result["success"]:
-            _clear_aadhaar_session(user)
-
             if current_attempt >= AADHAAR_MAX_ATTEMPTS:
                 status = "BLOCKED"
                 user.aadhaar_status = "BLOCKED"
@@ -232,8 +248,6 @@ class AadhaarVerificationService:
         if user.pan_status == "VERIFIED":
             user.identity_status = "VERIFIED"
 
-        _clear_aadhaar_session(user)
-
         KYCAadhaarVerificationRepository.create_verification_log(
             db=db, user_id=user.user_id,
             aadhaar_number=aadhaar_number,
@@ -2,168 +2,193 @@ import logging
 import threading
 import time
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import and_
-from core.database import SessionLocal
-from models.attempt_tracker import AttemptTracker
-from models.document_upload import DocumentStatus
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from core.database import SessionLocal, engine
+from core.partitioning import drop_purgeable_partitions, ensure_partitions, is_partitioned
+from repositories.attempt_tracker_repository import AttemptTrackerRepository
 from repositories.document_upload_repository import DocumentUploadRepository
 from repositories.kyc_pan_verification_repository import KYCPANVerificationRepository
 from repositories.kyc_aadhaar_verification_repository import KYCAadhaarVerificationRepository
 from repositories.kyc_bank_verification_repository import KYCBankVerificationRepository
-from core.config import RETENTION_DAYS, TRACKER_CLEANUP_HOURS, REJECTED_DOCS_RETENTION_DAYS
-import os
+from repositories.used_token_nonce_repository import UsedTokenNonceRepository
+from repositories.idempotency_key_repository import IdempotencyKeyRepository
+from services.orphan_file_sweeper import OrphanFileSweeper
+from services.verification_archive import verification_archive
+from utils.file_ops import remove_files
+from core.config import (
+    RETENTION_DAYS, TRACKER_CLEANUP_HOURS, REJECTED_DOCS_RETENTION_DAYS,
+    CLEANUP_BATCH_SIZE, CLEANUP_TIME_BUDGET_SECONDS, CLEANUP_BATCH_PAUSE_SECONDS,
+    CLEANUP_LOCK_TIMEOUT_MS, CLEANUP_PROGRESS_EVERY, ARCHIVE_ENABLED,
+)
 
 logger = logging.getLogger(__name__)
 
 class AutoCleanup:
+    """
+    The cleanup tasks. CleanupScheduler decides when, and on which process, each
+    one runs; setting `stop_event` makes a running task stop between chunks.
+    """
     
-    def __init__(self, interval_hours: int = 24):
-        self.interval_hours = interval_hours
-        self._running = False
-        self._thread = None
-        logger.info(f"AutoCleanup initialized with interval: {interval_hours}h")
+    TASKS = ("trackers", "verifications", "documents", "orphan_files", "partitions", "token_nonces", "idempotency_keys")
     
-    def start(self):
-        if self._running:
-            logger.warning("Auto cleanup already running")
-            return
-        
-        self._running = True
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
-        logger.info(f"Auto cleanup started (runs every {self.interval_hours}h)")
+    def __init__(self, stop_event: threading.Event):
+        self._stop = stop_event
     
-    def stop(self):
-        self._running = False
-        if self._thread:
-            self._thread.join(timeout=5)
-        logger.info("Auto cleanup stopped")
-    
-    def is_running(self):
-        return self._running
+    def run(self, task: str) -> int:
+        """Run one task in its own session and return how many rows/files it removed."""
+        handlers = {
+            "trackers":      self._cleanup_expired_trackers,
+            "verifications": self._cleanup_failed_verifications,
+            "documents":     self._cleanup_rejected_documents,
+            "orphan_files":  self._cleanup_orphan_files,
+            "partitions":    self._create_partitions,
+            "token_nonces":  self._cleanup_used_token_nonces,
+            "idempotency_keys": self._cleanup_idempotency_keys,
+        }
+        db = SessionLocal()
+        try:
+            return handlers[task](db, time.monotonic() + CLEANUP_TIME_BUDGET_SECONDS)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
     
-    def _run(self):
-        while self._running:
+    def _delete_in_chunks(self, db, label: str, delete_chunk, deadline: float) -> int:
+        """
+        Call `delete_chunk(db, CLEANUP_BATCH_SIZE)` one short transaction at a time until
+        a chunk comes back short, the run's time budget is spent or cleanup is stopped.
+        Each transaction gets a lock_timeout so a chunk gives up instead of queueing
+        behind request traffic; whatever is left is picked up by the next run.
+        """
+        total = 0
+        chunks = 0
+        while not self._stop.is_set():
+            if time.monotonic() >= deadline:
+                logger.warning(f"{label} cleanup hit its time budget after {total} rows, continuing next run")
+                break
             try:
-                self._cleanup()
-            except Exception as e:
-                logger.error(f"Cleanup error: {str(e)}", exc_info=True)
-            
-            time.sleep(self.interval_hours * 3600)
+                db.execute(text(f"SET LOCAL lock_timeout = '{CLEANUP_LOCK_TIMEOUT_MS}ms'"))
+                deleted = delete_chunk(db, CLEANUP_BATCH_SIZE)
+                db.commit()
+            except OperationalError as e:
+                db.rollback()
+                logger.warning(f"{label} cleanup chunk gave up waiting for locks: {e.orig}")
+                self._stop.wait(CLEANUP_BATCH_PAUSE_SECONDS * 10)
+                continue
+            
+            total += deleted
+            chunks += 1
+            if chunks % CLEANUP_PROGRESS_EVERY == 0:
+                logger.info(f"{label} cleanup progress: {total} rows in {chunks} chunks")
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
+            self._stop.wait(CLEANUP_BATCH_PAUSE_SECONDS)
+        return total
     
-    def _cleanup(self):
-        db = SessionLocal()
-        try:
-            logger.info("Starting cleanup...")
-            
-            expired_trackers = self._cleanup_expired_trackers(db)
-            failed_verifications = self._cleanup_failed_verifications(db)
-            rejected_docs = self._cleanup_rejected_documents(db)
-            
+    def _cleanup_expired_trackers(self, db, deadline: float):
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=TRACKER_CLEANUP_HOURS)
+        
+        total_count = self._delete_in_chunks(
+            db, "Tracker",
+            lambda db, limit: AttemptTrackerRepository.delete_stale_chunk(db, cutoff, limit),
+            deadline,
+        )
+        
+        if total_count > 0:
+            logger.info(f"Deleted {total_count} expired or unused trackers")
+        
+        return total_count
+    
+    def _cleanup_used_token_nonces(self, db, deadline: float):
+        now = datetime.now(timezone.utc)
+        
+        count = self._delete_in_chunks(
+            db, "Token nonce",
+            lambda db, limit: UsedTokenNonceRepository.delete_expired_chunk(db, now, limit),
+            deadline,
+        )
+        
+        if count > 0:
+            logger.info(f"Deleted {count} spent token nonces past their token expiry")
+        
+        return count
+    
+    def _cleanup_idempotency_keys(self, db, deadline: float):
+        now = datetime.now(timezone.utc)
+        
+        count = self._delete_in_chunks(
+            db, "Idempotency key",
+            lambda db, limit: IdempotencyKeyRepository.delete_expired_chunk(db, now, limit),
+            deadline,
+        )
+        
+        if count > 0:
+            logger.info(f"Deleted {count} expired idempotency keys")
+        
+        return count
+    
+    def _cleanup_failed_verifications(self, db, deadline: float):
+        cutoff = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
+        
+        # Partitioned tables purge a month at a time by dropping its FAILED/BLOCKED
+        # partition once the whole month is past the cutoff; row deletes would empty
+        # that partition day by day and leave nothing to drop. Only tables still in
+        # the old unpartitioned layout fall back to chunked deletes. Either way the
+        # rows are archived (services/verification_archive.py) first.
+        archive = verification_archive.write if ARCHIVE_ENABLED else None
+        
+        def purge(label, table, repository):
+            with engine.connect() as conn:
+                partitioned = is_partitioned(conn, table)
+            if partitioned:
+                return drop_purgeable_partitions(engine, table, cutoff, archive=archive)
+            
+            def delete_chunk(db, limit):
+                rows = repository.delete_failed_verifications_chunk(db, cutoff, limit)
+                if archive:
+                    archive(table, rows)
+                return len(rows)
+            
+            return self._delete_in_chunks(db, label, delete_chunk, deadline)
+        
+        pan_deleted = purge("PAN verification", "kyc_pan_verifications", KYCPANVerificationRepository)
+        aadhaar_deleted = purge("Aadhaar verification", "kyc_aadhaar_verifications", KYCAadhaarVerificationRepository)
+        bank_deleted = purge("Bank verification", "kyc_bank_verifications", KYCBankVerificationRepository)
+        
+        total_deleted = pan_deleted + aadhaar_deleted + bank_deleted
+        
+        if total_deleted > 0:
             logger.info(
-                f"Cleanup completed: "
-                f"{expired_trackers} trackers, "
-                f"{failed_verifications} verifications, "
-                f"{rejected_docs} documents removed"
+                f"Deleted {total_deleted} failed verifications "
+                f"(PAN: {pan_deleted}, Aadhaar: {aadhaar_deleted}, Bank: {bank_deleted}) "
+                f"older than {RETENTION_DAYS} days"
             )
         
-        except Exception as e:
-            logger.error(f"Cleanup failed: {str(e)}", exc_info=True)
-        
-        finally:
-            db.close()
+        return total_deleted
     
-    def _cleanup_expired_trackers(self, db):
-        try:
-            now = datetime.now(timezone.utc)
-            cutoff = now - timedelta(hours=TRACKER_CLEANUP_HOURS)
-            
-            old_trackers = db.query(AttemptTracker).filter(and_(AttemptTracker.locked_until.isnot(None),AttemptTracker.locked_until < cutoff)).all()
-            
-            useless_trackers = db.query(AttemptTracker).filter(and_(AttemptTracker.locked_until.is_(None),AttemptTracker.attempts_count == 0)).all()
-            
-            total_count = len(old_trackers) + len(useless_trackers)
-            
-            for tracker in old_trackers:
-                logger.debug(
-                    f"Deleting old tracker: {tracker.email}, "
-                    f"type: {tracker.verification_type}, "
-                    f"was locked until: {tracker.locked_until}"
-                )
-                db.delete(tracker)
-            
-            for tracker in useless_trackers:
-                logger.debug(
-                    f"Deleting useless tracker: {tracker.email},"
-                    f"type: {tracker.verification_type},"
-                    f"attempts_count=0, locked_until=null"
-                )
-                db.delete(tracker)
-            
-            if total_count > 0:
-                db.commit()
-                logger.info(
-                    f"Deleted {total_count} trackers "
-                    f"(old: {len(old_trackers)}, useless: {len(useless_trackers)})"
-                )
-            
-            return total_count
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Tracker cleanup error: {str(e)}")
-            return 0
+    def _cleanup_rejected_documents(self, db, deadline: float):
+        cutoff = datetime.now(timezone.utc) - timedelta(days=REJECTED_DOCS_RETENTION_DAYS)
+        
+        def delete_chunk(db, limit):
+            # Rows are deleted but not committed until the files are gone; files
+            # that fail to delete are picked up by the orphan sweep.
+            file_paths = DocumentUploadRepository.delete_rejected_before_date_chunk(db, cutoff, limit)
+            remove_files(file_paths)
+            return len(file_paths)
+        
+        count = self._delete_in_chunks(db, "Document", delete_chunk, deadline)
+        
+        if count > 0:
+            logger.info(
+                f"Deleted {count} rejected documents "
+                f"older than {REJECTED_DOCS_RETENTION_DAYS} days"
+            )
+        return count
     
-    def _cleanup_failed_verifications(self, db):
-        try:
-            cutoff = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
-            
-            pan_deleted = KYCPANVerificationRepository.delete_failed_verifications(db, cutoff)
-            aadhaar_deleted = KYCAadhaarVerificationRepository.delete_failed_verifications(db, cutoff)
-            bank_deleted = KYCBankVerificationRepository.delete_failed_verifications(db, cutoff)
-            
-            total_deleted = pan_deleted + aadhaar_deleted + bank_deleted
-            
-            if total_deleted > 0:
-                db.commit()
-                logger.info(
-                    f"Deleted {total_deleted} failed verifications "
-                    f"(PAN: {pan_deleted}, Aadhaar: {aadhaar_deleted}, Bank: {bank_deleted}) "
-                    f"older than {RETENTION_DAYS} days"
-                )
-            
-            return total_deleted
-            
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Verification cleanup error: {str(e)}")
-            return 0
+    def _cleanup_orphan_files(self, db, deadline: float):
+        return OrphanFileSweeper.sweep(db)["removed"]
     
-    def _cleanup_rejected_documents(self, db):
-        try:
-            cutoff = datetime.now(timezone.utc) - timedelta(days=REJECTED_DOCS_RETENTION_DAYS)
-            
-            rejected_docs = DocumentUploadRepository.get_rejected_documents_before_date(db, cutoff)
-            
-            count = len(rejected_docs)
-            
-            for doc in rejected_docs:
-                if os.path.exists(doc.file_path):
-                    try:
-                        os.remove(doc.file_path)
-                        logger.debug(f"Deleted file: {doc.file_path}")
-                    except Exception as e:
-                        logger.error(f"Failed to delete file {doc.file_path}: {str(e)}")
-                
-                db.delete(doc)
-            
-            if count > 0:
-                db.commit()
-                logger.info(
-                    f"Deleted {count} rejected documents "
-                    f"older than {REJECTED_DOCS_RETENTION_DAYS} days"
-                )
-            return count 
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Document cleanup error: {str(e)}")
-            return 0
\ No newline at end of file
+    def _create_partitions(self, db, deadline: float):
+        return ensure_partitions(engine)
@@ -8,6 +8,8 @@ from repositories.user_repository import UserRepository
 from repositories.attempt_tracker_repository import AttemptTrackerRepository
 from repositories.kyc_bank_verification_repository import KYCBankVerificationRepository
 from providers.bank_provider import get_bank_provider
+from utils.provider_guard import ProviderUnavailableError
+from services.single_flight import verifications_in_flight
 from core.config import BANK_MAX_ATTEMPTS, BANK_COOLDOWN_HOURS, VERIFICATION_MODE
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,23 @@ class BankVerificationService:
         bank_name: str,
         ifsc: str,
     ) -> dict:
+        # Only a request for the same account shares an in-flight result; another one waits its turn.
+        return verifications_in_flight.run(
+            "bank", user.user_id,
+            lambda: BankVerificationService._verify_bank_account(db, user, account_number, account_holder_name, bank_name, ifsc),
+            signature=(account_number, account_holder_name, bank_name, ifsc),
+        )
+
+    @staticmethod
+    def _verify_bank_account(
+        db: Session,
+        user: UserProfile,
+        account_number: str,
+        account_holder_name: str,
+        bank_name: str,
+        ifsc: str,
+    ) -> dict:
+        db.refresh(user)   # a run for this user may have just finished while we waited
         if user.bank_status == "VERIFIED":
             raise HTTPException(400, "Bank account already verified")
         existing = KYCBankVerificationRepository.get_verified_by_account_number(db, account_number)
@@ -65,6 +84,9 @@ class BankVerificationService:
                 bank_name=bank_name,
                 ifsc=ifsc,
             )
+        except ProviderUnavailableError as e:
+            AttemptTrackerRepository.decrement_attempt(db, tracker)
+            raise HTTPException(503, str(e), headers={"Retry-After": str(e.retry_after)})
         except RuntimeError as e:
             AttemptTrackerRepository.decrement_attempt(db, tracker)
             raise HTTPException(503, str(e))
@@ -93,6 +115,7 @@ class BankVerificationService:
                 status=status,
                 failure_reason=result["failure_reason"],
                 attempt_number=current_attempt,
+                verified_name=verified_name or None,
             )
             UserRepository.save(db)
 
@@ -118,6 +141,7 @@ class BankVerificationService:
             status="VERIFIED",
             failure_reason=None,
             attempt_number=current_attempt,
+            verified_name=verified_name or None,
         )
         AttemptTrackerRepository.reset_attempts(db, tracker)
         UserRepository.update_user(db, user)
@@ -0,0 +1,222 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from core.database import SessionLocal
+from core.config import (
+    BATCH_MAX_CONCURRENCY, BATCH_MAX_ITEMS, BATCH_ITEM_MAX_RETRIES, BATCH_STALE_CLAIM_SECONDS, BATCH_POLL_SECONDS,
+)
+from models.kyc_batch_job import KYCBatchJob
+from repositories.kyc_batch_job_repository import KYCBatchJobRepository, FINAL_JOB_STATUSES
+from repositories.user_repository import UserRepository
+from schemas.batch_job_schema import BatchJobCreateRequest
+from services.pan_verification_service import PANVerificationService
+from services.bank_verification_service import BankVerificationService
+
+logger = logging.getLogger(__name__)
+
+CLAIM_ROUNDS_AHEAD = 4   # items claimed per round = concurrency * this
+
+
+class BatchVerificationService:
+
+    @staticmethod
+    def create_job(db: Session, request: BatchJobCreateRequest) -> KYCBatchJob:
+        if request.step == "PAN":
+            items = [{"user_id": uid} for uid in dict.fromkeys(request.user_ids)]
+        else:
+            items = [
+                {"user_id": a.user_id, "payload": a.model_dump(exclude={"user_id"})}
+                for a in {a.user_id: a for a in request.bank_accounts}.values()
+            ]
+        if len(items) > BATCH_MAX_ITEMS:
+            raise HTTPException(400, f"A batch job can hold at most {BATCH_MAX_ITEMS} users, got {len(items)}")
+
+        concurrency = min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+        job = KYCBatchJobRepository.create_job(db, request.step, items, concurrency, request.created_by)
+        logger.info(f"Batch job {job.id} created: {request.step} for {len(items)} users by {request.created_by}")
+        return job
+
+    @staticmethod
+    def job_summary(db: Session, job: KYCBatchJob) -> dict:
+        return {
+            "id":          job.id,
+            "step":        job.step,
+            "status":      job.status,
+            "total_items": job.total_items,
+            "concurrency": job.concurrency,
+            "created_by":  job.created_by,
+            "created_at":  job.created_at.isoformat(),
+            "started_at":  job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            "items":       KYCBatchJobRepository.count_items_by_status(db, job.id),
+        }
+
+    @staticmethod
+    def verify_item(db: Session, step: str, user_id: int, payload: Optional[dict]) -> tuple:
+        """Run one user through the same service call the public endpoint makes. Returns (status, http_status, message)."""
+        user = UserRepository.get_by_user_id(db, user_id)
+        if not user:
+            return "FAILED", 404, "User not found"
+
+        if step == "PAN":
+            if user.pan_status == "VERIFIED":
+                return "SKIPPED", 200, "PAN already verified"
+            result = PANVerificationService.verify_pan(db, user_id)
+            return "SUCCEEDED", 200, result["message"]
+
+        if user.identity_status != "VERIFIED":
+            return "SKIPPED", 400, "Identity verification (PAN + Aadhaar) not completed"
+        if user.bank_status == "VERIFIED":
+            return "SKIPPED", 200, "Bank already verified"
+        result = BankVerificationService.verify_bank_account(db=db, user=user, **payload)
+        return "SUCCEEDED", 200, result["message"]
+
+
+class BatchVerificationRunner:
+    """
+    Works batch jobs on background threads: one coordinator thread per job, each
+    with a pool of `job.concurrency` workers. State lives in kyc_batch_job_items,
+    so unfinished jobs are picked up where they stopped.
+
+    Only the process holding the cleanup leader lock runs jobs; otherwise every
+    uvicorn worker would resume the same jobs and multiply provider concurrency by
+    the worker count. A poll thread on every process picks up new and unfinished
+    jobs once that process is leader, and job threads stop claiming items when it
+    loses leadership.
+    """
+
+    def __init__(self):
+        self._threads   = {}
+        self._lock      = threading.Lock()
+        self._stopping  = threading.Event()
+        self._poller    = None
+        self._is_leader = lambda: False
+
+    def start(self, is_leader: Callable[[], bool]) -> None:
+        self._stopping.clear()
+        self._is_leader = is_leader
+        self._poller = threading.Thread(target=self._poll, daemon=True, name="kyc-batch-poller")
+        self._poller.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        with self._lock:
+            threads = list(self._threads.values())
+        if self._poller:
+            threads.append(self._poller)
+        for thread in threads:
+            thread.join(timeout=5)
+        logger.info("Batch verification runner stopped")
+
+    def _poll(self) -> None:
+        while not self._stopping.is_set():
+            if self._is_leader():
+                try:
+                    self._resume_jobs()
+                except Exception as e:
+                    logger.error(f"Batch job poll failed: {str(e)}", exc_info=True)
+            self._stopping.wait(BATCH_POLL_SECONDS)
+
+    def _resume_jobs(self) -> None:
+        db = SessionLocal()
+        try:
+            job_ids = [job.id for job in KYCBatchJobRepository.get_resumable_jobs(db)]
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self.submit(job_id)
+
+    def submit(self, job_id: int) -> None:
+        """Start working `job_id` here if this process is the leader; otherwise the leader's poll picks it up."""
+        if not self._is_leader():
+            return
+        with self._lock:
+            thread = self._threads.get(job_id)
+            if thread and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._run_job, args=(job_id,), daemon=True, name=f"kyc-batch-{job_id}")
+            self._threads[job_id] = thread
+            thread.start()
+        logger.info(f"Batch job {job_id} picked up by this process")
+
+    def _run_job(self, job_id: int) -> None:
+        db = SessionLocal()
+        try:
+            job = KYCBatchJobRepository.get_job(db, job_id)
+            if not job or job.status in FINAL_JOB_STATUSES:
+                return
+            KYCBatchJobRepository.set_status(db, job, "RUNNING")
+            step, concurrency = job.step, job.concurrency
+        finally:
+            db.close()
+
+        logger.info(f"Batch job {job_id} running: {step}, concurrency {concurrency}")
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"kyc-batch-{job_id}") as pool:
+            while not self._stopping.is_set():
+                if not self._is_leader():
+                    logger.info(f"Batch job {job_id}: this process is no longer leader, handing the job over")
+                    return
+                db = SessionLocal()
+                try:
+                    job = KYCBatchJobRepository.get_job(db, job_id)
+                    if not job or job.status == "CANCELLED":
+                        logger.info(f"Batch job {job_id} cancelled")
+                        return
+                    items = KYCBatchJobRepository.claim_items(db, job_id, concurrency * CLAIM_ROUNDS_AHEAD)
+                    unfinished = None
+                    if not items:
+                        # Items left RUNNING by a process that died or lost leadership mid-call
+                        # go back to PENDING here, not just at startup, so the job can finish.
+                        requeued = KYCBatchJobRepository.requeue_stale_items(db, job_id, BATCH_STALE_CLAIM_SECONDS)
+                        if requeued:
+                            logger.info(f"Batch job {job_id}: requeued {requeued} item(s) left running by a previous process")
+                        unfinished = KYCBatchJobRepository.count_unfinished(db, job_id)
+                finally:
+                    db.close()
+
+                if items:
+                    list(pool.map(lambda item: self._process_item(step, item), items))
+                elif unfinished:
+                    # Only items waiting out a provider Retry-After, or stale claims not yet requeued, remain.
+                    self._stopping.wait(1)
+                else:
+                    break
+
+        if self._stopping.is_set():
+            return
+        db = SessionLocal()
+        try:
+            job = KYCBatchJobRepository.get_job(db, job_id)
+            if job and job.status == "RUNNING":
+                KYCBatchJobRepository.set_status(db, job, "COMPLETED")
+                counts = KYCBatchJobRepository.count_items_by_status(db, job_id)
+                logger.info(f"Batch job {job_id} completed: {counts}")
+        finally:
+            db.close()
+
+    def _process_item(self, step: str, item) -> None:
+        db = SessionLocal()
+        try:
+            try:
+                status, http_status, message = BatchVerificationService.verify_item(db, step, item.user_id, item.payload)
+            except HTTPException as e:
+                db.rollback()
+                retry_after = int((e.headers or {}).get("Retry-After", 0))
+                # 503: provider unavailable; 409: the user's verification is already running elsewhere.
+                if e.status_code in (409, 503) and item.retries < BATCH_ITEM_MAX_RETRIES:
+                    KYCBatchJobRepository.retry_item_later(db, item.id, max(retry_after, 2 ** item.retries), str(e.detail))
+                    return
+                status, http_status, message = "FAILED", e.status_code, str(e.detail)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Batch item {item.id} (user {item.user_id}) error: {e}", exc_info=True)
+                status, http_status, message = "FAILED", 500, "Verification service temporarily unavailable"
+            KYCBatchJobRepository.finish_item(db, item.id, status, http_status, message)
+        finally:
+            db.close()
+
+
+batch_runner = BatchVerificationRunner()
@@ -0,0 +1,192 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import text
+from core.database import SessionLocal, engine
+from core.metrics import CLEANUP_REMOVED, CLEANUP_LAST_RUN, CLEANUP_RUNS, CLEANUP_DURATION
+from core.config import (
+    CLEANUP_TRACKERS_CRON, CLEANUP_VERIFICATIONS_CRON, CLEANUP_DOCUMENTS_CRON, CLEANUP_ORPHAN_FILES_CRON,
+    CLEANUP_PARTITIONS_CRON, CLEANUP_TOKEN_NONCES_CRON, CLEANUP_IDEMPOTENCY_KEYS_CRON,
+    CLEANUP_JITTER_SECONDS, CLEANUP_LEADER_RETRY_SECONDS,
+)
+from repositories.cleanup_task_run_repository import CleanupTaskRunRepository
+from services.auto_cleanup import AutoCleanup
+from utils.cron import CronSchedule
+
+logger = logging.getLogger(__name__)
+
+LEADER_LOCK_KEY = 0x4B5943_4C45414E   # "KYC" "LEAN": pg advisory lock id shared by every worker
+
+
+class CleanupScheduler:
+    """
+    Runs the AutoCleanup tasks on cron schedules, on exactly one process. Every
+    worker starts a scheduler, but only the one holding a session-level Postgres
+    advisory lock (on a connection it keeps for that purpose) runs tasks; the others
+    retry the lock every CLEANUP_LEADER_RETRY_SECONDS and take over if the leader's
+    connection goes away. Each run is recorded in cleanup_task_runs.
+    """
+
+    def __init__(self):
+        self.schedules = {
+            "trackers":      CronSchedule(CLEANUP_TRACKERS_CRON),
+            "verifications": CronSchedule(CLEANUP_VERIFICATIONS_CRON),
+            "documents":     CronSchedule(CLEANUP_DOCUMENTS_CRON),
+            "orphan_files":  CronSchedule(CLEANUP_ORPHAN_FILES_CRON),
+            "partitions":    CronSchedule(CLEANUP_PARTITIONS_CRON),
+            "token_nonces":  CronSchedule(CLEANUP_TOKEN_NONCES_CRON),
+            "idempotency_keys": CronSchedule(CLEANUP_IDEMPOTENCY_KEYS_CRON),
+        }
+        self.runner     = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop      = threading.Event()
+        self._cleanup   = AutoCleanup(self._stop)
+        self._thread    = None
+        self._lock_conn = None
+        self._next_runs = {}
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            logger.warning("Cleanup scheduler already running")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="kyc-cleanup-scheduler")
+        self._thread.start()
+        logger.info(
+            "Cleanup scheduler started: "
+            + ", ".join(f"{task} '{schedule.expression}'" for task, schedule in self.schedules.items())
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        self._release_leadership()
+        logger.info("Cleanup scheduler stopped")
+
+    def is_leader(self) -> bool:
+        return self._lock_conn is not None
+
+    def _next_run(self, task: str, after: datetime) -> datetime:
+        jitter = random.uniform(0, CLEANUP_JITTER_SECONDS)
+        return self.schedules[task].next_after(after) + timedelta(seconds=jitter)
+
+    def _plan_runs(self) -> dict:
+        """
+        Next run per task for a newly elected leader: the next_run_at the previous
+        leader recorded in cleanup_task_runs, or the next cron slot from now for tasks
+        never run. A follower's start-up plan would be stale by then, and would run
+        every task that came due since it started at once, including ones the old
+        leader already ran. A recorded time in the past means that run was missed, so
+        it runs once.
+        """
+        now  = datetime.now(timezone.utc)
+        plan = {task: self._next_run(task, now) for task in self.schedules}
+        db = SessionLocal()
+        try:
+            for run in CleanupTaskRunRepository.list_all(db):
+                if run.task in plan and run.next_run_at is not None:
+                    plan[run.task] = run.next_run_at
+        except Exception as e:
+            logger.warning(f"Cleanup scheduler could not read previous runs, scheduling from now: {str(e)}")
+        finally:
+            db.close()
+        return plan
+
+    def _run(self) -> None:
+        now = datetime.now(timezone.utc)
+        self._next_runs = {task: self._next_run(task, now) for task in self.schedules}
+
+        while not self._stop.is_set():
+            if not self._hold_leadership():
+                self._stop.wait(CLEANUP_LEADER_RETRY_SECONDS)
+                continue
+
+            now = datetime.now(timezone.utc)
+            for task, due_at in sorted(self._next_runs.items(), key=lambda item: item[1]):
+                if due_at > now or self._stop.is_set():
+                    continue
+                self._run_task(task)
+                now = datetime.now(timezone.utc)
+                if not self._hold_leadership():
+                    break
+
+            wait = (min(self._next_runs.values()) - datetime.now(timezone.utc)).total_seconds()
+            # Wake at least every retry interval to confirm the lock connection is still alive.
+            self._stop.wait(max(0, min(wait, CLEANUP_LEADER_RETRY_SECONDS)))
+
+    def _run_task(self, task: str) -> None:
+        db = SessionLocal()
+        try:
+            CleanupTaskRunRepository.mark_started(db, task, self.runner)
+            status, removed, error = "SUCCEEDED", None, None
+            started = time.monotonic()
+            try:
+                removed = self._cleanup.run(task)
+                logger.info(f"Cleanup task {task} finished: {removed} removed")
+                CLEANUP_REMOVED.labels(task).inc(removed)
+                CLEANUP_LAST_RUN.labels(task).set(removed)
+            except Exception as e:
+                status, error = "FAILED", str(e)
+                logger.error(f"Cleanup task {task} failed: {str(e)}", exc_info=True)
+            CLEANUP_RUNS.labels(task, status).inc()
+            CLEANUP_DURATION.labels(task).observe(time.monotonic() - started)
+            self._next_runs[task] = self._next_run(task, datetime.now(timezone.utc))
+            CleanupTaskRunRepository.mark_finished(db, task, status, removed, error, self._next_runs[task])
+        except Exception as e:
+            self._next_runs[task] = self._next_run(task, datetime.now(timezone.utc))
+            logger.error(f"Could not record cleanup task {task}: {str(e)}", exc_info=True)
+        finally:
+            db.close()
+
+    def _hold_leadership(self) -> bool:
+        """Acquire the leader lock, or confirm the connection holding it is still alive."""
+        try:
+            if self._lock_conn is not None:
+                self._lock_conn.execute(text("SELECT 1"))
+                self._lock_conn.commit()
+                return True
+
+            conn = engine.connect()
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": LEADER_LOCK_KEY}).scalar()
+            conn.commit()
+            if not acquired:
+                conn.close()
+                return False
+            self._lock_conn = conn
+            self._next_runs = self._plan_runs()
+            logger.info(f"Cleanup scheduler: {self.runner} is now the leader")
+            return True
+        except Exception as e:
+            logger.warning(f"Cleanup scheduler lost or could not take leadership: {str(e)}")
+            self._drop_lock_connection()
+            return False
+
+    def _release_leadership(self) -> None:
+        if self._lock_conn is None:
+            return
+        try:
+            self._lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": LEADER_LOCK_KEY})
+            self._lock_conn.commit()
+            self._lock_conn.close()
+            self._lock_conn = None
+        except Exception as e:
+            logger.warning(f"Cleanup scheduler could not release the leader lock cleanly: {str(e)}")
+            self._drop_lock_connection()
+
+    def _drop_lock_connection(self) -> None:
+        # Invalidate instead of returning it to the pool, so the session-level lock
+        # can never leak into a request's connection.
+        if self._lock_conn is not None:
+            try:
+                self._lock_conn.invalidate()
+                self._lock_conn.close()
+            except Exception:
+                pass
+            self._lock_conn = None
+
+
+cleanup_scheduler = CleanupScheduler()
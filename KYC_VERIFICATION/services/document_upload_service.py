@@ -4,11 +4,14 @@ from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, UploadFile
 from core.database import SessionLocal
+from core.metrics import VERIFICATIONS
+from core.tracing import span, traced
 from core.config import ALLOWED_IMAGE_EXTENSIONS, ALLOWED_DOCUMENT_EXTENSIONS, UPLOAD_BASE_PATH, VERIFICATION_MODE
 from models.document_upload import DocumentUpload, DocumentType, DocumentStatus
 from repositories.user_repository import UserRepository
 from repositories.document_upload_repository import DocumentUploadRepository
 from providers.document_provider import get_document_provider
+from utils.file_ops import remove_files
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +96,7 @@ class DocumentUploadService:
         }
 
     @staticmethod
+    @traced("document.verify_background")
     def verify_document_background(document_id: int):
         db = SessionLocal()
         try:
@@ -131,6 +135,7 @@ class DocumentUploadService:
                 logger.warning(f"[BG VERIFY] Document {doc.id} REJECTED: {doc.verification_remarks}")
 
             db.commit()
+            VERIFICATIONS.labels("DOCUMENT", doc.status.value).inc()
             DocumentUploadService._update_user_document_status(db, doc.user_id)
 
         except Exception as e:
@@ -206,14 +211,14 @@ class DocumentUploadService:
         if doc.status in [DocumentStatus.VERIFIED, DocumentStatus.APPROVED]:
             raise HTTPException(400, f"Cannot delete {doc.status.value.lower()} document")
 
-        if os.path.exists(doc.file_path):
-            try:
-                os.remove(doc.file_path)
-                logger.info(f"Deleted file from disk: {doc.file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to delete file: {e}")
-
-        DocumentUploadRepository.delete_document(db, doc)
+        # Delete the row first but commit only once the file is gone; if removal
+        # fails the row is still deleted and the orphan sweep reclaims the file.
+        db.delete(doc)
+        db.flush()
+        removed, _ = remove_files([doc.file_path])
+        if not removed:
+            logger.warning(f"Failed to delete file {doc.file_path}; left for the orphan sweep")
+        db.commit()
         logger.info(f"Document {document_id} deleted for user_id={user_id}")
 
         return {
@@ -282,7 +287,10 @@ class DocumentUploadService:
         filename  = f"{user_id}_{doc_type.value}_{timestamp}{file_ext}"
         file_path = os.path.join(upload_dir, filename)
 
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
+        with span("file.save", **{"document.type": doc_type.value}) as save_span:
+            content = file.file.read()
+            with open(file_path, "wb") as f:
+                f.write(content)
+            save_span.set_attribute("file.size", len(content))
 
         return file_path
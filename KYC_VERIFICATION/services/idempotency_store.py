@@ -0,0 +1,150 @@
+"""
+Idempotency-Key support for endpoints that mobile clients retry on timeouts.
+
+The first request with a given key claims it and runs; its response (or a 4xx
+HTTPException) is stored for IDEMPOTENCY_TTL_HOURS, and later requests with the
+same key get that response back with `Idempotent-Replayed: true`, without the
+service running again. Keys are scoped to the endpoint and user. Only hashes of the
+key and of the request are stored:
+
+    same key, different request   -> 422
+    same key, first still running -> 409 with Retry-After
+    5xx or unexpected error       -> claim released, a retry runs for real
+
+A claim whose request never finished (the worker died) can be taken over after
+IDEMPOTENCY_LOCK_SECONDS. Requests without the header are not affected.
+"""
+import hashlib
+import json
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+import orjson
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from core.database import SessionLocal
+from core.config import IDEMPOTENCY_TTL_HOURS, IDEMPOTENCY_LOCK_SECONDS
+from repositories.idempotency_key_repository import IdempotencyKeyRepository
+
+MAX_KEY_LENGTH = 255
+REPLAY_HEADER  = "Idempotent-Replayed"
+
+
+def request_fingerprint(*parts) -> str:
+    """Hash of what the request asked for; the key must not be reused for anything else."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class IdempotentCall:
+
+    def __init__(self, key_hash: Optional[str] = None):
+        self.key_hash = key_hash
+        self.replay   = None      # the stored Response, when this is a repeat
+        self._content = None
+
+    def save(self, content):
+        """Mark `content` as this call's response and return it unchanged."""
+        self._content = content
+        return content
+
+
+def _replay_response(record) -> Response:
+    return Response(
+        content=record.response_body,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={REPLAY_HEADER: "true"},
+    )
+
+
+def _store(call: IdempotentCall, status_code: int, content) -> None:
+    db = SessionLocal()
+    try:
+        IdempotencyKeyRepository.complete(db, call.key_hash, status_code, orjson.dumps(jsonable_encoder(content)))
+    finally:
+        db.close()
+
+
+def _release(call: IdempotentCall) -> None:
+    db = SessionLocal()
+    try:
+        IdempotencyKeyRepository.release(db, call.key_hash)
+    finally:
+        db.close()
+
+
+def _claim(scope: str, user_id: int, key: str, fingerprint: str) -> IdempotentCall:
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(400, f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+
+    call = IdempotentCall(hashlib.sha256(f"{scope}:{user_id}:{key}".encode()).hexdigest())
+    now  = datetime.now(timezone.utc)
+    db   = SessionLocal()
+    try:
+        claimed, existing = IdempotencyKeyRepository.claim(
+            db, call.key_hash, scope, user_id, fingerprint,
+            now=now,
+            expires_at=now + timedelta(hours=IDEMPOTENCY_TTL_HOURS),
+            stale_before=now - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+        )
+        if claimed:
+            return call
+        if existing is not None and existing.fingerprint != fingerprint:
+            raise HTTPException(422, "Idempotency-Key was already used for a different request")
+        if existing is None or existing.status_code is None:
+            raise HTTPException(
+                409, "A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+        call.replay = _replay_response(existing)
+        return call
+    finally:
+        db.close()
+
+
+def _is_final(e: HTTPException) -> bool:
+    """
+    Whether an error answer is worth replaying. 5xx, 409 and anything carrying
+    Retry-After (single-flight busy, provider circuit open) are temporary: storing
+    them would replay the same refusal for every retry until the key expires.
+    """
+    if e.status_code >= 500 or e.status_code in (409, 429):
+        return False
+    return "Retry-After" not in (e.headers or {})
+
+
+@contextmanager
+def idempotent(scope: str, user_id: int, key: Optional[str], fingerprint: str):
+    """
+    Wrap an endpoint body:
+
+        with idempotent("pan-verify", user_id, idempotency_key, fingerprint) as call:
+            if call.replay is not None:
+                return call.replay
+            ...
+            return call.save(response)
+    """
+    if not key:
+        yield IdempotentCall()
+        return
+
+    call = _claim(scope, user_id, key, fingerprint)
+    if call.replay is not None:
+        yield call
+        return
+
+    try:
+        yield call
+    except HTTPException as e:
+        if _is_final(e):
+            _store(call, e.status_code, {"detail": e.detail})
+        else:
+            _release(call)
+        raise
+    except BaseException:
+        _release(call)
+        raise
+    if call._content is None:
+        _release(call)
+    else:
+        _store(call, 200, call._content)
@@ -0,0 +1,109 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from repositories.kyc_summary_repository import KYCSummaryRepository
+from services.document_upload_service import REQUIRED_IDENTITY_DOCS, INCOME_PROOF_DOCS
+from models.document_upload import DocumentStatus
+from core.config import PAN_MAX_ATTEMPTS, AADHAAR_MAX_ATTEMPTS, BANK_MAX_ATTEMPTS
+
+MAX_ATTEMPTS = {"PAN": PAN_MAX_ATTEMPTS, "AADHAAR": AADHAAR_MAX_ATTEMPTS, "BANK": BANK_MAX_ATTEMPTS}
+APPROVED_DOC_STATUSES = {DocumentStatus.VERIFIED.value, DocumentStatus.APPROVED.value}
+INCOME_PROOF = "SALARY_SLIP or BANK_STATEMENT"
+
+
+def _verification(step: str, status: str, verified_at, latest: dict, tracker: dict) -> dict:
+    tracker       = tracker or {}
+    locked        = bool(tracker.get("locked"))
+    # A lock that has run out is reset by the next attempt, so its count no longer applies.
+    attempts_used = 0 if tracker.get("locked_until") and not locked else tracker.get("attempts_count", 0)
+    return {
+        "status":             status,
+        "verified_at":        verified_at,
+        "latest_attempt":     latest,
+        "attempts_used":      attempts_used,
+        "max_attempts":       MAX_ATTEMPTS[step],
+        "attempts_remaining": max(MAX_ATTEMPTS[step] - attempts_used, 0),
+        "locked":             locked,
+        "locked_until":       tracker.get("locked_until") if locked else None,
+    }
+
+
+def _checklist(documents: list) -> tuple:
+    """(checklist, missing, all_approved) with the rules DocumentUploadService.list_documents applies."""
+    def best(types):
+        candidates = [d for d in documents if d["document_type"] in types]
+        approved = [d for d in candidates if d["status"] in APPROVED_DOC_STATUSES]
+        return (approved or candidates or [None])[-1]
+
+    checklist = []
+    for requirement, types in [(d.value, {d.value}) for d in REQUIRED_IDENTITY_DOCS] + [
+        (INCOME_PROOF, {d.value for d in INCOME_PROOF_DOCS})
+    ]:
+        doc = best(types)
+        checklist.append({
+            "requirement": requirement,
+            "uploaded":    doc is not None,
+            "document_id": doc["id"] if doc else None,
+            "status":      doc["status"] if doc else None,
+            "approved":    doc is not None and doc["status"] in APPROVED_DOC_STATUSES,
+        })
+    missing = [item["requirement"] for item in checklist if not item["uploaded"]]
+    all_approved = (
+        all(item["approved"] for item in checklist)
+        and all(d["status"] in APPROVED_DOC_STATUSES for d in documents)
+    )
+    return checklist, missing, all_approved
+
+
+def _next_step(row, missing: list, all_approved: bool) -> str:
+    if row.pan_status != "VERIFIED":
+        return "Verify your PAN"
+    if row.aadhaar_status != "VERIFIED":
+        return "Verify your Aadhaar"
+    if row.bank_status != "VERIFIED":
+        return "Verify your bank account"
+    if missing:
+        return "Upload required documents"
+    if not all_approved:
+        return "Wait for document review"
+    return "KYC complete"
+
+
+class KYCSummaryService:
+
+    @staticmethod
+    def get_summary(db: Session, user_id: int) -> dict:
+        row = KYCSummaryRepository.get_summary(db, user_id)
+        if not row:
+            raise HTTPException(404, "User not found")
+
+        trackers  = {t["verification_type"]: t for t in row.trackers or []}
+        documents = row.documents or []
+        checklist, missing, all_approved = _checklist(documents)
+
+        verifications = {
+            "PAN":     _verification("PAN", row.pan_status, row.pan_verified_at, row.pan_log, trackers.get("PAN")),
+            "AADHAAR": _verification("AADHAAR", row.aadhaar_status, row.aadhaar_verified_at, row.aadhaar_log, trackers.get("AADHAAR")),
+            "BANK":    _verification("BANK", row.bank_status, row.bank_verified_at, row.bank_log, trackers.get("BANK")),
+        }
+
+        return {
+            "user_id":   row.user_id,
+            "full_name": row.full_name,
+            "statuses": {
+                "pan_status":      row.pan_status,
+                "aadhaar_status":  row.aadhaar_status,
+                "bank_status":     row.bank_status,
+                "identity_status": row.identity_status,
+                "document_status": row.document_status,
+                "kyc_status":      row.kyc_status,
+            },
+            "next_step":     _next_step(row, missing, all_approved),
+            "verifications": verifications,
+            "documents": {
+                "items":        documents,
+                "checklist":    checklist,
+                "missing":      missing,
+                "all_approved": all_approved,
+            },
+            "updated_at": row.updated_at,
+        }
@@ -0,0 +1,54 @@
+import logging
+import time
+from typing import List
+from sqlalchemy.orm import Session
+from core.config import UPLOAD_BASE_PATH, ORPHAN_FILE_GRACE_MINUTES, ORPHAN_SWEEP_BATCH_SIZE
+from repositories.document_upload_repository import DocumentUploadRepository
+from utils.file_ops import iter_files, remove_files
+
+logger = logging.getLogger(__name__)
+
+
+class OrphanFileSweeper:
+    """
+    Reclaims files under uploads/ that no document_uploads row points at: left by
+    failed uploads, a crash between _save_file and commit, a re-upload replacing a
+    rejected file, or a row delete whose file removal failed. Files younger than the
+    grace period are left alone so in-flight uploads are never touched.
+    """
+
+    @staticmethod
+    def sweep(db: Session, dry_run: bool = False, grace_minutes: int = ORPHAN_FILE_GRACE_MINUTES) -> dict:
+        started = time.monotonic()
+        newest_allowed = time.time() - grace_minutes * 60
+        result = {"scanned": 0, "too_recent": 0, "orphans": 0, "removed": 0, "failed": 0, "dry_run": dry_run}
+
+        batch: List[str] = []
+        for path, mtime in iter_files(UPLOAD_BASE_PATH):
+            result["scanned"] += 1
+            if mtime > newest_allowed:
+                result["too_recent"] += 1
+                continue
+            batch.append(path)
+            if len(batch) >= ORPHAN_SWEEP_BATCH_SIZE:
+                OrphanFileSweeper._sweep_batch(db, batch, dry_run, result)
+                batch = []
+        if batch:
+            OrphanFileSweeper._sweep_batch(db, batch, dry_run, result)
+
+        result["seconds"] = round(time.monotonic() - started, 2)
+        if result["orphans"]:
+            logger.info(f"Orphan file sweep: {result}")
+        return result
+
+    @staticmethod
+    def _sweep_batch(db: Session, paths: List[str], dry_run: bool, result: dict) -> None:
+        known = DocumentUploadRepository.get_known_file_paths(db, paths)
+        db.rollback()   # read-only; don't hold a snapshot open across the file deletes
+        orphans = [p for p in paths if p not in known]
+        result["orphans"] += len(orphans)
+        if dry_run or not orphans:
+            return
+        removed, failed = remove_files(orphans)
+        result["removed"] += removed
+        result["failed"] += failed
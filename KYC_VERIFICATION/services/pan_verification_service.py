@@ -7,6 +7,8 @@ from repositories.user_repository import UserRepository
 from repositories.attempt_tracker_repository import AttemptTrackerRepository
 from repositories.kyc_pan_verification_repository import KYCPANVerificationRepository
 from providers.pan_provider import get_pan_provider
+from utils.provider_guard import ProviderUnavailableError
+from services.single_flight import verifications_in_flight
 from core.config import PAN_MAX_ATTEMPTS, PAN_COOLDOWN_HOURS
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,12 @@ class PANVerificationService:
 
     @staticmethod
     def verify_pan(db: Session, user_id: int) -> dict:
+        # Double taps and parallel retries share one run instead of racing (services/single_flight.py).
+        return verifications_in_flight.run("pan", user_id, lambda: PANVerificationService._verify_pan(db, user_id))
+
+    @staticmethod
+    def _verify_pan(db: Session, user_id: int) -> dict:
+        db.expire_all()   # a run for this user may have just finished while we waited
         user = UserRepository.get_by_user_id(db, user_id)
         if not user:
             raise HTTPException(404, "User not found")
@@ -59,6 +67,9 @@ class PANVerificationService:
         provider = get_pan_provider()
         try:
             result = provider.verify(db=db, pan_number=user.pan_number, full_name=user.full_name)
+        except ProviderUnavailableError as e:
+            AttemptTrackerRepository.decrement_attempt(db, tracker)
+            raise HTTPException(503, str(e), headers={"Retry-After": str(e.retry_after)})
         except RuntimeError as e:
             AttemptTrackerRepository.decrement_attempt(db, tracker)
             raise HTTPException(503, str(e))
@@ -0,0 +1,167 @@
+"""
+Single-flight for verification steps: at most one PAN or bank verification runs
+per user at a time.
+
+Within a worker, a request that arrives while the same user's step is running
+waits for it. If it asked for the same thing (same step and same arguments, e.g.
+a double tap), it gets the first request's result or error instead of running
+again: no second provider call, no second attempt used. A request with different
+arguments waits, then runs on its own.
+
+Across workers, the running request holds a Postgres advisory lock keyed on
+(step, user_id). Duplicates on other workers cannot share the result, so they wait
+for the lock and then run; by then the user's status has changed, so a verified
+step answers "already verified". The lock is session-level, on its own AUTOCOMMIT
+connection, because the services commit several times per call and a
+transaction-level lock would be released at the first commit.
+
+That connection comes from `advisory_lock_engine`, a pool of
+SINGLE_FLIGHT_LOCK_POOL_SIZE connections per worker kept apart from the request
+pool: every running PAN/bank verification costs one request connection plus one
+lock connection. Sharing one pool could deadlock it, with every request holding
+its Session's connection while it waits for a lock connection. When the lock pool
+is exhausted, the request waits like any other duplicate and then gets the 409.
+
+Anyone still waiting after SINGLE_FLIGHT_WAIT_SECONDS gets a 409.
+"""
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Hashable, Optional
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from core.database import advisory_lock_engine
+from core.metrics import REGISTRY
+from core.config import SINGLE_FLIGHT_WAIT_SECONDS
+from core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+LOCK_NOT_AVAILABLE = "55P03"   # SQLSTATE raised when lock_timeout expires
+
+
+def _lock_key(step: str, user_id: int) -> int:
+    """Signed 64-bit advisory lock id for (step, user_id)."""
+    digest = hashlib.blake2b(f"single-flight:{step}:{user_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _busy(step: str) -> HTTPException:
+    return HTTPException(
+        409, f"A {step.upper()} verification for this user is already in progress. Please retry shortly.",
+        headers={"Retry-After": "2"},
+    )
+
+
+@contextmanager
+def _advisory_lock(step: str, user_id: int, wait_seconds: float):
+    key  = _lock_key(step, user_id)
+    try:
+        conn = advisory_lock_engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    except PoolTimeoutError:
+        raise _busy(step)
+    try:
+        conn.execute(text(f"SET lock_timeout = '{max(int(wait_seconds * 1000), 1)}ms'"))
+        try:
+            with span("single_flight.advisory_lock", step=step):
+                conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        except OperationalError as e:
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            conn.execute(text("RESET lock_timeout"))
+            raise _busy(step)
+        conn.execute(text("RESET lock_timeout"))
+    except OperationalError:
+        conn.invalidate()
+        conn.close()
+        raise
+
+    try:
+        yield
+    finally:
+        try:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+        except OperationalError as e:
+            # The lock dies with the connection, so dropping it releases it as well.
+            logger.warning(f"Could not release single-flight lock for {step} user_id={user_id}: {e.orig}")
+            conn.invalidate()
+        conn.close()
+
+
+class _Flight:
+
+    __slots__ = ("signature", "done", "result", "error")
+
+    def __init__(self, signature: Hashable):
+        self.signature = signature
+        self.done      = threading.Event()
+        self.result    = None
+        self.error     = None
+
+    def outcome(self):
+        if self.error is not None:
+            if isinstance(self.error, HTTPException):
+                raise HTTPException(self.error.status_code, self.error.detail, headers=self.error.headers)
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+
+    def __init__(self, wait_seconds: float = SINGLE_FLIGHT_WAIT_SECONDS):
+        self.wait_seconds = wait_seconds
+        self._flights     = {}
+        self._lock        = threading.Lock()
+        self.shared       = 0
+        self.waited       = 0
+
+    def run(self, step: str, user_id: int, fn: Callable, signature: Optional[Hashable] = None):
+        """Run `fn()` as the only (step, user_id) call in flight, or share the one already running."""
+        key      = (step, user_id)
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight(signature)
+                    break
+            self.waited += 1
+            with span("single_flight.wait", step=step):
+                finished = flight.done.wait(max(deadline - time.monotonic(), 0))
+            if not finished:
+                raise _busy(step)
+            if flight.signature == signature:
+                self.shared += 1
+                logger.info(f"Shared in-flight {step} verification result with a duplicate request for user_id={user_id}")
+                return flight.outcome()
+
+        try:
+            with _advisory_lock(step, user_id, max(deadline - time.monotonic(), 0)):
+                flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+verifications_in_flight = SingleFlight()
+
+
+def _single_flight_metrics():
+    yield "single_flight_in_progress", "gauge", "Verification steps running in this process", [("", {}, verifications_in_flight.in_flight())]
+    yield "single_flight_waits_total", "counter", "Requests that waited for the same user's step to finish", [("", {}, verifications_in_flight.waited)]
+    yield "single_flight_shared_total", "counter", "Duplicate requests answered with an in-flight result", [("", {}, verifications_in_flight.shared)]
+
+
+REGISTRY.add_collector(_single_flight_metrics)
@@ -0,0 +1,263 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import socket
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+from core.database import SessionLocal, engine
+from core.metrics import REGISTRY
+from core.config import EVENTS_ENABLED, EVENTS_CHANNEL, EVENTS_RECONNECT_SECONDS, SSE_QUEUE_SIZE
+from models.user_profile import UserProfile
+from models.document_upload import DocumentUpload
+from repositories.user_repository import UserRepository
+from repositories.document_upload_repository import DocumentUploadRepository
+
+logger = logging.getLogger(__name__)
+
+USER_STATUS_FIELDS = ("pan_status", "aadhaar_status", "bank_status", "identity_status", "document_status", "kyc_status")
+
+
+def _document_event(doc: DocumentUpload, event_type: str) -> dict:
+    return {
+        "type":          event_type,
+        "user_id":       doc.user_id,
+        "document_id":   doc.id,
+        "document_type": doc.document_type.value if doc.document_type else None,
+        "status":        doc.status.value if doc.status else None,
+        "remarks":       doc.admin_remarks or doc.verification_remarks,
+    }
+
+
+def _status_changes(session: Session) -> list:
+    """Document and KYC status transitions in the flush that just ran."""
+    events = []
+    for obj in session.new | session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, UserProfile):
+            changed = [f for f in USER_STATUS_FIELDS if state.attrs[f].history.has_changes()]
+            if changed and obj not in session.new:
+                events.append({
+                    "type":     "kyc_status",
+                    "user_id":  obj.user_id,
+                    "changed":  changed,
+                    "statuses": {f: getattr(obj, f) for f in USER_STATUS_FIELDS},
+                })
+        elif isinstance(obj, DocumentUpload):
+            if obj in session.new or state.attrs.status.history.has_changes():
+                events.append(_document_event(obj, "document_status"))
+    for obj in session.deleted:
+        if isinstance(obj, DocumentUpload):
+            events.append(_document_event(obj, "document_deleted"))
+    return events
+
+
+def _notify_status_changes(session: Session, flush_context) -> None:
+    # pg_notify is transactional: listeners only hear about changes that commit.
+    now = datetime.now(timezone.utc).isoformat()
+    for change in _status_changes(session):
+        session.connection().execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": EVENTS_CHANNEL, "payload": json.dumps({**change, "at": now})},
+        )
+
+
+if EVENTS_ENABLED:
+    event.listen(SessionLocal, "after_flush", _notify_status_changes)
+
+
+def build_snapshot(db: Session, user_id: int) -> Optional[dict]:
+    user = UserRepository.get_by_user_id(db, user_id)
+    if not user:
+        return None
+    return {
+        "user_id":   user_id,
+        "statuses":  {f: getattr(user, f) for f in USER_STATUS_FIELDS},
+        "documents": [
+            _document_event(doc, "document_status") for doc in DocumentUploadRepository.get_by_user_id(db, user_id)
+        ],
+    }
+
+
+class Subscription:
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.loop    = asyncio.get_running_loop()
+        self.queue   = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+
+    def push(self, message: dict) -> None:
+        # Runs on the event loop. A client this far behind gets the newest events; the
+        # snapshot it receives on reconnect covers anything dropped.
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class StatusEventBus:
+    """
+    Fans document/KYC status changes out to this process's SSE subscribers.
+
+    Changes are published with pg_notify from the session flush that makes them
+    (see _notify_status_changes), so every worker hears every committed change,
+    whichever worker or background task made it. Each worker keeps one LISTEN
+    connection on a thread and hands events to subscriber queues on the event
+    loop. After a reconnect, subscribers get a `resync` event, since anything
+    sent while the connection was down is lost.
+
+    The same channel carries control events (see broadcast/on_control): they go
+    to a handler registered in every worker instead of to SSE subscribers.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._handlers    = {}
+        self._lock        = threading.Lock()
+        self._stop        = threading.Event()
+        self._thread      = None
+        self._conn        = None
+        self.origin       = f"{socket.gethostname()}:{os.getpid()}"
+        self.delivered    = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if not EVENTS_ENABLED or self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="kyc-status-events")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._drop_connection()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def on_control(self, event_type: str, handler: Callable[[], None]) -> None:
+        """Run `handler` in this worker whenever another worker broadcasts `event_type`."""
+        self._handlers[event_type] = handler
+
+    def broadcast(self, event_type: str) -> bool:
+        """
+        Tell every other worker to run its `event_type` handler. The sender is
+        skipped (it has already done the work). Returns False when events are
+        disabled, in which case nothing is sent.
+        """
+        if not EVENTS_ENABLED:
+            return False
+        payload = {"type": event_type, "control": True, "origin": self.origin,
+                   "at": datetime.now(timezone.utc).isoformat()}
+        with engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": EVENTS_CHANNEL, "payload": json.dumps(payload)},
+            )
+        return True
+
+    def _handle_control(self, message: dict) -> None:
+        handler = self._handlers.get(message.get("type"))
+        if handler is None or message.get("origin") == self.origin:
+            return
+        # Off the listener thread, so a slow handler does not hold up status events.
+        threading.Thread(target=self._run_handler, args=(message["type"], handler), daemon=True).start()
+
+    @staticmethod
+    def _run_handler(event_type: str, handler: Callable[[], None]) -> None:
+        try:
+            handler()
+        except Exception as e:
+            logger.error(f"Control event {event_type} failed: {str(e)}", exc_info=True)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+    def _dispatch(self, message: dict, user_id: Optional[int] = None) -> None:
+        with self._lock:
+            if user_id is None:
+                targets = [s for subscribers in self._subscribers.values() for s in subscribers]
+            else:
+                targets = list(self._subscribers.get(user_id, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, message)
+                self.delivered += 1
+            except RuntimeError:
+                self.unsubscribe(subscription)   # its event loop has shut down
+
+    def _run(self) -> None:
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                self._conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+                self._conn.execute(text(f'LISTEN "{EVENTS_CHANNEL}"'))
+                logger.info(f"Status events: listening on {EVENTS_CHANNEL}")
+                if connected_before:
+                    self._dispatch({"type": "resync"})
+                connected_before = True
+                self._listen(self._conn.connection.dbapi_connection)
+            except Exception as e:
+                logger.warning(f"Status event listener lost its connection: {str(e)}")
+            finally:
+                self._drop_connection()
+            self._stop.wait(EVENTS_RECONNECT_SECONDS)
+
+    def _listen(self, dbapi_conn) -> None:
+        while not self._stop.is_set():
+            if select.select([dbapi_conn], [], [], 1.0) == ([], [], []):
+                continue
+            dbapi_conn.poll()
+            while dbapi_conn.notifies:
+                notification = dbapi_conn.notifies.pop(0)
+                try:
+                    message = json.loads(notification.payload)
+                except ValueError:
+                    logger.warning(f"Ignoring malformed status event: {notification.payload[:200]}")
+                    continue
+                if message.get("control"):
+                    self._handle_control(message)
+                    continue
+                self._dispatch(message, message.get("user_id"))
+
+    def _drop_connection(self) -> None:
+        # Invalidate rather than return to the pool: it is still LISTENing.
+        if self._conn is not None:
+            try:
+                self._conn.invalidate()
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+status_events = StatusEventBus()
+
+
+def _event_metrics():
+    yield "sse_streams_open", "gauge", "Open status event streams in this process", [("", {}, status_events.subscriber_count())]
+    yield "sse_events_delivered_total", "counter", "Status events handed to stream subscribers", [("", {}, status_events.delivered)]
+
+
+REGISTRY.add_collector(_event_metrics)
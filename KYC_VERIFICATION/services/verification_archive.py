@@ -0,0 +1,165 @@
+import gzip
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable, List, Mapping, Optional
+from core.config import ARCHIVE_BASE_PATH, ARCHIVE_BLOCK_ROWS
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE  = "rows.jsonl.gz"
+INDEX_FILE = "index.jsonl"
+FLUSH_ROWS = ARCHIVE_BLOCK_ROWS * 20   # rows buffered per month before blocks are written
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class VerificationArchive:
+    """
+    Cold copy of verification log rows, written just before cleanup deletes them.
+
+        archive/<table>/<YYYY-MM>/rows.jsonl.gz   gzip members of up to ARCHIVE_BLOCK_ROWS rows, sorted by user_id
+        archive/<table>/<YYYY-MM>/index.jsonl     one line per member: byte offset, length, the user_ids it holds
+
+    Each member is an independent gzip stream (the file as a whole still reads with
+    zcat), so one user's history is fetched by decompressing only the members that
+    actually hold that user. The index lists each member's user_ids rather than a
+    min/max range: blocks written from chunked deletes hold rows in arbitrary id
+    order and span nearly the whole user_id range, so a range would match almost
+    every block. Index lines are written after the data is fsynced;
+    bytes past the last indexed member (a write cut short) are truncated on the next
+    append. Archiving runs before the delete commits (or the partition is dropped), so
+    a failed run can leave a row archived twice but never deleted without a copy.
+    """
+
+    def __init__(self, base_path: str = ARCHIVE_BASE_PATH, block_rows: int = ARCHIVE_BLOCK_ROWS):
+        self.base_path  = base_path
+        self.block_rows = block_rows
+        self._lock      = threading.Lock()
+        self._ends      = {}
+
+    def write(self, table: str, rows: Iterable[Mapping]) -> int:
+        """Archive `rows` of `table`, grouped by created_at month. Returns rows written."""
+        pending = defaultdict(list)
+        written = 0
+        for row in rows:
+            month = row["created_at"].strftime("%Y-%m")
+            pending[month].append(dict(row))
+            if len(pending[month]) >= FLUSH_ROWS:
+                written += self._append(table, month, pending.pop(month))
+        for month, month_rows in pending.items():
+            written += self._append(table, month, month_rows)
+        return written
+
+    def fetch_user_history(self, user_id: int, tables: Optional[List[str]] = None) -> List[dict]:
+        """Every archived row for `user_id`, oldest first, each tagged with its table."""
+        history = []
+        for table in tables or self._tables():
+            table_dir = os.path.join(self.base_path, table)
+            if not os.path.isdir(table_dir):
+                continue
+            for month in sorted(os.listdir(table_dir)):
+                directory = os.path.join(table_dir, month)
+                for entry in self._read_index(os.path.join(directory, INDEX_FILE)):
+                    if self._holds_user(entry, user_id):
+                        for row in self._read_block(os.path.join(directory, DATA_FILE), entry):
+                            if row["user_id"] == user_id:
+                                history.append({"table": table, **row})
+        return sorted(history, key=lambda row: row["created_at"])
+
+    def _tables(self) -> List[str]:
+        if not os.path.isdir(self.base_path):
+            return []
+        return sorted(os.listdir(self.base_path))
+
+    def _append(self, table: str, month: str, rows: List[dict]) -> int:
+        rows.sort(key=lambda row: (row["user_id"], row["created_at"]))
+        directory = os.path.join(self.base_path, table, month)
+        data_path = os.path.join(directory, DATA_FILE)
+        index_path = os.path.join(directory, INDEX_FILE)
+
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            end = self._ends.get(data_path)
+            if end is None:
+                end = max((e["offset"] + e["length"] for e in self._read_index(index_path)), default=0)
+
+            entries = []
+            with open(data_path, "ab") as data:
+                if data.tell() != end:
+                    logger.warning(f"Archive {data_path}: dropping {data.tell() - end} unindexed bytes")
+                    data.truncate(end)
+                    data.seek(end)
+                for start in range(0, len(rows), self.block_rows):
+                    block = rows[start:start + self.block_rows]
+                    payload = gzip.compress(
+                        b"".join(json.dumps(row, default=_json_default).encode() + b"\n" for row in block)
+                    )
+                    data.write(payload)
+                    entries.append({
+                        "offset":      end,
+                        "length":      len(payload),
+                        "rows":        len(block),
+                        "min_user_id": block[0]["user_id"],
+                        "max_user_id": block[-1]["user_id"],
+                        "user_ids":    sorted({row["user_id"] for row in block}),
+                    })
+                    end += len(payload)
+                data.flush()
+                os.fsync(data.fileno())
+
+            with open(index_path, "a") as index:
+                if index.tell() and not self._ends_with_newline(index_path):
+                    index.write("\n")
+                index.writelines(json.dumps(entry) + "\n" for entry in entries)
+                index.flush()
+                os.fsync(index.fileno())
+            self._ends[data_path] = end
+        return len(rows)
+
+    @staticmethod
+    def _holds_user(entry: dict, user_id: int) -> bool:
+        if not entry["min_user_id"] <= user_id <= entry["max_user_id"]:
+            return False
+        user_ids = entry.get("user_ids")
+        if user_ids is None:
+            return True   # index line written before user_ids were recorded
+        position = bisect_left(user_ids, user_id)
+        return position < len(user_ids) and user_ids[position] == user_id
+
+    @staticmethod
+    def _read_index(index_path: str) -> List[dict]:
+        if not os.path.exists(index_path):
+            return []
+        entries = []
+        with open(index_path) as index:
+            for line in index:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue   # line cut short by a crash; its block is re-truncated on the next append
+        return entries
+
+    @staticmethod
+    def _ends_with_newline(path: str) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    @staticmethod
+    def _read_block(data_path: str, entry: dict) -> List[dict]:
+        with open(data_path, "rb") as data:
+            data.seek(entry["offset"])
+            payload = data.read(entry["length"])
+        return [json.loads(line) for line in gzip.decompress(payload).splitlines()]
+
+
+verification_archive = VerificationArchive()
@@ -0,0 +1,303 @@
+"""
+Local stand-in for Karza, Cashfree, DigiLocker and HyperVerge.
+
+Serves the request/response shapes parsed by providers/*.py so API mode can be
+load-tested on one machine. Each vendor has its own latency distribution,
+error rate, hang rate and 429 rate limit, adjustable at runtime via /_sim/config.
+
+    uvicorn simulator.provider_simulator:app --port 9100
+
+When DATABASE_URL is set, answers are looked up in dummy_pans,
+dummy_bank_accounts and user_profiles so the app's name/DOB checks pass.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from datetime import date
+from typing import Optional
+from fastapi import FastAPI, Request, Form, Header, UploadFile, File
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILES = {
+    "karza":      {"latency_ms": {"dist": "lognormal", "median": 300, "sigma": 0.4}, "error_rate": 0.0, "timeout_rate": 0.0, "rate_limit_rps": 0, "burst": 0},
+    "cashfree":   {"latency_ms": {"dist": "lognormal", "median": 600, "sigma": 0.5}, "error_rate": 0.0, "timeout_rate": 0.0, "rate_limit_rps": 0, "burst": 0},
+    "digilocker": {"latency_ms": {"dist": "lognormal", "median": 250, "sigma": 0.4}, "error_rate": 0.0, "timeout_rate": 0.0, "rate_limit_rps": 0, "burst": 0},
+    "hyperverge": {"latency_ms": {"dist": "lognormal", "median": 1500, "sigma": 0.5}, "error_rate": 0.0, "timeout_rate": 0.0, "rate_limit_rps": 0, "burst": 0},
+}
+HANG_SECONDS = float(os.getenv("SIM_HANG_SECONDS", "60"))
+
+_rng = random.Random(int(os.getenv("SIM_SEED", "42")))
+
+
+def _load_profiles() -> dict:
+    profiles = json.loads(json.dumps(DEFAULT_PROFILES))
+    config_file = os.getenv("SIM_CONFIG_FILE")
+    if config_file:
+        with open(config_file) as f:
+            for vendor, overrides in json.load(f).items():
+                profiles.setdefault(vendor, {}).update(overrides)
+    return profiles
+
+PROFILES = _load_profiles()
+
+
+class TokenBucket:
+
+    def __init__(self):
+        self._tokens  = {}
+        self._updated = {}
+        self._lock    = threading.Lock()
+
+    def allow(self, vendor: str, rps: float, burst: int) -> bool:
+        if rps <= 0:
+            return True
+        capacity = max(burst, 1)
+        now = time.monotonic()
+        with self._lock:
+            tokens  = self._tokens.get(vendor, capacity)
+            elapsed = now - self._updated.get(vendor, now)
+            tokens  = min(capacity, tokens + elapsed * rps)
+            self._updated[vendor] = now
+            if tokens < 1:
+                self._tokens[vendor] = tokens
+                return False
+            self._tokens[vendor] = tokens - 1
+            return True
+
+_bucket = TokenBucket()
+_stats  = {vendor: {"requests": 0, "rate_limited": 0, "errors": 0, "hangs": 0} for vendor in DEFAULT_PROFILES}
+
+
+def _sample_latency(spec: dict) -> float:
+    dist = spec.get("dist", "fixed")
+    if dist == "uniform":
+        value = _rng.uniform(spec.get("min", 0), spec.get("max", 0))
+    elif dist == "lognormal":
+        value = _rng.lognormvariate(math.log(max(spec.get("median", 1), 1e-3)), spec.get("sigma", 0.5))
+    else:
+        value = spec.get("value", 0)
+    if "cap" in spec:
+        value = min(value, spec["cap"])
+    return max(value, 0) / 1000.0
+
+
+async def _simulate(vendor: str) -> Optional[Response]:
+    """Apply the vendor profile. Returns an error response to send instead of a real answer."""
+    profile = PROFILES[vendor]
+    stats   = _stats.setdefault(vendor, {"requests": 0, "rate_limited": 0, "errors": 0, "hangs": 0})
+    stats["requests"] += 1
+
+    if not _bucket.allow(vendor, profile.get("rate_limit_rps", 0), profile.get("burst", 0)):
+        stats["rate_limited"] += 1
+        return JSONResponse({"error": "Too many requests"}, status_code=429, headers={"Retry-After": "1"})
+
+    if _rng.random() < profile.get("timeout_rate", 0):
+        stats["hangs"] += 1
+        await asyncio.sleep(HANG_SECONDS)
+
+    await asyncio.sleep(_sample_latency(profile.get("latency_ms", {})))
+
+    if _rng.random() < profile.get("error_rate", 0):
+        stats["errors"] += 1
+        return JSONResponse({"error": "Simulated upstream failure"}, status_code=_rng.choice([500, 502, 503]))
+    return None
+
+
+def _db_enabled() -> bool:
+    return bool(os.getenv("DATABASE_URL"))
+
+def _with_db(fn):
+    from core.database import SessionLocal
+    db = SessionLocal()
+    try:
+        return fn(db)
+    finally:
+        db.close()
+
+def _lookup_pan_name(pan_number: str) -> Optional[str]:
+    if not _db_enabled():
+        return None
+    from models.dummy_pan import DummyPAN
+    from models.user_profile import UserProfile
+
+    def query(db):
+        record = db.query(DummyPAN.full_name).filter(DummyPAN.pan_number == pan_number).first()
+        if record:
+            return record.full_name
+        profile = db.query(UserProfile.full_name).filter(UserProfile.pan_number == pan_number).first()
+        return profile.full_name if profile else None
+    return _with_db(query)
+
+def _lookup_bank_account(account_number: str) -> Optional[tuple]:
+    if not _db_enabled():
+        return None
+    from models.dummy_bank_account import DummyBankAccount
+
+    def query(db):
+        record = db.query(DummyBankAccount).filter(DummyBankAccount.account_number == account_number).first()
+        return (record.account_holder_name, record.ifsc, record.is_active) if record else None
+    return _with_db(query)
+
+def _lookup_user(user_id: int) -> Optional[dict]:
+    if not _db_enabled():
+        return None
+    from models.dummy_pan import DummyPAN
+    from models.user_profile import UserProfile
+
+    def query(db):
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        if not profile:
+            return None
+        record = db.query(DummyPAN).filter(DummyPAN.aadhaar_number == profile.aadhaar_number).first()
+        return {
+            "full_name":      profile.full_name,
+            "dob":            record.dob if record else profile.dob,
+            "pan_number":     profile.pan_number,
+            "aadhaar_number": profile.aadhaar_number,
+        }
+    return _with_db(query)
+
+
+app = FastAPI(title="KYC Provider Simulator")
+
+
+@app.get("/_sim/config")
+def get_config():
+    return PROFILES
+
+@app.put("/_sim/config/{vendor}")
+def update_config(vendor: str, overrides: dict):
+    PROFILES.setdefault(vendor, {}).update(overrides)
+    return PROFILES[vendor]
+
+@app.get("/_sim/stats")
+def get_stats():
+    return _stats
+
+
+# ── Karza PAN ─────────────────────────────────────────────────
+
+@app.post("/v3/sync/pan-verification")
+async def karza_pan_verification(request: Request, x_karza_key: Optional[str] = Header(None)):
+    if not x_karza_key:
+        return JSONResponse({"error": "Missing x-karza-key"}, status_code=401)
+    failure = await _simulate("karza")
+    if failure:
+        return failure
+
+    body = await request.json()
+    pan_number = body.get("pan", "")
+    name = await run_in_threadpool(_lookup_pan_name, pan_number)
+    if name is None and _db_enabled():
+        return {"statusCode": 102, "requestId": f"sim-{_rng.getrandbits(32):08x}", "error": "Invalid PAN"}
+    return {
+        "statusCode": 101,
+        "requestId":  f"sim-{_rng.getrandbits(32):08x}",
+        "result":     {"name": name or "SIMULATED USER"},
+    }
+
+
+# ── Cashfree bank account ─────────────────────────────────────
+
+@app.post("/verification/bank-account/sync")
+async def cashfree_bank_verification(request: Request, x_client_id: Optional[str] = Header(None)):
+    if not x_client_id:
+        return JSONResponse({"message": "Missing x-client-id"}, status_code=401)
+    failure = await _simulate("cashfree")
+    if failure:
+        return failure
+
+    body = await request.json()
+    account = await run_in_threadpool(_lookup_bank_account, body.get("bank_account", ""))
+    if account is None:
+        if _db_enabled():
+            return {"account_status": "INVALID", "account_status_code": "ACCOUNT_NOT_FOUND", "name_at_bank": None}
+        return {"account_status": "VALID", "account_status_code": "ACCOUNT_IS_VALID", "name_at_bank": body.get("name", "")}
+
+    holder_name, ifsc, is_active = account
+    if ifsc.upper() != str(body.get("ifsc", "")).upper():
+        return {"account_status": "INVALID", "account_status_code": "INVALID_IFSC", "name_at_bank": None}
+    if not is_active:
+        return {"account_status": "INVALID", "account_status_code": "ACCOUNT_BLOCKED", "name_at_bank": holder_name}
+    return {"account_status": "VALID", "account_status_code": "ACCOUNT_IS_VALID", "name_at_bank": holder_name}
+
+
+# ── DigiLocker OAuth + eAadhaar ───────────────────────────────
+
+@app.get("/public/oauth2/1/authorize")
+async def digilocker_authorize(redirect_uri: str = "", state: str = ""):
+    code = f"sim-code-{state}"
+    if not redirect_uri:
+        return {"code": code, "state": state}
+    separator = "&" if "?" in redirect_uri else "?"
+    return RedirectResponse(f"{redirect_uri}{separator}code={code}&state={state}", status_code=302)
+
+@app.post("/public/oauth2/1/token")
+async def digilocker_token(code: str = Form(...), grant_type: str = Form(...)):
+    failure = await _simulate("digilocker")
+    if failure:
+        return failure
+    if grant_type != "authorization_code" or not code.startswith("sim-code-"):
+        return JSONResponse({"error": "invalid_grant"}, status_code=400)
+    return {"access_token": "sim-token-" + code[len("sim-code-"):], "token_type": "Bearer", "expires_in": 3600}
+
+@app.get("/public/oauth2/1/xml/eaadhaar")
+async def digilocker_eaadhaar(authorization: Optional[str] = Header(None)):
+    if not authorization or not authorization.startswith("Bearer sim-token-"):
+        return JSONResponse({"error": "invalid_token"}, status_code=401)
+    failure = await _simulate("digilocker")
+    if failure:
+        return failure
+
+    state = authorization[len("Bearer sim-token-"):]
+    user = await run_in_threadpool(_lookup_user, int(state)) if state.isdigit() else None
+    dob  = user["dob"] if user else date(1990, 1, 1)
+    name = user["full_name"] if user else "SIMULATED USER"
+    xml = (
+        "<Certificate><CertificateData><KycRes><UidData>"
+        f'<Poi name="{name}" dob="{dob.strftime("%d-%m-%Y")}" gender="M"/>'
+        "</UidData></KycRes></CertificateData></Certificate>"
+    )
+    return Response(xml, media_type="application/xml")
+
+
+# ── HyperVerge OCR ────────────────────────────────────────────
+
+_OCR_FIELDS = {
+    "readPAN":           ("name", "pan_number"),
+    "readAadhaarFront":  ("name", "aadhaar_number"),
+    "readAadhaarBack":   (None, "aadhaar_number"),
+    "readSalarySlip":    ("employeeName", None),
+    "readBankStatement": ("accountName", None),
+}
+
+@app.post("/{prefix:path}")
+async def hyperverge_read(prefix: str, file: UploadFile = File(...), appid: Optional[str] = Header(None)):
+    endpoint = prefix.rstrip("/").rsplit("/", 1)[-1]
+    if endpoint not in _OCR_FIELDS:
+        return JSONResponse({"error": f"Unknown endpoint {prefix}"}, status_code=404)
+    if not appid:
+        return JSONResponse({"status": "failure", "error": "Missing appId"}, status_code=401)
+    failure = await _simulate("hyperverge")
+    if failure:
+        return failure
+
+    await file.read()
+    owner = (file.filename or "").split("_", 1)[0]
+    user  = await run_in_threadpool(_lookup_user, int(owner)) if owner.isdigit() else None
+
+    name_key, id_attr = _OCR_FIELDS[endpoint]
+    fields = {}
+    if name_key:
+        fields[name_key] = {"value": user["full_name"] if user else "SIMULATED USER"}
+    if id_attr:
+        fields["idNumber"] = {"value": user[id_attr] if user else ""}
+    return {"status": "success", "statusCode": "200", "result": {"details": [{"fieldsExtracted": fields}]}}
@@ -0,0 +1,52 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Tuple
+from core.config import FILE_DELETE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        logger.debug(f"Deleted file: {path}")
+        return True
+    except FileNotFoundError:
+        return True
+    except OSError as e:
+        logger.error(f"Failed to delete file {path}: {str(e)}")
+        return False
+
+
+def remove_files(paths: Iterable[str], workers: int = FILE_DELETE_WORKERS) -> Tuple[int, int]:
+    """
+    Delete `paths` on a bounded thread pool. A file that is already gone counts as
+    removed. Returns (removed, failed).
+    """
+    paths = list(paths)
+    if not paths:
+        return 0, 0
+    if len(paths) == 1:
+        results = [_remove(paths[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths)), thread_name_prefix="file-delete") as pool:
+            results = list(pool.map(_remove, paths))
+    removed = sum(results)
+    return removed, len(results) - removed
+
+
+def iter_files(root: str) -> Iterator[Tuple[str, float]]:
+    """Yield (path, mtime) for every regular file under `root`, streaming directory by directory."""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path, entry.stat(follow_symlinks=False).st_mtime
+        except FileNotFoundError:
+            continue
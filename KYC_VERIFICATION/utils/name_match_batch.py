@@ -0,0 +1,87 @@
+"""
+Bulk re-scoring of stored name pairs for threshold tuning.
+
+Same scores as utils.name_matcher.name_match_percentage. Pairs are deduped
+twice, first as raw strings and then as token tuples (so "Mr. Rahul Sharma" and
+"RAHUL SHARMA" share one scoring call), and the scalar scorer only runs once
+per distinct token pair; its per-token similarity cache does the rest. Plain
+Python throughout, so the admin API does not pull NumPy into the web process.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from utils.name_matcher import _name_tokens, _score
+
+CHUNK_SIZE = 20000
+
+
+def score_chunk(pairs: list) -> List[float]:
+    """Scores (0-100, 2 dp) for a list of (name1, name2) pairs."""
+    scored = {}
+    scores = []
+    for a, b in pairs:
+        key = (_name_tokens(a or ""), _name_tokens(b or ""))
+        score = scored.get(key)
+        if score is None:
+            score = scored[key] = _score(*key)
+        scores.append(score)
+    return scores
+
+
+def score_pairs(pairs: list, workers: int = None) -> List[float]:
+    """
+    Score each distinct pair once, in CHUNK_SIZE slices spread across a process
+    pool when there is more than one slice, and map the scores back to `pairs`.
+    `workers=1` scores in the calling process; the API uses that, since forking a
+    pool from a server worker that already runs threads is unsafe. The pool is for
+    the offline rescore_name_matches.py CLI.
+    """
+    position = {}
+    inverse  = [position.setdefault(p, len(position)) for p in pairs]
+    unique   = list(position)
+    chunks   = [unique[i:i + CHUNK_SIZE] for i in range(0, len(unique), CHUNK_SIZE)]
+    if len(chunks) <= 1 or workers == 1:
+        results = [score_chunk(chunk) for chunk in chunks]
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(score_chunk, chunks))
+    scores = [score for chunk in results for score in chunk]
+    return [scores[k] for k in inverse]
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted list (NumPy's default method)."""
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def threshold_report(scores: List[float], stored_pass: Optional[List[bool]], thresholds: list,
+                     current_threshold: float) -> dict:
+    """Pass/fail counts per candidate threshold, plus how many stored decisions the current threshold would flip."""
+    total = len(scores)
+    ordered = sorted(scores)
+    report = {
+        "pairs":             total,
+        "current_threshold": current_threshold,
+        "score_percentiles": {
+            f"p{q}": float(_percentile(ordered, q)) for q in (5, 25, 50, 75, 95)
+        } if total else {},
+        "thresholds": [],
+    }
+    for threshold in sorted(thresholds):
+        passed = sum(1 for score in scores if score >= threshold)
+        report["thresholds"].append({
+            "threshold": threshold,
+            "pass":      passed,
+            "fail":      total - passed,
+            "pass_rate": round(passed / total, 4) if total else 0.0,
+        })
+    if stored_pass is not None and total:
+        now_pass = [score >= current_threshold for score in scores]
+        report["stored_pass"]     = sum(stored_pass)
+        report["flipped_to_pass"] = sum(1 for now, stored in zip(now_pass, stored_pass) if now and not stored)
+        report["flipped_to_fail"] = sum(1 for now, stored in zip(now_pass, stored_pass) if stored and not now)
+    return report
@@ -1,9 +1,153 @@
-from difflib import SequenceMatcher
+import unicodedata
+from functools import lru_cache
+
+HONORIFICS = {"mr", "mrs", "ms", "miss", "dr", "shri", "sri", "smt"}
+# A bare initial is weak evidence: "S Reddy" vs "Sunita Reddy" must not pass on the surname alone.
+INITIAL_MATCH_SCORE = 0.5
+UNMATCHED_TOKEN_WEIGHT = 0.5
+# Abbreviations common on Indian ID and bank records, expanded before matching
+ABBREVIATIONS = {
+    "mohd": "mohammed", "md": "mohammed", "mohammad": "mohammed", "muhammad": "mohammed", "mohamed": "mohammed",
+    "kr": "kumar", "kmr": "kumar", "pd": "prasad", "prsd": "prasad", "ch": "chandra",
+}
+
 
 def normalize_name(name: str) -> str:
     return " ".join(name.lower().strip().split())
 
+
+def _fold(name: str) -> str:
+    """
+    Lower-case `name`, turn everything but letters into spaces and drop accents from
+    Latin letters (José -> jose). Combining marks on other scripts are part of the
+    letter (Devanagari vowel signs), so non-Latin names keep all their characters.
+    """
+    chars = []
+    latin = False
+    for ch in unicodedata.normalize("NFKD", name.lower()):
+        if unicodedata.category(ch).startswith("M"):
+            if not latin:
+                chars.append(ch)
+        elif ch.isalpha():
+            latin = ch.isascii()
+            chars.append(ch)
+        else:
+            latin = False
+            chars.append(" ")
+    return unicodedata.normalize("NFC", "".join(chars))
+
+
+@lru_cache(maxsize=8192)
+def _name_tokens(name: str) -> tuple:
+    """Lower-cased tokens with punctuation and honorifics removed and abbreviations expanded ("Dr. R.K. Sharma" -> r, k, sharma)."""
+    tokens = [ABBREVIATIONS.get(t, t) for t in _fold(name).split()]
+    return tuple(t for t in tokens if t not in HONORIFICS) or tuple(tokens)
+
+
+def _jaro_winkler(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    la, lb = len(a), len(b)
+    if not la or not lb:
+        return 0.0
+    window = max(max(la, lb) // 2 - 1, 0)
+    a_matched = [False] * la
+    b_matched = [False] * lb
+    matches = 0
+    for i, ch in enumerate(a):
+        for j in range(max(0, i - window), min(lb, i + window + 1)):
+            if not b_matched[j] and b[j] == ch:
+                a_matched[i] = b_matched[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    a_seq = [ch for ch, hit in zip(a, a_matched) if hit]
+    b_seq = [ch for ch, hit in zip(b, b_matched) if hit]
+    transpositions = sum(x != y for x, y in zip(a_seq, b_seq)) / 2
+    jaro = (matches / la + matches / lb + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+
+def _allowed_edits(length: int) -> int:
+    """Typos tolerated inside one token: none up to 3 letters, one up to 8, two beyond."""
+    if length <= 3:
+        return 0
+    return 1 if length <= 8 else 2
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up (returning limit + 1) once every cell in a row exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ch in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ch != other)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+@lru_cache(maxsize=65536)
+def _token_similarity(a: str, b: str) -> float:
+    """
+    Per-token similarity. Only a real single-letter initial can match a full token,
+    and two full tokens only count as the same name when they are within a typo or
+    two of each other; otherwise Jaro-Winkler's prefix boost would pair different
+    given names that share a first letter or two (rahul/rohit, sunil/sunita).
+    """
+    if len(a) == 1 or len(b) == 1:
+        return INITIAL_MATCH_SCORE if a[0] == b[0] and len(a) != len(b) else float(a == b)
+    limit = _allowed_edits(max(len(a), len(b)))
+    if _edit_distance(a, b, limit) > limit:
+        return 0.0
+    return _jaro_winkler(a, b)
+
+
+def _token_score(tokens_a: tuple, tokens_b: tuple) -> float:
+    """
+    Order-insensitive score: pair tokens greedily by similarity, weight each pair by
+    its longer token, and count leftover tokens of the longer name at half weight so
+    a missing middle name lowers the score without sinking it.
+    """
+    pairs = sorted(
+        ((_token_similarity(a, b), i, j) for i, a in enumerate(tokens_a) for j, b in enumerate(tokens_b)),
+        reverse=True,
+    )
+    used_a, used_b = set(), set()
+    score = weight = 0.0
+    for similarity, i, j in pairs:
+        if i in used_a or j in used_b:
+            continue
+        used_a.add(i)
+        used_b.add(j)
+        pair_weight = max(len(tokens_a[i]), len(tokens_b[j]))
+        score  += similarity * pair_weight
+        weight += pair_weight
+    for tokens, used in ((tokens_a, used_a), (tokens_b, used_b)):
+        weight += sum(len(t) for k, t in enumerate(tokens) if k not in used) * UNMATCHED_TOKEN_WEIGHT
+    return score / weight if weight else 0.0
+
+
+@lru_cache(maxsize=8192)
+def _score(tokens_a: tuple, tokens_b: tuple) -> float:
+    # Emptiness first: a name with no letters (or a missing provider name) matches nothing, not itself.
+    if not tokens_a or not tokens_b:
+        return 0.0
+    if tokens_a == tokens_b:
+        return 100.0
+    if "".join(tokens_a) == "".join(tokens_b):
+        return 100.0  # same letters, split differently: "Venkataramana" vs "Venkata Ramana"
+    return round(_token_score(tokens_a, tokens_b) * 100, 2)
+
+
 def name_match_percentage(name1: str, name2: str) -> float:
-    n1 = normalize_name(name1)
-    n2 = normalize_name(name2)
-    return SequenceMatcher(None, n1, n2).ratio() * 100
+    return _score(_name_tokens(name1 or ""), _name_tokens(name2 or ""))
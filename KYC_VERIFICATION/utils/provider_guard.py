@@ -0,0 +1,360 @@
+import bisect
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+import requests
+from core.metrics import PROVIDER_ERRORS, REGISTRY
+from core.tracing import span
+from core.config import (
+    PROVIDER_FAILURE_THRESHOLD, PROVIDER_SLOW_CALL_RATIO, PROVIDER_OPEN_SECONDS, PROVIDER_MAX_CONCURRENCY,
+    PROVIDER_BULKHEAD_WAIT_SECONDS, PROVIDER_LATENCY_WINDOW, PROVIDER_TIMEOUT_MIN_SAMPLES, PROVIDER_TIMEOUT_HEADROOM,
+    PROVIDER_MIN_TIMEOUT_SECONDS, PROVIDER_HEDGING_ENABLED, PROVIDER_HEDGE_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised without calling the vendor when its circuit is open or its bulkhead is full."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED    = "CLOSED"
+    OPEN      = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, name: str, service: str, failure_threshold: int, slow_call_seconds: float, open_seconds: int):
+        self.name              = name
+        self.service           = service
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds      = open_seconds
+        self._state            = self.CLOSED
+        self._failures         = 0
+        self._opened_at        = 0.0
+        self._probe_in_flight  = False
+        self._lock             = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN:
+                remaining = self.open_seconds - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    raise ProviderUnavailableError(
+                        f"{self.service} verification service temporarily unavailable",
+                        retry_after=max(1, math.ceil(remaining)),
+                    )
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Circuit {self.name}: OPEN -> HALF_OPEN")
+            if self._probe_in_flight:
+                raise ProviderUnavailableError(
+                    f"{self.service} verification service temporarily unavailable",
+                    retry_after=1,
+                )
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                logger.info(f"Circuit {self.name}: HALF_OPEN -> CLOSED")
+            self._state           = self.CLOSED
+            self._failures        = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Circuit {self.name}: {self._state} -> OPEN "
+                        f"after {self._failures} failure(s), retry in {self.open_seconds}s"
+                    )
+                self._state     = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class Bulkhead:
+
+    def __init__(self, name: str, service: str, max_concurrency: int, wait_seconds: float):
+        self.name            = name
+        self.service         = service
+        self.max_concurrency = max_concurrency
+        self.wait_seconds    = wait_seconds
+        self._semaphore      = threading.BoundedSemaphore(max_concurrency)
+        self._in_flight      = 0
+        self._lock           = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+    @contextmanager
+    def slot(self):
+        if not self._semaphore.acquire(timeout=self.wait_seconds):
+            raise ProviderUnavailableError(
+                f"{self.service} verification service is busy, please retry shortly",
+                retry_after=1,
+            )
+        self._enter()
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def try_acquire(self) -> bool:
+        if not self._semaphore.acquire(blocking=False):
+            return False
+        self._enter()
+        return True
+
+    def release(self) -> None:
+        self._exit()
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 15.0, 30.0)
+
+class LatencyHistogram:
+    """
+    Cumulative bucket counts for metrics plus a rolling window of raw samples
+    for percentiles. Percentiles are recomputed every few samples, not per call.
+    """
+
+    def __init__(self, window: int, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets      = buckets
+        self._counts      = [0] * (len(buckets) + 1)
+        self._sum         = 0.0
+        self._count       = 0
+        self._window      = deque(maxlen=window)
+        self._percentiles = {}
+        self._dirty       = 0
+        self._lock        = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._sum   += seconds
+            self._count += 1
+            self._window.append(seconds)
+            self._dirty += 1
+            if self._dirty >= 10 or not self._percentiles:
+                self._recompute()
+
+    def _recompute(self) -> None:
+        ordered = sorted(self._window)
+        last    = len(ordered) - 1
+        self._percentiles = {q: ordered[min(last, int(q * len(ordered)))] for q in (0.5, 0.95, 0.99)}
+        self._dirty = 0
+
+    @property
+    def samples(self) -> int:
+        return len(self._window)
+
+    def percentile(self, q: float):
+        return self._percentiles.get(q)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, running = [], 0
+            for bound, count in zip(self.buckets + ("+Inf",), self._counts):
+                running += count
+                cumulative.append({"le": bound, "count": running})
+            return {
+                "buckets": cumulative,
+                "sum":     self._sum,
+                "count":   self._count,
+                "p50":     self._percentiles.get(0.5),
+                "p95":     self._percentiles.get(0.95),
+                "p99":     self._percentiles.get(0.99),
+            }
+
+
+def _is_provider_failure(exc: BaseException) -> bool:
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(exc, requests.RequestException)
+
+
+_hedge_executor = ThreadPoolExecutor(max_workers=PROVIDER_HEDGE_WORKERS, thread_name_prefix="provider-hedge")
+
+class ProviderGuard:
+    """
+    Circuit breaker, bulkhead and latency histogram for one external vendor.
+    `timeout` starts at the vendor's hard-coded ceiling and follows the observed
+    p99 (plus headroom) once enough calls have been recorded. Failed and timed-out
+    calls are recorded at their elapsed time too: leaving them out would keep only
+    the fast answers in the window and let the timeout tighten until it caused
+    the failures it was hiding.
+    """
+
+    def __init__(self, name: str, service: str, timeout: float):
+        self.name         = name
+        self.service      = service
+        self.base_timeout = timeout
+        self.latency      = LatencyHistogram(PROVIDER_LATENCY_WINDOW)
+        self.breaker      = CircuitBreaker(
+            name,
+            service,
+            failure_threshold=PROVIDER_FAILURE_THRESHOLD,
+            slow_call_seconds=timeout * PROVIDER_SLOW_CALL_RATIO,
+            open_seconds=PROVIDER_OPEN_SECONDS,
+        )
+        self.bulkhead = Bulkhead(name, service, PROVIDER_MAX_CONCURRENCY, PROVIDER_BULKHEAD_WAIT_SECONDS)
+        self.hedged_calls = 0
+        self.hedge_wins   = 0
+        self._hedge_lock  = threading.Lock()
+
+    @property
+    def timeout(self) -> float:
+        p99 = self.latency.percentile(0.99)
+        if p99 is None or self.latency.samples < PROVIDER_TIMEOUT_MIN_SAMPLES:
+            return self.base_timeout
+        return round(min(self.base_timeout, max(PROVIDER_MIN_TIMEOUT_SECONDS, p99 * PROVIDER_TIMEOUT_HEADROOM)), 3)
+
+    @contextmanager
+    def protect(self, operation: str = "call"):
+        with span(f"provider.{self.name}.{operation}", kind=3, **{"peer.service": self.service}):
+            try:
+                self.breaker.before_call()
+            except ProviderUnavailableError:
+                PROVIDER_ERRORS.labels(self.name, "circuit_open").inc()
+                raise
+            try:
+                with self.bulkhead.slot():
+                    started = time.monotonic()
+                    try:
+                        yield
+                    except BaseException as e:
+                        self.latency.observe(time.monotonic() - started)
+                        if _is_provider_failure(e):
+                            PROVIDER_ERRORS.labels(self.name, "error").inc()
+                            self.breaker.record_failure()
+                        else:
+                            self.breaker.record_success()
+                        raise
+                    elapsed = time.monotonic() - started
+                    self.latency.observe(elapsed)
+                    if elapsed > self.breaker.slow_call_seconds:
+                        logger.warning(f"{self.name} call took {elapsed:.2f}s (slow threshold {self.breaker.slow_call_seconds:.2f}s)")
+                        PROVIDER_ERRORS.labels(self.name, "slow").inc()
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+            except ProviderUnavailableError:
+                # Bulkhead rejection: free a half-open probe slot without judging the vendor.
+                PROVIDER_ERRORS.labels(self.name, "bulkhead_full").inc()
+                self.breaker.release_probe()
+                raise
+
+    def send(self, request_fn, hedge: bool = False):
+        """
+        Call `request_fn(timeout)` inside `protect()`. With `hedge=True` a second
+        identical request is fired once the first has been outstanding for the
+        observed p95, and whichever answers first wins. Only for side-effect-free
+        GETs: Karza and Cashfree verifications are billed POSTs and are never hedged.
+        """
+        timeout = self.timeout
+        hedge_after = self.latency.percentile(0.95)
+        if (not hedge or not PROVIDER_HEDGING_ENABLED or hedge_after is None
+                or self.latency.samples < PROVIDER_TIMEOUT_MIN_SAMPLES or self.breaker.state != CircuitBreaker.CLOSED):
+            return request_fn(timeout)
+
+        primary = _hedge_executor.submit(request_fn, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done or not self.bulkhead.try_acquire():
+            return primary.result()
+
+        with self._hedge_lock:
+            self.hedged_calls += 1
+        secondary = _hedge_executor.submit(request_fn, timeout)
+        secondary.add_done_callback(lambda _f: self.bulkhead.release())
+        pending = {primary, secondary}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is secondary:
+                        with self._hedge_lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def snapshot(self) -> dict:
+        return {
+            "state":             self.breaker.state,
+            "in_flight":         self.bulkhead.in_flight,
+            "max_concurrency":   self.bulkhead.max_concurrency,
+            "base_timeout":      self.base_timeout,
+            "timeout_seconds":   self.timeout,
+            "hedged_calls":      self.hedged_calls,
+            "hedge_wins":        self.hedge_wins,
+            "latency_seconds":   self.latency.snapshot(),
+        }
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+def get_provider_guard(name: str, service: str, timeout: float) -> ProviderGuard:
+    with _guards_lock:
+        guard = _guards.get(name)
+        if guard is None:
+            guard = ProviderGuard(name, service, timeout)
+            _guards[name] = guard
+        return guard
+
+def all_provider_guards() -> dict:
+    with _guards_lock:
+        return dict(_guards)
+
+def _provider_metrics():
+    guards = all_provider_guards()
+    latency, state, in_flight, timeout = [], [], [], []
+    for name, guard in guards.items():
+        snapshot = guard.latency.snapshot()
+        for bucket in snapshot["buckets"]:
+            le = "+Inf" if bucket["le"] == "+Inf" else repr(float(bucket["le"]))
+            latency.append(("_bucket", {"provider": name, "le": le}, bucket["count"]))
+        latency.append(("_sum", {"provider": name}, snapshot["sum"]))
+        latency.append(("_count", {"provider": name}, snapshot["count"]))
+        state.append(("", {"provider": name}, 0 if guard.breaker.state == CircuitBreaker.CLOSED else 1))
+        in_flight.append(("", {"provider": name}, guard.bulkhead.in_flight))
+        timeout.append(("", {"provider": name}, guard.timeout))
+    yield "provider_call_duration_seconds", "histogram", "Provider call latency, failed and timed-out calls included", latency
+    yield "provider_circuit_open", "gauge", "1 while the provider circuit is OPEN or HALF_OPEN", state
+    yield "provider_in_flight", "gauge", "Provider calls currently in flight", in_flight
+    yield "provider_timeout_seconds", "gauge", "Current adaptive timeout per provider", timeout
+
+REGISTRY.add_collector(_provider_metrics)
@@ -0,0 +1,69 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from typing import NamedTuple, Optional
+
+NONCE_HEX_CHARS   = 32
+CLOCK_SKEW_SECONDS = 60
+
+
+class InvalidTokenError(ValueError):
+    """`reason` is one of: malformed, signature, user, expired."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class TokenClaims(NamedTuple):
+    user_id:   int
+    issued_at: int
+    nonce:     str
+
+
+class TokenSigner:
+    """
+    Stateless HMAC-SHA256 tokens `<user_id>.<issued_at>.<nonce>.<signature>`.
+
+    The signature covers `purpose` too, so a token minted for one flow is useless in
+    another. Tokens signed with `previous_secret` still verify, which allows the
+    secret to be rotated without cutting off sessions in flight. Tokens prove who and
+    when; single use is enforced separately by recording the nonce once it is spent.
+    """
+
+    def __init__(self, purpose: str, secret: str, previous_secret: Optional[str] = None):
+        # No per-process random fallback: its tokens would fail on every other worker and after a restart.
+        if not secret:
+            raise ValueError(f"No secret configured for {purpose} tokens")
+        self.purpose = purpose
+        self._keys   = [k.encode() for k in (secret, previous_secret) if k]
+
+    def _sign(self, key: bytes, payload: str) -> str:
+        digest = hmac.new(key, f"{self.purpose}:{payload}".encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def issue(self, user_id: int) -> tuple:
+        """(token, claims) for a fresh token."""
+        claims = TokenClaims(user_id, int(time.time()), secrets.token_hex(NONCE_HEX_CHARS // 2))
+        payload = f"{claims.user_id}.{claims.issued_at}.{claims.nonce}"
+        return f"{payload}.{self._sign(self._keys[0], payload)}", claims
+
+    def verify(self, token: str, user_id: int, max_age_seconds: int) -> TokenClaims:
+        parts = (token or "").split(".")
+        if len(parts) != 4 or len(parts[2]) != NONCE_HEX_CHARS:
+            raise InvalidTokenError("malformed")
+        payload, signature = ".".join(parts[:3]), parts[3]
+        if not any(hmac.compare_digest(self._sign(key, payload), signature) for key in self._keys):
+            raise InvalidTokenError("signature")
+        try:
+            claims = TokenClaims(int(parts[0]), int(parts[1]), parts[2])
+        except ValueError:
+            raise InvalidTokenError("malformed")
+        if claims.user_id != user_id:
+            raise InvalidTokenError("user")
+        age = time.time() - claims.issued_at
+        if age > max_age_seconds or age < -CLOCK_SKEW_SECONDS:
+            raise InvalidTokenError("expired")
+        return claims
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl_seconds` after they are stored."""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int):
+        self.name        = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries    = OrderedDict()
+        self._hits       = 0
+        self._misses     = 0
+        self._lock       = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key, value) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries":     len(self._entries),
+                "hits":        self._hits,
+                "misses":      self._misses,
+                "hit_rate":    round(self._hits / lookups, 4) if lookups else 0.0,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_cache(name: str, ttl_seconds: float, max_entries: int) -> TTLCache:
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = TTLCache(name, ttl_seconds, max_entries)
+            _caches[name] = cache
+        return cache
+
+def all_caches() -> dict:
+    with _caches_lock:
+        return dict(_caches)